@@ -19,36 +19,51 @@ def create_app():  # pragma: no cover
     cors = CORS(app)
     
 
-    from .config.database import create_tables
+    from .config.database import create_tables, init_db_session
     create_tables()
+    init_db_session(app)
     
 
     configure_routes(app)
     
+
+    from .utils.compression import init_compression
+    init_compression(app)
+    
     return app
 
 
 def configure_routes(app):  # pragma: no cover
     """Configura las rutas de la aplicación"""
     from .controllers.health_controller import HealthCheckView
+    from .controllers.metrics_controller import MetricsView
     from .controllers.sales_plan_controller import SalesPlanController, SalesPlanDeleteAllController
     from .controllers.sales_plan_create_controller import SalesPlanCreateController
+    from .controllers.sales_plan_bulk_controller import SalesPlanBulkController
     from .controllers.scheduled_visit_controller import ScheduledVisitController
     from .controllers.scheduled_visit_detail_controller import ScheduledVisitDetailController
+    from .controllers.scheduled_visit_route_controller import ScheduledVisitRouteController
     from .controllers.scheduled_visit_update_controller import ScheduledVisitUpdateController
     
+    from .config.settings import Config
+    from .utils.serialization import get_encoder, make_json_representation
+    
     api = Api(app)
+    api.representations['application/json'] = make_json_representation(get_encoder(Config.JSON_ENCODER))
     
 
     api.add_resource(HealthCheckView, '/sales-plan/ping')
+    api.add_resource(MetricsView, '/sales-plan/metrics')
     
 
     api.add_resource(SalesPlanCreateController, '/sales-plan/create')
+    api.add_resource(SalesPlanBulkController, '/sales-plan/bulk')
     api.add_resource(SalesPlanController, '/sales-plan')
     api.add_resource(SalesPlanDeleteAllController, '/sales-plan/delete-all')
     
     api.add_resource(ScheduledVisitController, '/sellers/<string:seller_id>/scheduled-visits')
+    api.add_resource(ScheduledVisitRouteController, '/sellers/<string:seller_id>/route')
     api.add_resource(ScheduledVisitDetailController, '/sellers/<string:seller_id>/route/<string:visit_id>')
     api.add_resource(ScheduledVisitUpdateController, '/sellers/<string:seller_id>/route/<string:visit_id>/client/<string:client_id>')
     
-    print("Rutas configuradas: /sales-plan/ping, /sales-plan/create, /sales-plan, /sales-plan/delete-all, /sellers/<seller_id>/scheduled-visits, /sellers/<seller_id>/route/<visit_id>, /sellers/<seller_id>/route/<visit_id>/client/<client_id>")
+    print("Rutas configuradas: /sales-plan/ping, /sales-plan/create, /sales-plan/bulk, /sales-plan, /sales-plan/delete-all, /sellers/<seller_id>/scheduled-visits, /sellers/<seller_id>/route, /sellers/<seller_id>/route/<visit_id>, /sellers/<seller_id>/route/<visit_id>/client/<client_id>")
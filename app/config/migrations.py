@@ -0,0 +1,146 @@
+"""
+Migraciones ligeras del esquema para bases de datos ya desplegadas
+
+`create_all` solo crea tablas nuevas, por lo que los índices agregados a tablas existentes se
+aplican aquí. Cada migración es idempotente (IF NOT EXISTS) y se registra en `schema_migrations`
+para no volver a ejecutarla. Las migraciones marcadas como requeridas detienen el arranque si
+fallan, porque la aplicación depende de ellas (p. ej. el índice único que reemplazó la validación
+de visitas duplicadas).
+"""
+import logging
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_TABLE = 'schema_migrations'
+
+# Llave del advisory lock de PostgreSQL para que varios workers no migren a la vez
+MIGRATIONS_LOCK_ID = 8_410_233
+
+
+class MigrationError(Exception):
+    """Error al aplicar una migración requerida"""
+    pass
+
+
+class Migration(NamedTuple):
+    """
+    Migración del esquema. `dialects` vacío indica que aplica a cualquier motor.
+    `required` indica que la aplicación no puede arrancar sin ella.
+    """
+    version: str
+    description: str
+    statements: Tuple[str, ...]
+    dialects: Tuple[str, ...] = ()
+    required: bool = False
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(
+        version='0001',
+        description='Índice único de visitas por vendedor y fecha',
+        statements=(
+            "CREATE UNIQUE INDEX IF NOT EXISTS ux_scheduled_visits_seller_id_date "
+            "ON scheduled_visits (seller_id, date)",
+        ),
+        # Sin este índice nada impide crear visitas duplicadas para un vendedor y fecha
+        required=True
+    ),
+    Migration(
+        version='0002',
+        description='Índice de clientes por visita',
+        statements=(
+            "CREATE INDEX IF NOT EXISTS ix_scheduled_visit_clients_visit_id_client_id "
+            "ON scheduled_visit_clients (visit_id, client_id)",
+        )
+    ),
+    Migration(
+        version='0003',
+        description='Índices de los filtros del listado de planes de ventas',
+        statements=(
+            "CREATE INDEX IF NOT EXISTS ix_sales_plans_seller_id ON sales_plans (seller_id)",
+            "CREATE INDEX IF NOT EXISTS ix_sales_plans_client_id ON sales_plans (client_id)",
+            "CREATE INDEX IF NOT EXISTS ix_sales_plans_start_date ON sales_plans (start_date)",
+            "CREATE INDEX IF NOT EXISTS ix_sales_plans_end_date ON sales_plans (end_date)",
+        )
+    ),
+    Migration(
+        version='0004',
+        description='Índice trigram para la búsqueda por nombre (ILIKE %texto%)',
+        statements=(
+            "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+            "CREATE INDEX IF NOT EXISTS ix_sales_plans_name_trgm "
+            "ON sales_plans USING gin (name gin_trgm_ops)",
+        ),
+        dialects=('postgresql',)
+    ),
+    Migration(
+        version='0005',
+        description='Índice de la llave de paginación por cursor de planes de ventas',
+        statements=(
+            "CREATE INDEX IF NOT EXISTS ix_sales_plans_created_at_id ON sales_plans (created_at, id)",
+        )
+    ),
+]
+
+
+def run_migrations(engine, migrations: Optional[Iterable[Migration]] = None) -> List[str]:
+    """
+    Aplica las migraciones pendientes en orden
+
+    Una migración opcional que falla se registra en el log y se deja pendiente para el siguiente
+    arranque, sin impedir que se apliquen las demás. Si falla una migración requerida se detiene
+    el proceso.
+
+    Returns:
+        List[str]: Versiones aplicadas en esta ejecución
+
+    Raises:
+        MigrationError: Si falla una migración requerida
+    """
+    migrations = MIGRATIONS if migrations is None else list(migrations)
+    dialect = engine.dialect.name
+    applied_now: List[str] = []
+
+    with engine.begin() as connection:
+        connection.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {MIGRATIONS_TABLE} ("
+            "version VARCHAR(32) PRIMARY KEY, "
+            "description VARCHAR(255), "
+            "applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"
+        ))
+
+    for migration in migrations:
+        if migration.dialects and dialect not in migration.dialects:
+            continue
+
+        try:
+            with engine.begin() as connection:
+                if dialect == 'postgresql':
+                    connection.execute(text("SELECT pg_advisory_xact_lock(:lock_id)"), {'lock_id': MIGRATIONS_LOCK_ID})
+
+                already_applied = connection.execute(
+                    text(f"SELECT 1 FROM {MIGRATIONS_TABLE} WHERE version = :version"),
+                    {'version': migration.version}
+                ).first()
+                if already_applied:
+                    continue
+
+                for statement in migration.statements:
+                    connection.execute(text(statement))
+                connection.execute(
+                    text(f"INSERT INTO {MIGRATIONS_TABLE} (version, description) VALUES (:version, :description)"),
+                    {'version': migration.version, 'description': migration.description}
+                )
+            applied_now.append(migration.version)
+            logger.info(f"Migración {migration.version} aplicada: {migration.description}")
+        except Exception as e:
+            logger.error(f"Error aplicando migración {migration.version} ({migration.description}): {str(e)}")
+            if migration.required:
+                raise MigrationError(
+                    f"No se pudo aplicar la migración requerida {migration.version} "
+                    f"({migration.description}): {str(e)}"
+                ) from e
+
+    return applied_now
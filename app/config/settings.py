@@ -12,6 +12,14 @@ class Config:
     HOST = os.getenv('HOST', '0.0.0.0')
     PORT = int(os.getenv('PORT', '8080'))
 
+    # Pool de conexiones de base de datos (timeouts y reciclado en segundos)
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '10'))
+    DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', '30'))
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '1800'))
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'True').lower() == 'true'
+    DB_ECHO = os.getenv('DB_ECHO', 'False').lower() == 'true'
+
     APP_NAME = 'MediSupply Sales Plan Backend'
     APP_VERSION = '1.0.0'
 
@@ -28,6 +36,61 @@ class Config:
     # Configuración de tamaño máximo de archivos (10 MB por defecto)
     MAX_CONTENT_LENGTH = int(os.getenv('MAX_CONTENT_LENGTH', str(10 * 1024 * 1024)))
 
+    # Subida de archivos por partes (subida reanudable): la memoria por subida queda acotada al
+    # tamaño de parte, que la API exige múltiplo de 256 KB
+    UPLOAD_STREAMING_ENABLED = os.getenv('UPLOAD_STREAMING_ENABLED', 'True').lower() == 'true'
+    UPLOAD_CHUNK_SIZE = int(os.getenv('UPLOAD_CHUNK_SIZE', str(1024 * 1024)))
+
+    # Servidor GCS local para desarrollo y pruebas (p. ej. http://localhost:4443); vacío usa GCS real
+    STORAGE_EMULATOR_HOST = os.getenv('STORAGE_EMULATOR_HOST', '')
+
+    # Configuración del servicio de autenticación (resolución de usuarios)
+    AUTH_SERVICE_URL = os.getenv('AUTH_SERVICE_URL', 'http://localhost:8080')
+    # Consulta masiva POST /auth/users/batch: solo si el servicio de autenticación la expone
+    AUTH_BULK_LOOKUP_ENABLED = os.getenv('AUTH_BULK_LOOKUP_ENABLED', 'False').lower() == 'true'
+    AUTH_LOOKUP_MAX_WORKERS = int(os.getenv('AUTH_LOOKUP_MAX_WORKERS', '10'))
+
+    # Cliente HTTP compartido para llamadas salientes (timeouts en segundos)
+    HTTP_POOL_CONNECTIONS = int(os.getenv('HTTP_POOL_CONNECTIONS', '10'))
+    HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', '20'))
+    HTTP_MAX_RETRIES = int(os.getenv('HTTP_MAX_RETRIES', '2'))
+    HTTP_BACKOFF_FACTOR = float(os.getenv('HTTP_BACKOFF_FACTOR', '0.2'))
+    HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', '2'))
+    HTTP_READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', '5'))
+
+    # Detalle de visitas: consultas de clientes en paralelo y plazo máximo por petición (segundos)
+    VISIT_DETAIL_MAX_WORKERS = int(os.getenv('VISIT_DETAIL_MAX_WORKERS', '10'))
+    VISIT_DETAIL_DEADLINE = float(os.getenv('VISIT_DETAIL_DEADLINE', '3'))
+    # Ruta del vendedor por rango de fechas: máximo de días por consulta
+    SELLER_ROUTE_MAX_DAYS = int(os.getenv('SELLER_ROUTE_MAX_DAYS', '31'))
+
+    # Caché de usuarios del servicio de autenticación (TTL en segundos)
+    USER_CACHE_MAX_SIZE = int(os.getenv('USER_CACHE_MAX_SIZE', '5000'))
+    USER_CACHE_TTL = int(os.getenv('USER_CACHE_TTL', '300'))
+    USER_CACHE_NEGATIVE_TTL = int(os.getenv('USER_CACHE_NEGATIVE_TTL', '60'))
+    # Búsquedas de clientes por nombre (nombre -> IDs); TTL corto porque los nombres cambian
+    CLIENT_NAME_CACHE_MAX_SIZE = int(os.getenv('CLIENT_NAME_CACHE_MAX_SIZE', '1000'))
+    CLIENT_NAME_CACHE_TTL = int(os.getenv('CLIENT_NAME_CACHE_TTL', '60'))
+
+    # Listado de planes: obtener página y total en una sola consulta (COUNT(*) OVER ())
+    SALES_PLAN_WINDOW_COUNT = os.getenv('SALES_PLAN_WINDOW_COUNT', 'True').lower() == 'true'
+    # A partir de cuántos IDs de cliente se filtra con = ANY(:array) en PostgreSQL en lugar de IN
+    CLIENT_IDS_ARRAY_THRESHOLD = int(os.getenv('CLIENT_IDS_ARRAY_THRESHOLD', '100'))
+    # Caché de respuestas de GET /sales-plan (TTL en segundos); se invalida al crear o eliminar planes
+    SALES_PLAN_CACHE_ENABLED = os.getenv('SALES_PLAN_CACHE_ENABLED', 'True').lower() == 'true'
+    SALES_PLAN_CACHE_MAX_SIZE = int(os.getenv('SALES_PLAN_CACHE_MAX_SIZE', '256'))
+    SALES_PLAN_CACHE_TTL = int(os.getenv('SALES_PLAN_CACHE_TTL', '30'))
+    # Máximo de planes por petición en POST /sales-plan/bulk
+    SALES_PLAN_BULK_MAX_SIZE = int(os.getenv('SALES_PLAN_BULK_MAX_SIZE', '500'))
+
+    # Compresión gzip de respuestas. Tamaño mínimo en bytes
+    COMPRESSION_ENABLED = os.getenv('COMPRESSION_ENABLED', 'True').lower() == 'true'
+    COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', '1024'))
+    COMPRESSION_LEVEL = int(os.getenv('COMPRESSION_LEVEL', '6'))
+
+    # Codificador JSON de las respuestas: auto (orjson si está instalado), orjson o json
+    JSON_ENCODER = os.getenv('JSON_ENCODER', 'auto')
+
 
 class DevelopmentConfig(Config):
     """Configuración para desarrollo"""
@@ -1,8 +1,13 @@
 """
 Controlador base para todos los controladores
 """
-from typing import Any, Dict, Tuple
+import logging
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+from flask import Response
 from flask_restful import Resource
+from ..utils.etag import attach_etag, etag_matches, make_etag, not_modified_response
+
+logger = logging.getLogger(__name__)
 
 
 class BaseController(Resource):
@@ -38,3 +43,35 @@ class BaseController(Resource):
             response["data"] = data
         return response, 201
 
+    
+    def not_modified(
+        self,
+        resource: str,
+        version_loader: Callable[[], Any],
+        *parts: Any,
+        attach: bool = True
+    ) -> Union[Optional[Response], Tuple[Optional[Response], Optional[str]]]:
+        """
+        GET condicional: calcula el validador de la respuesta a partir de `version_loader` (consulta
+        barata de la versión de los datos) y de `parts` (parámetros de la petición). Retorna una
+        respuesta 304 si el cliente ya tiene esa versión; si no, agrega el ETag a la respuesta 200
+        y retorna None. Si la versión no se puede calcular (None o error) se omite el ETag.
+        
+        Con attach=False el ETag no se agrega: retorna (respuesta_304_o_None, etag_o_None) para que
+        el controlador lo agregue con attach_etag solo si la respuesta se puede validar.
+        """
+        try:
+            version = version_loader()
+        except Exception as e:
+            logger.warning(f"No se pudo calcular la versión de {resource}: {str(e)}")
+            version = None
+        
+        etag = make_etag(resource, version, *parts) if version is not None else None
+        response = None
+        if etag is not None and etag_matches(etag):
+            logger.info(f"{resource} sin cambios, respondiendo 304")
+            response = not_modified_response(etag)
+        elif etag is not None and attach:
+            attach_etag(etag)
+        
+        return response if attach else (response, etag)
@@ -0,0 +1,22 @@
+"""
+Controlador para métricas internas del servicio
+"""
+from flask_restful import Resource
+from ..services.user_directory_service import get_user_cache, get_client_name_cache
+from ..config.database import get_pool_status
+from ..utils.response_cache import get_sales_plan_response_cache
+
+
+class MetricsView(Resource):
+    """Controlador para consultar métricas de cachés y recursos compartidos"""
+    
+    def get(self):
+        """
+        Usado para dimensionar las cachés del servicio bajo carga real.
+        """
+        return {
+            'user_directory_cache': get_user_cache().stats(),
+            'client_name_cache': get_client_name_cache().stats(),
+            'sales_plan_response_cache': get_sales_plan_response_cache().stats(),
+            'db_pool': get_pool_status()
+        }, 200
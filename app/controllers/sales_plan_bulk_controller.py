@@ -0,0 +1,68 @@
+"""
+Controlador para creación masiva de planes de ventas
+"""
+import logging
+from flask import request
+from typing import Dict, Any, Tuple
+from ..services.sales_plan_service import SalesPlanService
+from ..repositories.sales_plan_repository import SalesPlanRepository
+from ..exceptions.custom_exceptions import SalesPlanValidationError, SalesPlanBusinessLogicError
+from ..config.settings import Config
+from .base_controller import BaseController
+from ..config.database import auto_close_session
+
+logger = logging.getLogger(__name__)
+
+
+class SalesPlanBulkController(BaseController):
+    """Controlador para creación masiva de planes de ventas"""
+    
+    def __init__(self):
+        logger.debug("Inicializando SalesPlanBulkController")
+        self.sales_plan_repository = SalesPlanRepository()
+        self.sales_plan_service = SalesPlanService(self.sales_plan_repository)
+        self.max_batch_size = Config.SALES_PLAN_BULK_MAX_SIZE
+    
+    @auto_close_session
+    def post(self) -> Tuple[Dict[str, Any], int]:
+        """
+        POST /sales-plan/bulk - Crear varios planes de ventas
+        
+        Recibe {"plans": [...]} (o directamente la lista) con el mismo formato de /sales-plan/create.
+        Responde 201 si se crearon todos, o 207 con el resultado de cada plan si alguno falló.
+        """
+        logger.info("POST /sales-plan/bulk - Iniciando creación masiva")
+        try:
+            try:
+                data = request.get_json()
+            except Exception:
+                return self.error_response("Error de validación", "Se requiere un cuerpo JSON válido", 422)
+            
+            plans = data.get('plans') if isinstance(data, dict) else data
+            if not isinstance(plans, list) or not plans:
+                return self.error_response("Error de validación", "Se requiere una lista 'plans' con al menos un plan", 422)
+            
+            if len(plans) > self.max_batch_size:
+                return self.error_response(
+                    "Error de validación",
+                    f"El lote no puede tener más de {self.max_batch_size} planes",
+                    413
+                )
+            
+            results = self.sales_plan_service.create_sales_plans_bulk(plans)
+            created = sum(1 for result in results if result['success'])
+            failed = len(results) - created
+            
+            response, status = self.created_response(
+                data={'created': created, 'failed': failed, 'results': results},
+                message=f"{created} de {len(results)} planes de ventas creados"
+            )
+            return response, (status if failed == 0 else 207)
+            
+        except SalesPlanValidationError as e:
+            return self.error_response("Error de validación", str(e), 422)
+        except SalesPlanBusinessLogicError as e:
+            return self.error_response("Error de lógica de negocio", str(e), 500)
+        except Exception as e:
+            logger.error(f"Error inesperado: {str(e)}")
+            return self.error_response("Error interno del servidor", str(e), 500)
@@ -4,12 +4,19 @@ Controlador para manejo de planes de ventas
 import logging
 from flask_restful import Resource
 from flask import request
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Optional, Tuple
 from ..services.sales_plan_service import SalesPlanService
 from ..repositories.sales_plan_repository import SalesPlanRepository
-from ..exceptions.custom_exceptions import SalesPlanValidationError, SalesPlanBusinessLogicError
+from ..exceptions.custom_exceptions import (
+    SalesPlanValidationError,
+    SalesPlanBusinessLogicError,
+    UserDirectoryUnavailableError
+)
 from .base_controller import BaseController
 from ..config.database import auto_close_session
+from ..utils.cache import MISSING
+from ..utils.etag import attach_etag
+from ..utils.response_cache import get_sales_plan_response_cache
 
 logger = logging.getLogger(__name__)
 
@@ -19,9 +26,7 @@ class SalesPlanController(BaseController):
     
     def __init__(self):
         logger.debug("Inicializando SalesPlanController")
-        from ..config.database import SessionLocal
-        session = SessionLocal()
-        self.sales_plan_repository = SalesPlanRepository(session)
+        self.sales_plan_repository = SalesPlanRepository()
         self.sales_plan_service = SalesPlanService(self.sales_plan_repository)
     
     @auto_close_session
@@ -39,39 +44,75 @@ class SalesPlanController(BaseController):
             start_date = request.args.get('start_date', type=str)
             end_date = request.args.get('end_date', type=str)
             
+            cursor = request.args.get('cursor', type=str)
+            pagination_mode = request.args.get('pagination', type=str, default='page')
+            
             if page < 1:
                 return self.error_response("Error de validación", "El número de página debe ser mayor a 0", 400)
             
             if per_page < 1 or per_page > 100:
                 return self.error_response("Error de validación", "El número de resultados por página debe estar entre 1 y 100", 400)
             
+            filters = {
+                'name': name,
+                'client_id': client_id,
+                'client_name': client_name,
+                'seller_id': seller_id,
+                'start_date': start_date,
+                'end_date': end_date
+            }
+            
+            count = request.args.get('count', type=str, default='none')
+            cache = get_sales_plan_response_cache()
+            cache_key = cache.make_key(dict(
+                filters, page=page, per_page=per_page, cursor=cursor, pagination=pagination_mode, count=count
+            ))
+            # La respuesta se guarda con su ETag: un acierto sin If-None-Match no consulta la versión
+            cached = cache.get(cache_key)
+            if cached is not MISSING and not request.if_none_match:
+                return self._cached_response(cached)
+            
+            not_modified, etag = self.not_modified(
+                'sales-plan',
+                lambda: self.sales_plan_service.get_sales_plans_version(**filters),
+                cache_key,
+                attach=False
+            )
+            if not_modified is not None:
+                return not_modified
+            
+            # Con If-None-Match la respuesta guardada solo sirve si corresponde a la versión vigente
+            if cached is not MISSING and cached[1] == etag:
+                return self._cached_response(cached)
+            generation = cache.generation
+            
+            if cursor or pagination_mode == 'cursor':
+                plans, next_cursor, total = self.sales_plan_service.get_sales_plans_by_cursor(
+                    per_page=per_page,
+                    cursor=cursor,
+                    count=count,
+                    **filters
+                )
+                data = {
+                    'items': self._build_items(plans),
+                    'pagination': {
+                        'per_page': per_page,
+                        'next_cursor': next_cursor,
+                        'has_more': next_cursor is not None,
+                        'total': total
+                    }
+                }
+                return self._cache_response(cache_key, generation, data, etag)
+            
             plans, total = self.sales_plan_service.get_sales_plans(
                 page=page,
                 per_page=per_page,
-                name=name,
-                client_id=client_id,
-                client_name=client_name,
-                seller_id=seller_id,
-                start_date=start_date,
-                end_date=end_date
+                **filters
             )
             
-
-            client_ids = [plan.client_id for plan in plans]
-            seller_ids = [plan.seller_id for plan in plans]
-            client_names_map = self.sales_plan_service.get_client_names_for_ids(client_ids)
-            seller_names_map = self.sales_plan_service.get_seller_names_for_ids(seller_ids)
-
-            items = []
-            for plan in plans:
-                item = plan.to_dict()
-                item['client_name'] = client_names_map.get(plan.client_id)
-                item['seller_name'] = seller_names_map.get(plan.seller_id)
-                items.append(item)
-
             total_pages = (total + per_page - 1) // per_page if per_page > 0 else 1
             data = {
-                'items': items,
+                'items': self._build_items(plans),
                 'pagination': {
                     'page': page,
                     'per_page': per_page,
@@ -80,28 +121,66 @@ class SalesPlanController(BaseController):
                 }
             }
             
-            return self.success_response(
-                data=data,
-                message="Planes de ventas obtenidos exitosamente"
-            )
+            return self._cache_response(cache_key, generation, data, etag)
             
         except SalesPlanValidationError as e:
             return self.error_response("Error de validación", str(e), 400)
+        except UserDirectoryUnavailableError as e:
+            # Sin saber qué clientes coinciden no hay respuesta válida: nada se guarda en caché
+            return self.error_response("Servicio de autenticación no disponible", str(e), 503)
         except SalesPlanBusinessLogicError as e:
             return self.error_response("Error de lógica de negocio", str(e), 500)
         except Exception as e:
             logger.error(f"Error inesperado: {str(e)}")
             return self.error_response("Error interno del servidor", str(e), 500)
 
+    
+    def _cache_response(
+        self,
+        cache_key,
+        generation: int,
+        data: dict,
+        etag: Optional[str]
+    ) -> Tuple[Dict[str, Any], int]:
+        """Arma la respuesta exitosa y la guarda en la caché de respuestas junto con su ETag"""
+        response, status = self.success_response(
+            data=data,
+            message="Planes de ventas obtenidos exitosamente"
+        )
+        if etag is not None:
+            attach_etag(etag)
+        get_sales_plan_response_cache().set(cache_key, (response, etag), generation=generation)
+        return response, status
+    
+    def _cached_response(self, cached: Tuple[Dict[str, Any], Optional[str]]) -> Tuple[Dict[str, Any], int]:
+        """Sirve una respuesta de la caché con el ETag guardado con ella"""
+        response, etag = cached
+        if etag is not None:
+            attach_etag(etag)
+        logger.info("GET /sales-plan - Respuesta servida desde caché")
+        return response, 200
+    
+    def _build_items(self, plans) -> list:
+        """Serializa los planes agregando los nombres de cliente y vendedor"""
+        client_ids = [plan.client_id for plan in plans]
+        seller_ids = [plan.seller_id for plan in plans]
+        names_map = self.sales_plan_service.get_user_names_for_ids(client_ids, seller_ids)
+        
+        items = []
+        for plan in plans:
+            item = plan.__json__()
+            item['client_name'] = names_map.get(plan.client_id)
+            item['seller_name'] = names_map.get(plan.seller_id)
+            items.append(item)
+        return items
+
 
 class SalesPlanDeleteAllController(BaseController):
     """Controlador para eliminar todos los planes de ventas"""
     
     def __init__(self):
         logger.debug("Inicializando SalesPlanDeleteAllController")
-        from ..config.database import SessionLocal
-        session = SessionLocal()
-        self.sales_plan_repository = SalesPlanRepository(session)
+        self.sales_plan_repository = SalesPlanRepository()
         self.sales_plan_service = SalesPlanService(self.sales_plan_repository)
     
     @auto_close_session
@@ -19,9 +19,7 @@ class ScheduledVisitController(BaseController):
     
     def __init__(self):
         logger.debug("Inicializando ScheduledVisitController")
-        from ..config.database import SessionLocal
-        session = SessionLocal()
-        self.scheduled_visit_repository = ScheduledVisitRepository(session)
+        self.scheduled_visit_repository = ScheduledVisitRepository()
         self.scheduled_visit_service = ScheduledVisitService(self.scheduled_visit_repository)
     
     @auto_close_session
@@ -100,6 +98,15 @@ class ScheduledVisitController(BaseController):
             # Obtener el parámetro de fecha si existe
             visit_date = request.args.get('date', type=str)
             
+            not_modified = self.not_modified(
+                'scheduled-visits',
+                lambda: self.scheduled_visit_service.get_scheduled_visits_version(seller_id, visit_date),
+                seller_id,
+                visit_date
+            )
+            if not_modified is not None:
+                return not_modified
+            
             # Obtener las visitas programadas
             visits = self.scheduled_visit_service.get_scheduled_visits(
                 seller_id=seller_id,
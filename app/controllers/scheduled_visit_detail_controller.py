@@ -10,6 +10,7 @@ from ..repositories.scheduled_visit_repository import ScheduledVisitRepository
 from ..exceptions.custom_exceptions import SalesPlanValidationError, SalesPlanBusinessLogicError
 from .base_controller import BaseController
 from ..config.database import auto_close_session
+from ..utils.etag import attach_etag
 
 logger = logging.getLogger(__name__)
 
@@ -19,9 +20,7 @@ class ScheduledVisitDetailController(BaseController):
     
     def __init__(self):
         logger.debug("Inicializando ScheduledVisitDetailController")
-        from ..config.database import SessionLocal
-        session = SessionLocal()
-        self.scheduled_visit_repository = ScheduledVisitRepository(session)
+        self.scheduled_visit_repository = ScheduledVisitRepository()
         self.scheduled_visit_detail_service = ScheduledVisitDetailService(self.scheduled_visit_repository)
     
     @auto_close_session
@@ -29,9 +28,23 @@ class ScheduledVisitDetailController(BaseController):
         """GET /sellers/{seller_id}/route/{visit_id} - Obtener detalle de visita"""
         logger.info(f"GET /sellers/{seller_id}/route/{visit_id} - Iniciando consulta de detalle")
         try:
+            not_modified, etag = self.not_modified(
+                'visit-detail',
+                lambda: self.scheduled_visit_detail_service.get_visit_detail_version(visit_id, seller_id),
+                seller_id,
+                visit_id,
+                attach=False
+            )
+            if not_modified is not None:
+                return not_modified
+            
             # Obtener el detalle completo de la visita
             visit_detail = self.scheduled_visit_detail_service.get_visit_detail(visit_id, seller_id)
             
+            # Un detalle parcial (clientes sin responder a tiempo) no se valida para no fijarlo en el cliente
+            if etag is not None and not any(client.get('partial') for client in visit_detail['clients']):
+                attach_etag(etag)
+            
             return self.success_response(
                 data=visit_detail,
                 message="Detalle de visita obtenido exitosamente"
@@ -44,4 +57,3 @@ class ScheduledVisitDetailController(BaseController):
         except Exception as e:
             logger.error(f"Error inesperado: {str(e)}")
             return self.error_response("Error interno del servidor", str(e), 500)
-
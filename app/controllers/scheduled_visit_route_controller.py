@@ -0,0 +1,63 @@
+"""
+Controlador para la ruta de un vendedor en un rango de fechas
+"""
+import logging
+from flask import request
+from ..services.scheduled_visit_route_service import ScheduledVisitRouteService
+from ..repositories.scheduled_visit_repository import ScheduledVisitRepository
+from ..exceptions.custom_exceptions import SalesPlanValidationError, SalesPlanBusinessLogicError
+from .base_controller import BaseController
+from ..config.database import auto_close_session
+from ..utils.etag import attach_etag
+
+logger = logging.getLogger(__name__)
+
+
+class ScheduledVisitRouteController(BaseController):
+    """Controlador para la ruta del vendedor (visitas con sus clientes) en un rango de fechas"""
+
+    def __init__(self):
+        logger.debug("Inicializando ScheduledVisitRouteController")
+        self.scheduled_visit_repository = ScheduledVisitRepository()
+        self.scheduled_visit_route_service = ScheduledVisitRouteService(self.scheduled_visit_repository)
+
+    @auto_close_session
+    def get(self, seller_id: str):
+        """GET /sellers/{seller_id}/route?from=DD-MM-YYYY&to=DD-MM-YYYY - Visitas del rango con sus clientes"""
+        logger.info(f"GET /sellers/{seller_id}/route - Iniciando consulta de ruta")
+        try:
+            date_from = request.args.get('from', type=str)
+            date_to = request.args.get('to', type=str)
+
+            not_modified, etag = self.not_modified(
+                'seller-route',
+                lambda: self.scheduled_visit_route_service.get_route_version(seller_id, date_from, date_to),
+                seller_id,
+                date_from,
+                date_to,
+                attach=False
+            )
+            if not_modified is not None:
+                return not_modified
+
+            route = self.scheduled_visit_route_service.get_route(seller_id, date_from, date_to)
+
+            # Un cliente sin datos del servicio de autenticación puede ser un fallo transitorio: no se valida
+            complete = all(
+                client['client'] is not None for visit in route['visits'] for client in visit['clients']
+            )
+            if etag is not None and complete:
+                attach_etag(etag)
+
+            return self.success_response(
+                data=route,
+                message="Ruta del vendedor obtenida exitosamente"
+            )
+
+        except SalesPlanValidationError as e:
+            return self.error_response("Error de validación", str(e), 400)
+        except SalesPlanBusinessLogicError as e:
+            return self.error_response("Error de lógica de negocio", str(e), 500)
+        except Exception as e:
+            logger.error(f"Error inesperado: {str(e)}")
+            return self.error_response("Error interno del servidor", str(e), 500)
@@ -8,7 +8,11 @@ from typing import Dict, Any, Tuple
 from ..services.scheduled_visit_update_service import ScheduledVisitUpdateService
 from ..services.cloud_storage_service import CloudStorageService
 from ..repositories.scheduled_visit_repository import ScheduledVisitRepository
-from ..exceptions.custom_exceptions import SalesPlanValidationError, SalesPlanBusinessLogicError
+from ..exceptions.custom_exceptions import (
+    SalesPlanValidationError,
+    SalesPlanBusinessLogicError,
+    FileTooLargeError
+)
 from .base_controller import BaseController
 from ..config.database import auto_close_session
 from ..config.settings import Config
@@ -21,10 +25,8 @@ class ScheduledVisitUpdateController(BaseController):
     
     def __init__(self):
         logger.debug("Inicializando ScheduledVisitUpdateController")
-        from ..config.database import SessionLocal
-        session = SessionLocal()
         self.config = Config()
-        self.scheduled_visit_repository = ScheduledVisitRepository(session)
+        self.scheduled_visit_repository = ScheduledVisitRepository()
         self.cloud_storage_service = CloudStorageService(config=self.config)
         self.scheduled_visit_update_service = ScheduledVisitUpdateService(
             self.scheduled_visit_repository,
@@ -69,21 +71,10 @@ class ScheduledVisitUpdateController(BaseController):
                     400
                 )
             
-            # Validar tamaño del archivo si se envió
+            # El tamaño lo valida la subida (por partes, contando los bytes a medida que se envían),
+            # así el archivo no se recorre antes de subirlo
             if file:
-                file.seek(0, 2)  # Ir al final del archivo
-                file_size = file.tell()  # Obtener el tamaño
-                file.seek(0)  # Volver al inicio
-                
-                if file_size > self.config.MAX_CONTENT_LENGTH:
-                    max_size_mb = self.config.MAX_CONTENT_LENGTH / (1024 * 1024)
-                    return self.error_response(
-                        "Error de validación",
-                        f"El archivo excede el tamaño máximo permitido de {max_size_mb:.0f} MB. Tamaño actual: {file_size / (1024 * 1024):.2f} MB",
-                        400
-                    )
-                
-                logger.info(f"Archivo recibido: {file.filename}, tamaño: {file_size / 1024:.2f} KB")
+                logger.info(f"Archivo recibido: {file.filename}")
             
             # Actualizar el cliente de la visita (el servicio maneja la subida del archivo)
             result = self.scheduled_visit_update_service.update_client_visit(
@@ -99,6 +90,8 @@ class ScheduledVisitUpdateController(BaseController):
                 message="Cliente de visita actualizado exitosamente"
             )
             
+        except FileTooLargeError as e:
+            return self.error_response("Error de validación", str(e), 400)
         except SalesPlanValidationError as e:
             # Error 404 si no se encuentra la visita o el cliente
             return self.error_response("Error de validación", str(e), 404)
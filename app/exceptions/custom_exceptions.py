@@ -22,3 +22,12 @@ class SalesPlanBusinessLogicError(SalesPlanException):
     """Excepción de lógica de negocio de plan de ventas"""
     pass
 
+
+class UserDirectoryUnavailableError(SalesPlanException):
+    """Excepción cuando el servicio de autenticación no responde o falla"""
+    pass
+
+
+class FileTooLargeError(SalesPlanException):
+    """Excepción cuando un archivo supera el tamaño máximo permitido"""
+    pass
@@ -6,7 +6,14 @@ from typing import Dict, Any
 
 
 class BaseModel(ABC):
-    """Modelo base con métodos comunes"""
+    """
+    Modelo base con métodos comunes
+
+    Los modelos de dominio declaran `__slots__`: se crea uno por fila leída de la base de datos y
+    sin `__dict__` por instancia ocupan menos memoria y acceden más rápido a sus atributos.
+    """
+    
+    __slots__ = ()
     
     @abstractmethod
     def to_dict(self) -> Dict[str, Any]:  # pragma: no cover
@@ -17,4 +24,11 @@ class BaseModel(ABC):
     def validate(self) -> None:  # pragma: no cover
         """Valida los datos del modelo"""
         pass
+    
+    def __json__(self) -> Dict[str, Any]:
+        """
+        Valores del modelo para el codificador JSON de la API. A diferencia de `to_dict`, puede
+        dejar fechas como datetime para que el codificador las serialice directamente.
+        """
+        return self.to_dict()
 
@@ -1,8 +1,9 @@
 """
 Modelos de base de datos para plan de ventas
 """
-from sqlalchemy import Column, Integer, String, DateTime, Float, Text, ForeignKey, Date
+from sqlalchemy import Column, Integer, String, DateTime, Float, Text, ForeignKey, Date, Index
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import relationship
 from datetime import datetime
 
 Base = declarative_base()
@@ -11,6 +12,15 @@ Base = declarative_base()
 class SalesPlanDB(Base):
     """Modelo de base de datos para plan de ventas"""
     __tablename__ = 'sales_plans'
+    __table_args__ = (
+        # Columnas usadas por los filtros del listado (get_with_filters)
+        Index('ix_sales_plans_seller_id', 'seller_id'),
+        Index('ix_sales_plans_client_id', 'client_id'),
+        Index('ix_sales_plans_start_date', 'start_date'),
+        Index('ix_sales_plans_end_date', 'end_date'),
+        # Llave estable de la paginación por cursor
+        Index('ix_sales_plans_created_at_id', 'created_at', 'id'),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     name = Column(String(255), unique=True, nullable=False)
@@ -27,17 +37,33 @@ class SalesPlanDB(Base):
 class ScheduledVisitDB(Base):
     """Modelo de base de datos para visitas programadas"""
     __tablename__ = 'scheduled_visits'
+    __table_args__ = (
+        # Un vendedor solo puede tener una visita por fecha; también sirve a los filtros por vendedor ordenados por fecha
+        Index('ux_scheduled_visits_seller_id_date', 'seller_id', 'date', unique=True),
+    )
     
     id = Column(String(36), primary_key=True)
     seller_id = Column(String(36), nullable=False)
     date = Column(Date, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Clientes en el orden en que se guardaron. Carga diferida por defecto: las consultas que los
+    # necesitan usan joinedload para traerlos en la misma consulta que la visita
+    clients = relationship(
+        'ScheduledVisitClientDB',
+        order_by='ScheduledVisitClientDB.id',
+        passive_deletes=True
+    )
 
 
 class ScheduledVisitClientDB(Base):
     """Modelo de base de datos para clientes asociados a visitas programadas"""
     __tablename__ = 'scheduled_visit_clients'
+    __table_args__ = (
+        # Clientes de una visita (visit_id) y cliente puntual dentro de la visita (visit_id, client_id)
+        Index('ix_scheduled_visit_clients_visit_id_client_id', 'visit_id', 'client_id'),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     visit_id = Column(String(36), ForeignKey('scheduled_visits.id', ondelete='CASCADE'), nullable=False)
@@ -3,13 +3,18 @@ Modelo de Plan de Ventas
 """
 from datetime import datetime
 from typing import Optional
-import re
 from .base_model import BaseModel
+from ..utils.validators import is_valid_name, validate_uuid
 
 
 class SalesPlan(BaseModel):
     """Modelo de Plan de Ventas"""
     
+    __slots__ = (
+        'id', 'name', 'start_date', 'end_date', 'client_id', 'seller_id',
+        'target_revenue', 'objectives', 'created_at', 'updated_at'
+    )
+    
     def __init__(
         self,
         name: str,
@@ -48,7 +53,7 @@ class SalesPlan(BaseModel):
             raise ValueError("El nombre del plan de ventas es obligatorio")
         
 
-        if not re.match(r'^[a-zA-Z0-9áéíóúÁÉÍÓÚñÑ\s-]+$', self.name):
+        if not is_valid_name(self.name):
             raise ValueError("El nombre solo puede contener letras, números, espacios y tildes")
         
 
@@ -57,22 +62,11 @@ class SalesPlan(BaseModel):
     
     def _validate_client_id(self) -> None:
         """Valida el ID del cliente"""
-        if not self.client_id:
-            raise ValueError("El ID del cliente es obligatorio")
-        
-
-        uuid_pattern = r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'
-        if not re.match(uuid_pattern, self.client_id, re.IGNORECASE):
-            raise ValueError("El client_id debe ser un UUID válido")
+        validate_uuid(self.client_id, 'client_id', "El ID del cliente es obligatorio")
     
     def _validate_seller_id(self) -> None:
         """Valida el ID del vendedor"""
-        if not self.seller_id:
-            raise ValueError("El ID del vendedor es obligatorio")
-        
-        uuid_pattern = r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'
-        if not re.match(uuid_pattern, self.seller_id, re.IGNORECASE):
-            raise ValueError("El seller_id debe ser un UUID válido")
+        validate_uuid(self.seller_id, 'seller_id', "El ID del vendedor es obligatorio")
     
     def _validate_dates(self) -> None:
         """Valida las fechas del plan"""
@@ -117,3 +111,18 @@ class SalesPlan(BaseModel):
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
 
+    
+    def __json__(self) -> dict:
+        """Valores del plan para el codificador JSON; las fechas se serializan en el codificador"""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'start_date': self.start_date,
+            'end_date': self.end_date,
+            'client_id': self.client_id,
+            'seller_id': self.seller_id,
+            'target_revenue': round(self.target_revenue, 2),
+            'objectives': self.objectives,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
+        }
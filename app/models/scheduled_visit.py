@@ -3,36 +3,39 @@ Modelo de Visita Programada
 """
 from datetime import datetime, date
 from typing import Optional, List
-import re
 import uuid
 from .base_model import BaseModel
+from ..utils.validators import validate_uuid
 
 
 class ScheduledVisitClient:
     """Modelo para cliente asociado a visita programada"""
     
+    __slots__ = ('client_id',)
+    
     def __init__(self, client_id: str):
         self.client_id = client_id
     
     def validate(self) -> None:
         """Valida el ID del cliente"""
-        if not self.client_id:
-            raise ValueError("El ID del cliente es obligatorio")
-        
-        uuid_pattern = r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'
-        if not re.match(uuid_pattern, self.client_id, re.IGNORECASE):
-            raise ValueError("El client_id debe ser un UUID válido")
+        validate_uuid(self.client_id, 'client_id', "El ID del cliente es obligatorio")
     
     def to_dict(self) -> dict:
         """Convierte el cliente a diccionario"""
         return {
             'client_id': self.client_id
         }
+    
+    def __json__(self) -> dict:
+        """Valores del cliente para el codificador JSON"""
+        return self.to_dict()
 
 
 class ScheduledVisit(BaseModel):
     """Modelo de Visita Programada"""
     
+    __slots__ = ('id', 'seller_id', 'date', 'clients', 'created_at', 'updated_at')
+    
     def __init__(
         self,
         seller_id: str,
@@ -57,12 +60,7 @@ class ScheduledVisit(BaseModel):
     
     def _validate_seller_id(self) -> None:
         """Valida el ID del vendedor"""
-        if not self.seller_id:
-            raise ValueError("El ID del vendedor es obligatorio")
-        
-        uuid_pattern = r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'
-        if not re.match(uuid_pattern, self.seller_id, re.IGNORECASE):
-            raise ValueError("El seller_id debe ser un UUID válido")
+        validate_uuid(self.seller_id, 'seller_id', "El ID del vendedor es obligatorio")
     
     def _validate_date(self) -> None:
         """Valida la fecha de la visita"""
@@ -105,3 +103,14 @@ class ScheduledVisit(BaseModel):
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
 
+    
+    def __json__(self) -> dict:
+        """Valores de la visita para el codificador JSON; la fecha conserva el formato DD-MM-YYYY"""
+        return {
+            'id': self.id,
+            'seller_id': self.seller_id,
+            'date': self.date.strftime('%d-%m-%Y') if self.date else None,
+            'clients': self.clients,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
+        }
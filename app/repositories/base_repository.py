@@ -9,8 +9,20 @@ from sqlalchemy.orm import Session
 class BaseRepository(ABC):
     """Repositorio base con métodos comunes"""
     
-    def __init__(self, session: Session):
-        self.session = session
+    def __init__(self, session: Optional[Session] = None):
+        self._session = session
+    
+    @property
+    def session(self) -> Session:
+        """Sesión del repositorio; por defecto la sesión de la petición actual, abierta al primer uso"""
+        if self._session is None:
+            from ..config.database import get_request_session
+            self._session = get_request_session()
+        return self._session
+    
+    @session.setter
+    def session(self, session: Session) -> None:
+        self._session = session
     
     @abstractmethod
     def create(self, entity: Any) -> Any:  # pragma: no cover
@@ -1,23 +1,34 @@
 """
 Repositorio para manejo de planes de ventas
 """
-from typing import List, Optional, Tuple
+import json
+from datetime import datetime
+from typing import Iterable, List, Optional, Set, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import or_
+from sqlalchemy.exc import SQLAlchemyError, IntegrityError
+from sqlalchemy import ARRAY, String, any_, bindparam, false, func, insert, tuple_
 from ..models.sales_plan import SalesPlan
 from ..models.db_models import SalesPlanDB
+from ..config.settings import Config
+from ..utils.response_cache import get_sales_plan_response_cache
 from .base_repository import BaseRepository
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Modos de conteo del total en la paginación por cursor
+COUNT_NONE = 'none'
+COUNT_ESTIMATE = 'estimate'
+COUNT_EXACT = 'exact'
+COUNT_MODES = (COUNT_NONE, COUNT_ESTIMATE, COUNT_EXACT)
+
 
 class SalesPlanRepository(BaseRepository):
     """Repositorio para manejo de planes de ventas"""
     
-    def __init__(self, session: Session):
+    def __init__(self, session: Optional[Session] = None, window_count: Optional[bool] = None):
         super().__init__(session)
+        self.window_count = Config.SALES_PLAN_WINDOW_COUNT if window_count is None else window_count
     
     def create(self, sales_plan: SalesPlan) -> SalesPlan:
         """Crea un nuevo plan de ventas"""
@@ -43,6 +54,7 @@ class SalesPlanRepository(BaseRepository):
             
             self.session.add(db_plan)
             self.session.commit()
+            get_sales_plan_response_cache().invalidate()
             self.session.refresh(db_plan)
             logger.info(f"Plan creado exitosamente con ID: {db_plan.id}")
             
@@ -51,6 +63,71 @@ class SalesPlanRepository(BaseRepository):
             self.session.rollback()
             raise Exception(f"Error al crear plan de ventas: {str(e)}")
     
+    def create_many(self, sales_plans: List[SalesPlan]) -> List[SalesPlan]:
+        """
+        Inserta varios planes en una sola transacción con un INSERT de varias filas y RETURNING,
+        sin consultar cada plan después del commit
+        
+        Returns:
+            List[SalesPlan]: Planes creados, en el mismo orden recibido
+        
+        Raises:
+            ValueError: Si alguno de los nombres ya existe (p. ej. creado concurrentemente); en ese
+                caso no se crea ningún plan del lote
+        """
+        if not sales_plans:
+            return []
+        
+        logger.info(f"=== INICIANDO CREACIÓN DE {len(sales_plans)} PLANES EN LOTE ===")
+        rows = [
+            {
+                'name': sales_plan.name,
+                'start_date': sales_plan.start_date,
+                'end_date': sales_plan.end_date,
+                'client_id': sales_plan.client_id,
+                'seller_id': sales_plan.seller_id,
+                'target_revenue': sales_plan.target_revenue,
+                'objectives': sales_plan.objectives
+            }
+            for sales_plan in sales_plans
+        ]
+        try:
+            # Sin sort_by_parameter_order: algunos motores (SQLite) insertarían fila por fila. Los
+            # nombres son únicos, así que las filas devueltas se asocian a cada plan por nombre
+            db_plans = self.session.scalars(insert(SalesPlanDB).returning(SalesPlanDB), rows).all()
+            # Convertir antes del commit: al expirar, cada fila volvería a consultarse
+            by_name = {db_plan.name: self._db_to_model(db_plan) for db_plan in db_plans}
+            created = [by_name[sales_plan.name] for sales_plan in sales_plans]
+            self.session.commit()
+            get_sales_plan_response_cache().invalidate()
+            logger.info(f"{len(created)} planes creados exitosamente en lote")
+            return created
+        except IntegrityError as e:
+            self.session.rollback()
+            if self._is_duplicate_name_error(e):
+                raise ValueError("Uno o más nombres del lote ya existen; no se creó ningún plan")
+            raise Exception(f"Error al crear planes de ventas: {str(e)}")
+        except SQLAlchemyError as e:
+            self.session.rollback()
+            raise Exception(f"Error al crear planes de ventas: {str(e)}")
+    
+    @staticmethod
+    def _is_duplicate_name_error(error: Exception) -> bool:
+        """Indica si el error de integridad corresponde a la restricción única del nombre"""
+        message = str(getattr(error, 'orig', None) or error)
+        return 'sales_plans_name_key' in message or 'sales_plans.name' in message
+    
+    def find_existing_names(self, names: Iterable[str]) -> Set[str]:
+        """Retorna cuáles de los nombres ya están registrados, con una sola consulta"""
+        unique_names = list(dict.fromkeys(names))
+        if not unique_names:
+            return set()
+        try:
+            rows = self.session.query(SalesPlanDB.name).filter(SalesPlanDB.name.in_(unique_names)).all()
+            return {row[0] for row in rows}
+        except SQLAlchemyError as e:
+            raise Exception(f"Error al consultar nombres de planes de ventas: {str(e)}")
+    
     def get_all(self) -> List[SalesPlan]:
         """Obtiene todos los planes"""
         try:
@@ -72,38 +149,196 @@ class SalesPlanRepository(BaseRepository):
     ) -> Tuple[List[SalesPlan], int]:
         """Obtiene planes con filtros y paginación"""
         try:
-            query = self.session.query(SalesPlanDB)
-            
-            if name:
-                query = query.filter(SalesPlanDB.name.ilike(f"%{name}%"))
-            
-            if seller_id:
-                query = query.filter(SalesPlanDB.seller_id == seller_id)
+            query = self._apply_filters(
+                self.session.query(SalesPlanDB),
+                name=name,
+                client_id=client_id,
+                client_ids=client_ids,
+                seller_id=seller_id,
+                start_date=start_date,
+                end_date=end_date
+            )
             
-            if client_ids:
-                query = query.filter(or_(*[SalesPlanDB.client_id == cid for cid in client_ids]))
-            elif client_id:
-                query = query.filter(SalesPlanDB.client_id == client_id)
+            offset = (page - 1) * per_page
+            if self.window_count:
+                db_plans, total = self._fetch_page_with_total(query, offset, per_page)
+            else:
+                total = query.count()
+                db_plans = query.offset(offset).limit(per_page).all()
             
-            if start_date:
-                from datetime import datetime
-                start = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
-                query = query.filter(SalesPlanDB.start_date >= start)
+            return [self._db_to_model(db_plan) for db_plan in db_plans], total
+        except SQLAlchemyError as e:
+            raise Exception(f"Error al obtener planes de ventas: {str(e)}")
+    
+    def _fetch_page_with_total(self, query, offset: int, per_page: int) -> Tuple[list, int]:
+        """
+        Obtiene la página y el total en una sola consulta con COUNT(*) OVER (). El total se
+        calcula sobre todas las filas filtradas, antes de aplicar OFFSET y LIMIT.
+        """
+        rows = query.add_columns(func.count().over().label('total_count')).offset(offset).limit(per_page).all()
+        if rows:
+            return [row[0] for row in rows], rows[0][1]
+        
+        # Página vacía: sin filas no hay total; en la primera página es 0, más allá se cuenta aparte
+        if offset == 0:
+            return [], 0
+        return [], query.count()
+    
+    def get_listing_version(
+        self,
+        name: Optional[str] = None,
+        client_id: Optional[str] = None,
+        client_ids: Optional[List[str]] = None,
+        seller_id: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> Tuple[int, Optional[datetime]]:
+        """Versión del listado filtrado: (cantidad de planes, último updated_at) en una sola consulta"""
+        try:
+            query = self._apply_filters(
+                self.session.query(func.count(SalesPlanDB.id), func.max(SalesPlanDB.updated_at)),
+                name=name,
+                client_id=client_id,
+                client_ids=client_ids,
+                seller_id=seller_id,
+                start_date=start_date,
+                end_date=end_date
+            )
+            count, last_updated = query.one()
+            return count, last_updated
+        except SQLAlchemyError as e:
+            raise Exception(f"Error al obtener versión de planes de ventas: {str(e)}")
+    
+    def get_with_cursor(
+        self,
+        per_page: int = 10,
+        after: Optional[Tuple[datetime, int]] = None,
+        count: str = COUNT_NONE,
+        name: Optional[str] = None,
+        client_id: Optional[str] = None,
+        client_ids: Optional[List[str]] = None,
+        seller_id: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> Tuple[List[SalesPlan], bool, Optional[int]]:
+        """
+        Obtiene planes con paginación por llave (created_at, id), del más reciente al más antiguo.
+        
+        El costo de cada página no depende de su profundidad: se filtra por la llave del último
+        elemento recibido en lugar de usar OFFSET.
+        
+        Args:
+            after: Llave (created_at, id) del último plan de la página anterior
+            count: 'none' no cuenta, 'estimate' usa la estimación del planificador y 'exact'
+                cuenta; ambos conteos solo se calculan en la primera página (sin `after`)
+        
+        Returns:
+            Tuple[List[SalesPlan], bool, Optional[int]]: (planes, hay_más, total)
+        """
+        try:
+            query = self._apply_filters(
+                self.session.query(SalesPlanDB),
+                name=name,
+                client_id=client_id,
+                client_ids=client_ids,
+                seller_id=seller_id,
+                start_date=start_date,
+                end_date=end_date
+            )
             
-            if end_date:
-                from datetime import datetime
-                end = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
-                query = query.filter(SalesPlanDB.end_date <= end)
+            total = None
+            if after is None and count == COUNT_EXACT:
+                total = query.count()
+            elif after is None and count == COUNT_ESTIMATE:
+                total = self._estimate_count(query)
             
-            total = query.count()
+            if after is not None:
+                query = query.filter(tuple_(SalesPlanDB.created_at, SalesPlanDB.id) < tuple_(*after))
             
-            offset = (page - 1) * per_page
-            db_plans = query.offset(offset).limit(per_page).all()
+            # Se pide un elemento extra para saber si existe una página siguiente
+            db_plans = query.order_by(
+                SalesPlanDB.created_at.desc(), SalesPlanDB.id.desc()
+            ).limit(per_page + 1).all()
             
-            return [self._db_to_model(db_plan) for db_plan in db_plans], total
+            has_more = len(db_plans) > per_page
+            return [self._db_to_model(db_plan) for db_plan in db_plans[:per_page]], has_more, total
         except SQLAlchemyError as e:
             raise Exception(f"Error al obtener planes de ventas: {str(e)}")
     
+    def _apply_filters(
+        self,
+        query,
+        name: Optional[str] = None,
+        client_id: Optional[str] = None,
+        client_ids: Optional[List[str]] = None,
+        seller_id: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ):
+        """Aplica los filtros del listado a la consulta"""
+        if name:
+            query = query.filter(SalesPlanDB.name.ilike(f"%{name}%"))
+        
+        if seller_id:
+            query = query.filter(SalesPlanDB.seller_id == seller_id)
+        
+        if client_ids is not None:
+            # Una lista vacía significa que ningún cliente coincide, no que no haya filtro
+            query = query.filter(self._client_ids_filter(client_ids) if client_ids else false())
+        elif client_id:
+            query = query.filter(SalesPlanDB.client_id == client_id)
+        
+        if start_date:
+            start = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
+            query = query.filter(SalesPlanDB.start_date >= start)
+        
+        if end_date:
+            end = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
+            query = query.filter(SalesPlanDB.end_date <= end)
+        
+        return query
+    
+    def _client_ids_filter(self, client_ids: List[str]):
+        """
+        Predicado para un conjunto de IDs de cliente. Usa un único IN con parámetros expandidos;
+        en PostgreSQL, los conjuntos grandes se envían como un solo arreglo (= ANY(:client_ids))
+        para no generar un parámetro por ID.
+        """
+        unique_ids = list(dict.fromkeys(client_ids))
+        if len(unique_ids) > Config.CLIENT_IDS_ARRAY_THRESHOLD and self._dialect_name() == 'postgresql':
+            return SalesPlanDB.client_id == any_(
+                bindparam('client_ids', value=unique_ids, type_=ARRAY(String))
+            )
+        return SalesPlanDB.client_id.in_(unique_ids)
+    
+    def _dialect_name(self) -> Optional[str]:
+        """Nombre del motor de la sesión, o None si no se puede determinar"""
+        try:
+            return self.session.get_bind().dialect.name
+        except Exception:
+            return None
+    
+    def _estimate_count(self, query) -> int:
+        """
+        Estima el total con el planificador de PostgreSQL (EXPLAIN) sin recorrer las filas.
+        En otros motores cuenta de forma exacta.
+        """
+        if self._dialect_name() != 'postgresql':
+            return query.count()
+        
+        # El SQL se envía tal cual al driver: los IN expandidos se renderizan con un parámetro por
+        # valor en lugar del marcador POSTCOMPILE que SQLAlchemy resuelve al ejecutar
+        compiled = query.statement.compile(
+            dialect=self.session.get_bind().dialect,
+            compile_kwargs={'render_postcompile': True}
+        )
+        plan = self.session.connection().exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+        ).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+    
     def delete_all(self) -> int:
         """Elimina todos los planes"""
         logger.warning(f"=== ELIMINACIÓN MASIVA DE PLANES ===")
@@ -111,6 +346,7 @@ class SalesPlanRepository(BaseRepository):
             count = self.session.query(SalesPlanDB).count()
             self.session.query(SalesPlanDB).delete()
             self.session.commit()
+            get_sales_plan_response_cache().invalidate()
             logger.warning(f"Eliminados {count} planes")
             return count
         except SQLAlchemyError as e:
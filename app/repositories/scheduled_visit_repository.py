@@ -2,9 +2,9 @@
 Repositorio para manejo de visitas programadas
 """
 from typing import List, Optional, Tuple, Any
-from sqlalchemy.orm import Session
-from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.exc import SQLAlchemyError, IntegrityError
+from sqlalchemy import distinct, func, insert, update
 from datetime import date, datetime
 from ..models.scheduled_visit import ScheduledVisit, ScheduledVisitClient
 from ..models.db_models import ScheduledVisitDB, ScheduledVisitClientDB
@@ -13,61 +13,74 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Índice único que impide dos visitas del mismo vendedor en la misma fecha
+DUPLICATE_VISIT_INDEX = 'ux_scheduled_visits_seller_id_date'
+
+# Campos de un cliente de visita que se pueden modificar al registrar la visita
+UPDATABLE_CLIENT_FIELDS = ('status', 'find', 'filename', 'filename_url')
+
 
 class ScheduledVisitRepository(BaseRepository):
     """Repositorio para manejo de visitas programadas"""
     
-    def __init__(self, session: Session):
+    def __init__(self, session: Optional[Session] = None):
         super().__init__(session)
     
     def create(self, scheduled_visit: ScheduledVisit) -> ScheduledVisit:
         """Crea una nueva visita programada"""
         logger.info(f"=== INICIANDO CREACIÓN DE VISITA PROGRAMADA: {scheduled_visit.id} ===")
         try:
-            # Verificar si ya existe una visita para este vendedor en esta fecha
-            existing = self.session.query(ScheduledVisitDB).filter(
-                ScheduledVisitDB.seller_id == scheduled_visit.seller_id,
-                ScheduledVisitDB.date == scheduled_visit.date
-            ).first()
-            
-            if existing:
-                logger.error(f"Ya existe una visita para el vendedor {scheduled_visit.seller_id} en la fecha {scheduled_visit.date}")
-                raise ValueError(
-                    f"Ya existe una visita programada para este vendedor en la fecha {scheduled_visit.date.strftime('%d-%m-%Y')}"
-                )
-            
-            # Crear el registro de la visita programada
-            db_visit = ScheduledVisitDB(
+            # Crear el registro de la visita programada con su propio INSERT, antes que los clientes
+            # (llave foránea). El duplicado (vendedor, fecha) lo detecta el índice único al insertar,
+            # sin consultar antes
+            self.session.execute(insert(ScheduledVisitDB).values(
                 id=scheduled_visit.id,
                 seller_id=scheduled_visit.seller_id,
-                date=scheduled_visit.date
-            )
-            
-            self.session.add(db_visit)
-            # Hacer flush para que la visita se inserte antes de los clientes
-            self.session.flush()
+                date=scheduled_visit.date,
+                created_at=scheduled_visit.created_at,
+                updated_at=scheduled_visit.updated_at
+            ))
             
-            # Crear los registros de clientes asociados
-            for client in scheduled_visit.clients:
-                db_client = ScheduledVisitClientDB(
-                    visit_id=scheduled_visit.id,
-                    client_id=client.client_id,
-                    status='SCHEDULED'
-                )
-                self.session.add(db_client)
+            # Clientes en una sola sentencia de varias filas (insertmanyvalues), sin objetos ORM
+            # que luego no se leen
+            if scheduled_visit.clients:
+                self.session.execute(insert(ScheduledVisitClientDB), [
+                    {
+                        'visit_id': scheduled_visit.id,
+                        'client_id': client.client_id,
+                        'status': 'SCHEDULED',
+                        'created_at': scheduled_visit.created_at,
+                        'updated_at': scheduled_visit.updated_at
+                    }
+                    for client in scheduled_visit.clients
+                ])
             
+            # Las marcas de tiempo se fijan aquí, así que no hace falta releer la visita
             self.session.commit()
-            self.session.refresh(db_visit)
-            logger.info(f"Visita programada creada exitosamente con ID: {db_visit.id}")
+            logger.info(f"Visita programada creada exitosamente con ID: {scheduled_visit.id}")
             
-            return self._db_to_model(db_visit, scheduled_visit.clients)
-        except ValueError:
-            # Re-lanzar errores de validación sin envolver
-            raise
+            return scheduled_visit
+        except IntegrityError as e:
+            self.session.rollback()
+            if self._is_duplicate_visit_error(e):
+                logger.error(f"Ya existe una visita para el vendedor {scheduled_visit.seller_id} en la fecha {scheduled_visit.date}")
+                raise ValueError(
+                    f"Ya existe una visita programada para este vendedor en la fecha {scheduled_visit.date.strftime('%d-%m-%Y')}"
+                )
+            raise Exception(f"Error al crear visita programada: {str(e)}")
         except SQLAlchemyError as e:
             self.session.rollback()
             raise Exception(f"Error al crear visita programada: {str(e)}")
     
+    @staticmethod
+    def _is_duplicate_visit_error(error: Exception) -> bool:
+        """Indica si el error de integridad corresponde al índice único (seller_id, date)"""
+        message = str(getattr(error, 'orig', None) or error)
+        return (
+            DUPLICATE_VISIT_INDEX in message
+            or 'scheduled_visits.seller_id, scheduled_visits.date' in message
+        )
+    
     def get_by_seller_with_filters(
         self,
         seller_id: str,
@@ -110,79 +123,163 @@ class ScheduledVisitRepository(BaseRepository):
         except SQLAlchemyError as e:
             raise Exception(f"Error al obtener visitas programadas: {str(e)}")
     
-    def get_clients_for_visit(self, visit_id: str) -> List[ScheduledVisitClient]:
-        """Obtiene los clientes asociados a una visita"""
+    def get_visits_version(
+        self,
+        seller_id: str,
+        visit_id: Optional[str] = None,
+        visit_date: Optional[date] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None
+    ) -> Tuple[int, int, Optional[datetime], Optional[datetime]]:
+        """
+        Versión de las visitas de un vendedor (o de una visita) en una sola consulta:
+        (visitas, clientes, último updated_at de visitas, último updated_at de clientes)
+        """
         try:
-            db_clients = (
-                self.session.query(ScheduledVisitClientDB)
-                .filter(ScheduledVisitClientDB.visit_id == visit_id)
-                .all()
+            query = (
+                self.session.query(
+                    func.count(distinct(ScheduledVisitDB.id)),
+                    func.count(ScheduledVisitClientDB.id),
+                    func.max(ScheduledVisitDB.updated_at),
+                    func.max(ScheduledVisitClientDB.updated_at)
+                )
+                .outerjoin(ScheduledVisitClientDB, ScheduledVisitClientDB.visit_id == ScheduledVisitDB.id)
+                .filter(ScheduledVisitDB.seller_id == seller_id)
             )
             
-            return [
-                ScheduledVisitClient(client_id=db_client.client_id)
-                for db_client in db_clients
-            ]
+            if visit_id:
+                query = query.filter(ScheduledVisitDB.id == visit_id)
+            
+            if visit_date:
+                query = query.filter(ScheduledVisitDB.date == visit_date)
+            
+            if date_from:
+                query = query.filter(ScheduledVisitDB.date >= date_from)
+            
+            if date_to:
+                query = query.filter(ScheduledVisitDB.date <= date_to)
+            
+            return tuple(query.one())
         except SQLAlchemyError as e:
-            raise Exception(f"Error al obtener clientes de la visita: {str(e)}")
+            raise Exception(f"Error al obtener versión de visitas programadas: {str(e)}")
     
-    def get_by_id_and_seller(self, visit_id: str, seller_id: str) -> Optional[ScheduledVisit]:
-        """Obtiene una visita por ID y seller_id"""
+    def get_visit_with_clients(self, visit_id: str, seller_id: str) -> Optional[Any]:
+        """Obtiene el registro de la visita con sus clientes cargados en la misma consulta (JOIN)"""
         try:
-            db_visit = (
+            return (
                 self.session.query(ScheduledVisitDB)
+                .options(joinedload(ScheduledVisitDB.clients))
                 .filter(
                     ScheduledVisitDB.id == visit_id,
                     ScheduledVisitDB.seller_id == seller_id
                 )
                 .first()
             )
-            
-            if not db_visit:
-                return None
-            
-            # Obtener los clientes asociados
-            clients = self.get_clients_for_visit(visit_id)
-            
-            return self._db_to_model(db_visit, clients)
         except SQLAlchemyError as e:
             raise Exception(f"Error al obtener visita programada: {str(e)}")
     
-    def get_client_visit(self, visit_id: str, client_id: str) -> Optional[Any]:
-        """Obtiene un registro específico de cliente en una visita"""
+    def get_route_for_range(self, seller_id: str, date_from: date, date_to: date) -> List[Any]:
+        """
+        Obtiene las visitas del vendedor entre dos fechas (inclusive), ordenadas por fecha, con sus
+        clientes cargados en la misma consulta (JOIN)
+        """
         try:
-            db_client = (
-                self.session.query(ScheduledVisitClientDB)
+            return (
+                self.session.query(ScheduledVisitDB)
+                .options(joinedload(ScheduledVisitDB.clients))
                 .filter(
-                    ScheduledVisitClientDB.visit_id == visit_id,
-                    ScheduledVisitClientDB.client_id == client_id
+                    ScheduledVisitDB.seller_id == seller_id,
+                    ScheduledVisitDB.date >= date_from,
+                    ScheduledVisitDB.date <= date_to
                 )
-                .first()
+                .order_by(ScheduledVisitDB.date)
+                .all()
             )
-            
-            return db_client
         except SQLAlchemyError as e:
-            raise Exception(f"Error al obtener cliente de la visita: {str(e)}")
+            raise Exception(f"Error al obtener la ruta del vendedor: {str(e)}")
+    
+    def get_by_id_and_seller(self, visit_id: str, seller_id: str) -> Optional[ScheduledVisit]:
+        """Obtiene una visita por ID y seller_id"""
+        db_visit = self.get_visit_with_clients(visit_id, seller_id)
+        if not db_visit:
+            return None
+        
+        clients = [ScheduledVisitClient(client_id=db_client.client_id) for db_client in db_visit.clients]
+        return self._db_to_model(db_visit, clients)
     
-    def update_client_visit(self, visit_id: str, client_id: str, update_data: dict) -> bool:
-        """Actualiza un cliente de una visita"""
+    def update_client_visit(
+        self,
+        seller_id: str,
+        visit_id: str,
+        client_id: str,
+        update_data: dict,
+        commit: bool = True
+    ) -> Optional[dict]:
+        """
+        Actualiza un cliente de una visita del vendedor en una sola sentencia
+        (UPDATE ... FROM scheduled_visits ... RETURNING), sin leer antes la visita ni el cliente.
+        
+        Args:
+            commit: Si es False la transacción queda abierta (y la fila bloqueada) hasta llamar a
+                commit() o rollback()
+        
+        Returns:
+            Optional[dict]: Fila actualizada, o None si la visita no existe, no pertenece al
+            vendedor o no incluye al cliente
+        """
         try:
-            db_client = self.get_client_visit(visit_id, client_id)
+            values = {
+                key: value for key, value in update_data.items()
+                if key in UPDATABLE_CLIENT_FIELDS
+            }
+            # Explícito para que la versión usada por los ETag cambie con cada actualización
+            values['updated_at'] = datetime.utcnow()
             
-            if not db_client:
-                return False
+            statement = (
+                update(ScheduledVisitClientDB)
+                .where(
+                    ScheduledVisitClientDB.visit_id == ScheduledVisitDB.id,
+                    ScheduledVisitDB.id == visit_id,
+                    ScheduledVisitDB.seller_id == seller_id,
+                    ScheduledVisitClientDB.client_id == client_id
+                )
+                .values(**values)
+                .returning(
+                    ScheduledVisitClientDB.visit_id,
+                    ScheduledVisitClientDB.client_id,
+                    ScheduledVisitClientDB.status,
+                    ScheduledVisitClientDB.find,
+                    ScheduledVisitClientDB.filename,
+                    ScheduledVisitClientDB.filename_url,
+                    ScheduledVisitClientDB.updated_at
+                )
+                .execution_options(synchronize_session=False)
+            )
             
-            # Actualizar los campos proporcionados
-            for key, value in update_data.items():
-                if hasattr(db_client, key):
-                    setattr(db_client, key, value)
+            # Las filas de RETURNING son las afectadas; rowcount no es fiable con RETURNING en todos los drivers
+            rows = self.session.execute(statement).mappings().all()
+            if commit:
+                self.session.commit()
             
+            if not rows:
+                return None
+            return dict(rows[0])
+        except SQLAlchemyError as e:
+            self.session.rollback()
+            raise Exception(f"Error al actualizar cliente de la visita: {str(e)}")
+    
+    def commit(self) -> None:
+        """Confirma la transacción que dejó abierta una actualización con commit=False"""
+        try:
             self.session.commit()
-            return True
         except SQLAlchemyError as e:
             self.session.rollback()
             raise Exception(f"Error al actualizar cliente de la visita: {str(e)}")
     
+    def rollback(self) -> None:
+        """Descarta la transacción que dejó abierta una actualización con commit=False"""
+        self.session.rollback()
+    
     def get_all(self) -> List[ScheduledVisit]:  # pragma: no cover
         """No requerido - implementación mínima"""
         pass
@@ -12,9 +12,68 @@ from PIL import Image
 import io
 
 from ..config.settings import Config
+from ..exceptions.custom_exceptions import FileTooLargeError
 
 logger = logging.getLogger(__name__)
 
+# La API de subidas reanudables exige partes múltiplo de 256 KB (salvo la última)
+UPLOAD_CHUNK_ALIGNMENT = 256 * 1024
+
+CONTENT_TYPES = {
+    'pdf': 'application/pdf',
+    'doc': 'application/msword',
+    'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    'xls': 'application/vnd.ms-excel',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'txt': 'text/plain',
+    'jpg': 'image/jpeg',
+    'jpeg': 'image/jpeg',
+    'png': 'image/png',
+    'gif': 'image/gif'
+}
+
+
+class UploadSizeExceededError(Exception):
+    """El archivo superó el tamaño máximo mientras se subía"""
+    pass
+
+
+class SizeLimitedReader:
+    """
+    Envoltorio de lectura que cuenta los bytes a medida que pasan hacia Cloud Storage y aborta
+    la subida en cuanto superan `max_bytes`, sin medir el archivo de antemano.
+    Expone `read`, `tell` y `seek`, que es lo que usa la subida reanudable de google-cloud-storage.
+    """
+    
+    def __init__(self, stream, max_bytes: int):
+        self._stream = stream
+        self.max_bytes = max_bytes
+        self.position = 0
+    
+    def read(self, size: int = -1) -> bytes:
+        # Una lectura sin límite nunca trae más de lo necesario para detectar el exceso
+        if size is None or size < 0:
+            size = self.max_bytes + 1 - self.position
+        
+        data = self._stream.read(size)
+        self.position += len(data)
+        if self.position > self.max_bytes:
+            raise UploadSizeExceededError(
+                f"El archivo supera los {self.max_bytes} bytes permitidos"
+            )
+        return data
+    
+    def tell(self) -> int:
+        return self.position
+    
+    def seek(self, offset: int, whence: int = 0) -> int:
+        # Solo posiciones absolutas: la subida reanudable retrocede a la última parte confirmada
+        if whence != 0:
+            raise io.UnsupportedOperation("Solo se admite seek absoluto")
+        self._stream.seek(offset)
+        self.position = offset
+        return offset
+
 
 class CloudStorageService:
     """Servicio para manejar operaciones con Google Cloud Storage"""
@@ -32,6 +91,17 @@ class CloudStorageService:
         if self._client is None:
             try:
                 # Configurar credenciales si están disponibles
+                if self.config.STORAGE_EMULATOR_HOST:
+                    # Servidor GCS local (p. ej. fake-gcs-server): sin autenticación
+                    from google.auth.credentials import AnonymousCredentials
+                    
+                    self._client = storage.Client(
+                        project=self.config.GCP_PROJECT_ID,
+                        credentials=AnonymousCredentials(),
+                        client_options={'api_endpoint': self.config.STORAGE_EMULATOR_HOST}
+                    )
+                    return self._client
+                
                 if self.config.GOOGLE_APPLICATION_CREDENTIALS:
                     os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = self.config.GOOGLE_APPLICATION_CREDENTIALS
                 
@@ -144,7 +214,8 @@ class CloudStorageService:
     
     def upload_file(self, file: FileStorage, filename: str) -> Tuple[bool, str, Optional[str]]:
         """
-        Sube un archivo de cualquier tipo al bucket de Google Cloud Storage
+        Sube un archivo de cualquier tipo al bucket de Google Cloud Storage.
+        Con UPLOAD_STREAMING_ENABLED la subida se hace por partes (`upload_file_stream`).
         
         Args:
             file: Archivo a subir
@@ -152,7 +223,13 @@ class CloudStorageService:
             
         Returns:
             Tuple[bool, str, Optional[str]]: (éxito, mensaje, url_pública)
+            
+        Raises:
+            FileTooLargeError: Si el archivo supera MAX_CONTENT_LENGTH
         """
+        if self.config.UPLOAD_STREAMING_ENABLED:
+            return self.upload_file_stream(file, filename)
+        
         try:
             if not file or not file.filename:
                 return False, "No se proporcionó archivo", None
@@ -162,9 +239,8 @@ class CloudStorageService:
             file_size = file.tell()
             file.seek(0)  # Volver al inicio
             
-            max_size = self.config.MAX_CONTENT_LENGTH
-            if file_size > max_size:
-                return False, f"El archivo excede el tamaño máximo permitido de {max_size // (1024*1024)} MB", None
+            if file_size > self.config.MAX_CONTENT_LENGTH:
+                raise FileTooLargeError(self._too_large_message())
             
             # Crear ruta completa con carpeta
             full_path = f"{self.config.BUCKET_FOLDER}/{filename}"
@@ -172,31 +248,9 @@ class CloudStorageService:
             # Crear blob en el bucket
             blob = self.bucket.blob(full_path)
             
-            # Detectar content type
-            content_type = 'application/octet-stream'
-            if '.' in file.filename:
-                extension = file.filename.split('.')[-1].lower()
-                content_types = {
-                    'pdf': 'application/pdf',
-                    'doc': 'application/msword',
-                    'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-                    'xls': 'application/vnd.ms-excel',
-                    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-                    'txt': 'text/plain',
-                    'jpg': 'image/jpeg',
-                    'jpeg': 'image/jpeg',
-                    'png': 'image/png',
-                    'gif': 'image/gif'
-                }
-                content_type = content_types.get(extension, 'application/octet-stream')
-            
-            # Configurar metadatos
-            blob.metadata = {
-                'original_filename': file.filename,
-                'content_type': content_type,
-                'uploaded_by': 'medisupply-sales-plan',
-                'folder': self.config.BUCKET_FOLDER
-            }
+            # Detectar content type y configurar metadatos
+            content_type = self._detect_content_type(file.filename)
+            blob.metadata = self._file_metadata(file.filename, content_type)
             
             # Subir archivo
             file.seek(0)
@@ -209,11 +263,89 @@ class CloudStorageService:
             
             return True, "Archivo subido exitosamente", signed_url
             
+        except FileTooLargeError:
+            raise
         except GoogleCloudError as e:
             return False, f"Error de Google Cloud Storage: {str(e)}", None
         except Exception as e:
             return False, f"Error al subir archivo: {str(e)}", None
     
+    def upload_file_stream(self, file: FileStorage, filename: str) -> Tuple[bool, str, Optional[str]]:
+        """
+        Sube un archivo por partes (subida reanudable) leyendo el stream una sola vez.
+        
+        El tamaño no se mide antes de subir: los bytes se cuentan a medida que se envían y la
+        subida se aborta al superar MAX_CONTENT_LENGTH. Como el objeto solo se crea al confirmar
+        la última parte, una subida abortada no deja archivo en el bucket. La memoria usada
+        queda acotada a UPLOAD_CHUNK_SIZE sin importar el tamaño del archivo.
+        
+        Args:
+            file: Archivo a subir, posicionado al inicio
+            filename: Nombre del archivo en el bucket
+            
+        Returns:
+            Tuple[bool, str, Optional[str]]: (éxito, mensaje, url_pública)
+            
+        Raises:
+            FileTooLargeError: Si se leyeron más de MAX_CONTENT_LENGTH bytes; la subida queda abortada
+        """
+        max_size = self.config.MAX_CONTENT_LENGTH
+        try:
+            if not file or not file.filename:
+                return False, "No se proporcionó archivo", None
+            
+            full_path = f"{self.config.BUCKET_FOLDER}/{filename}"
+            blob = self.bucket.blob(full_path, chunk_size=self._upload_chunk_size())
+            
+            content_type = self._detect_content_type(file.filename)
+            blob.metadata = self._file_metadata(file.filename, content_type)
+            
+            # Sin `size` la librería no puede usar la subida de una sola petición, que lee el
+            # archivo completo en memoria
+            reader = SizeLimitedReader(file.stream, max_size)
+            blob.upload_from_file(reader, content_type=content_type)
+            
+            # Generar URL firmada
+            signed_url = self.get_file_url(filename)
+            
+            logger.info(f"Archivo subido por partes exitosamente - Filename: {filename}, Size: {reader.position} bytes")
+            
+            return True, "Archivo subido exitosamente", signed_url
+            
+        except UploadSizeExceededError:
+            logger.warning(f"Subida de {filename} abortada: supera {max_size} bytes")
+            raise FileTooLargeError(self._too_large_message())
+        except GoogleCloudError as e:
+            return False, f"Error de Google Cloud Storage: {str(e)}", None
+        except Exception as e:
+            return False, f"Error al subir archivo: {str(e)}", None
+    
+    def _too_large_message(self) -> str:
+        """Mensaje para un archivo que supera MAX_CONTENT_LENGTH"""
+        return f"El archivo excede el tamaño máximo permitido de {self.config.MAX_CONTENT_LENGTH // (1024*1024)} MB"
+    
+    def _upload_chunk_size(self) -> int:
+        """UPLOAD_CHUNK_SIZE redondeado hacia abajo a un múltiplo de 256 KB (mínimo 256 KB)"""
+        chunk_size = self.config.UPLOAD_CHUNK_SIZE
+        return max(UPLOAD_CHUNK_ALIGNMENT, chunk_size - chunk_size % UPLOAD_CHUNK_ALIGNMENT)
+    
+    @staticmethod
+    def _detect_content_type(original_filename: str) -> str:
+        """Content type según la extensión del archivo original"""
+        if '.' not in original_filename:
+            return 'application/octet-stream'
+        extension = original_filename.split('.')[-1].lower()
+        return CONTENT_TYPES.get(extension, 'application/octet-stream')
+    
+    def _file_metadata(self, original_filename: str, content_type: str) -> dict:
+        """Metadatos que se guardan con cada archivo subido"""
+        return {
+            'original_filename': original_filename,
+            'content_type': content_type,
+            'uploaded_by': 'medisupply-sales-plan',
+            'folder': self.config.BUCKET_FOLDER
+        }
+    
     def get_file_url(self, filename: str, expiration_hours: int = 168) -> str:
         """
         Genera una URL firmada de un archivo en Cloud Storage (alias para get_image_url)
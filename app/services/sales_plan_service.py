@@ -2,23 +2,61 @@
 Servicio para lógica de negocio de planes de ventas
 """
 import logging
-import os
-from typing import List, Optional, Tuple
-import requests
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
 from ..models.sales_plan import SalesPlan
-from ..repositories.sales_plan_repository import SalesPlanRepository
-from ..exceptions.custom_exceptions import SalesPlanValidationError, SalesPlanBusinessLogicError
+from ..repositories.sales_plan_repository import SalesPlanRepository, COUNT_NONE, COUNT_MODES
+from .user_directory_service import UserDirectoryService
+from ..utils.pagination import encode_cursor, decode_cursor
+from ..exceptions.custom_exceptions import (
+    SalesPlanValidationError,
+    SalesPlanBusinessLogicError,
+    UserDirectoryUnavailableError
+)
 
 logger = logging.getLogger(__name__)
 
 
+def validate_plan_payload(data: Any) -> Optional[str]:
+    """
+    Valida los campos obligatorios y el formato del cuerpo de creación de un plan
+
+    Returns:
+        Optional[str]: Mensaje del primer error encontrado, o None si el cuerpo es válido
+    """
+    if not isinstance(data, dict):
+        return "Cada plan debe ser un objeto JSON"
+    
+    for field in ('name', 'start_date', 'end_date', 'client_id', 'target_revenue', 'seller_id'):
+        if not data.get(field):
+            return f"El campo '{field}' es obligatorio"
+    
+    try:
+        start_date = datetime.fromisoformat(data['start_date'].replace('Z', '+00:00'))
+        end_date = datetime.fromisoformat(data['end_date'].replace('Z', '+00:00'))
+        
+        if start_date > end_date:
+            return "La fecha de inicio debe ser menor o igual a la fecha de fin"
+    except (ValueError, AttributeError, TypeError):
+        return "Las fechas deben tener formato ISO 8601 válido"
+    
+    if not isinstance(data['target_revenue'], (int, float)) or data['target_revenue'] < 0:
+        return "El 'target_revenue' debe ser un número mayor o igual a 0"
+    
+    return None
+
+
 class SalesPlanService:
     """Servicio para lógica de negocio de planes de ventas"""
     
-    def __init__(self, sales_plan_repository: SalesPlanRepository):
+    def __init__(
+        self,
+        sales_plan_repository: SalesPlanRepository,
+        user_directory: Optional[UserDirectoryService] = None
+    ):
         logger.info("=== INICIALIZANDO SalesPlanService ===")
         self.sales_plan_repository = sales_plan_repository
-        self.auth_service_url = os.getenv('AUTH_SERVICE_URL', 'http://localhost:8080')
+        self.user_directory = user_directory or UserDirectoryService()
     
     def create_sales_plan(self, plan_data: dict) -> SalesPlan:
         """Crea un nuevo plan de ventas"""
@@ -29,16 +67,7 @@ class SalesPlanService:
             raise SalesPlanValidationError(f"El cliente con ID {plan_data['client_id']} no existe")
         
 
-        from datetime import datetime
-        sales_plan = SalesPlan(
-            name=plan_data['name'],
-            start_date=datetime.fromisoformat(plan_data['start_date'].replace('Z', '+00:00')),
-            end_date=datetime.fromisoformat(plan_data['end_date'].replace('Z', '+00:00')),
-            client_id=plan_data['client_id'],
-            seller_id=plan_data['seller_id'],
-            target_revenue=plan_data['target_revenue'],
-            objectives=plan_data.get('objectives', '')
-        )
+        sales_plan = self._build_sales_plan(plan_data)
         
 
         sales_plan.validate()
@@ -53,6 +82,102 @@ class SalesPlanService:
         except Exception as e:
             raise SalesPlanBusinessLogicError(f"Error al crear plan de ventas: {str(e)}")
     
+    def create_sales_plans_bulk(self, items: List[Any]) -> List[Dict[str, Any]]:
+        """
+        Crea un lote de planes de ventas
+        
+        Valida todo el lote antes de escribir: los clientes se consultan una sola vez al directorio
+        (sin repetidos) y los nombres ya existentes se buscan en una sola consulta. Los planes
+        válidos se insertan juntos en una transacción; los inválidos se reportan sin afectar al resto.
+        
+        Un cliente que no se pudo verificar por un fallo del servicio de autenticación no se
+        reporta como inexistente: su elemento falla con 'retryable': True para que se reintente.
+        
+        Returns:
+            List[Dict[str, Any]]: Un resultado por elemento, en el orden recibido:
+                {'index', 'success': True, 'data'} o {'index', 'success': False, 'error', 'retryable'}
+        """
+        logger.info(f"=== INICIANDO CREACIÓN MASIVA DE {len(items)} PLANES ===")
+        errors: Dict[int, str] = {}
+        retryable = set()
+        candidates: List[Tuple[int, SalesPlan]] = []
+        seen_names = set()
+        
+        for index, item in enumerate(items):
+            error = validate_plan_payload(item)
+            if error is None:
+                try:
+                    sales_plan = self._build_sales_plan(item)
+                    sales_plan.validate()
+                except ValueError as e:
+                    error = str(e)
+            if error is None and sales_plan.name in seen_names:
+                error = f"El nombre '{sales_plan.name}' está repetido en el lote"
+            if error is not None:
+                errors[index] = error
+                continue
+            seen_names.add(sales_plan.name)
+            candidates.append((index, sales_plan))
+        
+        try:
+            users: Dict[str, Optional[dict]] = {}
+            unresolved = set()
+            existing_names = set()
+            if candidates:
+                users, unresolved = self.user_directory.lookup_users(plan.client_id for _, plan in candidates)
+                existing_names = self.sales_plan_repository.find_existing_names(
+                    plan.name for _, plan in candidates
+                )
+            
+            valid: List[Tuple[int, SalesPlan]] = []
+            for index, plan in candidates:
+                if plan.client_id in unresolved:
+                    errors[index] = (
+                        f"No se pudo verificar el cliente con ID {plan.client_id}: "
+                        f"servicio de autenticación no disponible, reintente"
+                    )
+                    retryable.add(index)
+                elif users.get(plan.client_id) is None:
+                    errors[index] = f"El cliente con ID {plan.client_id} no existe"
+                elif plan.name in existing_names:
+                    errors[index] = f"Ya existe un plan de ventas con el nombre '{plan.name}'"
+                else:
+                    valid.append((index, plan))
+            
+            created = self.sales_plan_repository.create_many([plan for _, plan in valid])
+        except ValueError as e:
+            raise SalesPlanValidationError(str(e))
+        except Exception as e:
+            raise SalesPlanBusinessLogicError(f"Error al crear planes de ventas: {str(e)}")
+        
+        results: List[Dict[str, Any]] = [
+            {'index': index, 'success': False, 'error': error, 'retryable': index in retryable}
+            for index, error in errors.items()
+        ]
+        results.extend(
+            {'index': index, 'success': True, 'data': plan.to_dict()}
+            for (index, _), plan in zip(valid, created)
+        )
+        results.sort(key=lambda result: result['index'])
+        logger.info(
+            f"Creación masiva: {len(created)} creados, {len(errors)} con error "
+            f"({len(retryable)} reintentables)"
+        )
+        return results
+    
+    @staticmethod
+    def _build_sales_plan(plan_data: dict) -> SalesPlan:
+        """Construye el modelo de dominio a partir del cuerpo de la petición"""
+        return SalesPlan(
+            name=plan_data['name'],
+            start_date=datetime.fromisoformat(plan_data['start_date'].replace('Z', '+00:00')),
+            end_date=datetime.fromisoformat(plan_data['end_date'].replace('Z', '+00:00')),
+            client_id=plan_data['client_id'],
+            seller_id=plan_data['seller_id'],
+            target_revenue=plan_data['target_revenue'],
+            objectives=plan_data.get('objectives', '')
+        )
+    
     def get_sales_plans(
         self,
         page: int = 1,
@@ -68,6 +193,10 @@ class SalesPlanService:
         try:
             if client_name:
                 client_ids = self._get_client_ids_by_name(client_name)
+                if not client_ids:
+                    # Ningún cliente coincide con el nombre: no puede haber planes
+                    logger.info(f"Sin clientes para el nombre '{client_name}', se omite la consulta")
+                    return [], 0
                 plans, total = self.sales_plan_repository.get_with_filters(
                     page=page,
                     per_page=per_page,
@@ -88,56 +217,112 @@ class SalesPlanService:
                     end_date=end_date
                 )
             return plans, total
+        except UserDirectoryUnavailableError:
+            raise
         except Exception as e:
             raise SalesPlanBusinessLogicError(f"Error al obtener planes de ventas: {str(e)}")
     
-    def _get_client_ids_by_name(self, client_name: str) -> List[str]:
-        """Obtiene IDs de clientes por nombre"""
+    def get_sales_plans_by_cursor(
+        self,
+        per_page: int = 10,
+        cursor: Optional[str] = None,
+        count: str = COUNT_NONE,
+        name: Optional[str] = None,
+        client_id: Optional[str] = None,
+        client_name: Optional[str] = None,
+        seller_id: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> Tuple[List[SalesPlan], Optional[str], Optional[int]]:
+        """
+        Obtiene planes con paginación por cursor
+        
+        Returns:
+            Tuple[List[SalesPlan], Optional[str], Optional[int]]: (planes, cursor_siguiente, total)
+        """
+        if count not in COUNT_MODES:
+            raise SalesPlanValidationError(f"El parámetro count debe ser uno de: {', '.join(COUNT_MODES)}")
+        
+        after = None
+        if cursor:
+            try:
+                after = decode_cursor(cursor)
+            except ValueError:
+                raise SalesPlanValidationError("El cursor de paginación no es válido")
+        
         try:
-            response = requests.get(
-                f"{self.auth_service_url}/auth/user?name={client_name}&role=Cliente",
-                timeout=5
+            filters = {'client_id': client_id}
+            if client_name:
+                filters = {'client_ids': self._get_client_ids_by_name(client_name)}
+                if not filters['client_ids']:
+                    logger.info(f"Sin clientes para el nombre '{client_name}', se omite la consulta")
+                    return [], None, (None if count == COUNT_NONE else 0)
+            
+            plans, has_more, total = self.sales_plan_repository.get_with_cursor(
+                per_page=per_page,
+                after=after,
+                count=count,
+                name=name,
+                seller_id=seller_id,
+                start_date=start_date,
+                end_date=end_date,
+                **filters
             )
-            if response.status_code == 200:
-                data = response.json()
-                users = data.get('data', {}).get('users', [])
-                return [user['id'] for user in users]
-            return []  # pragma: no cover
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error buscando clientes por nombre: {str(e)}")
-            return []
+            
+            next_cursor = None
+            if has_more and plans:
+                last = plans[-1]
+                next_cursor = encode_cursor(last.created_at, last.id)
+            return plans, next_cursor, total
+        except UserDirectoryUnavailableError:
+            raise
+        except Exception as e:
+            raise SalesPlanBusinessLogicError(f"Error al obtener planes de ventas: {str(e)}")
+    
+    def get_sales_plans_version(
+        self,
+        name: Optional[str] = None,
+        client_id: Optional[str] = None,
+        client_name: Optional[str] = None,
+        seller_id: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> tuple:
+        """Versión barata del listado filtrado, usada como validador de GET condicionales"""
+        filters = {'client_id': client_id}
+        if client_name:
+            client_ids = self._get_client_ids_by_name(client_name)
+            if not client_ids:
+                return ('sin-clientes',)
+            filters = {'client_ids': client_ids}
+        
+        return self.sales_plan_repository.get_listing_version(
+            name=name,
+            seller_id=seller_id,
+            start_date=start_date,
+            end_date=end_date,
+            **filters
+        )
+    
+    def _get_client_ids_by_name(self, client_name: str) -> List[str]:
+        """Obtiene IDs de clientes por nombre"""
+        return self.user_directory.find_client_ids_by_name(client_name)
 
-    def get_client_names_for_ids(self, client_ids: List[str]) -> dict:
-        """Devuelve un diccionario {client_id: client_name}. Si no se encuentra, usa None."""
-        names: dict = {}
-        unique_ids = list({cid for cid in client_ids if cid})
-        for client_id in unique_ids:
-            names[client_id] = self._get_client_name(client_id)
-        return names
+    def get_user_names_for_ids(self, client_ids: List[str], seller_ids: List[str]) -> dict:
+        """
+        Devuelve un diccionario {user_id: name} compartido para clientes y vendedores.
+        Un ID presente en ambas listas se consulta una sola vez. Si no se encuentra, usa None.
+        """
+        users = self.user_directory.get_users(list(client_ids) + list(seller_ids))
+        return {user_id: self._extract_user_name(user) for user_id, user in users.items()}
 
-    def _get_client_name(self, client_id: str) -> Optional[str]:
-        """Obtiene el nombre del cliente desde el servicio de autenticación."""
-        try:
-            response = requests.get(
-                f"{self.auth_service_url}/auth/user/{client_id}",
-                timeout=5
-            )
-            if response.status_code == 200:
-                data = response.json()
-                user = data.get('data', {}).get('user') or data.get('data', {})
-                return user.get('name') if isinstance(user, dict) else None
-            return None  # pragma: no cover
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error obteniendo nombre de cliente {client_id}: {str(e)}")
+    @staticmethod
+    def _extract_user_name(user: Optional[dict]) -> Optional[str]:
+        """Extrae el nombre de la respuesta del servicio de autenticación"""
+        if not isinstance(user, dict):
             return None
-
-    def get_seller_names_for_ids(self, seller_ids: List[str]) -> dict:
-        """Devuelve un diccionario {seller_id: seller_name}. Si no se encuentra, usa None."""
-        names: dict = {}
-        unique_ids = list({sid for sid in seller_ids if sid})
-        for seller_id in unique_ids:
-            names[seller_id] = self._get_client_name(seller_id)
-        return names
+        user = user.get('user') or user
+        return user.get('name') if isinstance(user, dict) else None
     
     def delete_all_sales_plans(self) -> bool:
         """Elimina todos los planes"""
@@ -150,15 +335,7 @@ class SalesPlanService:
     
     def _validate_client_exists(self, client_id: str) -> bool:
         """Valida que el cliente existe en el servicio de autenticador"""
-        try:
-            response = requests.get(
-                f"{self.auth_service_url}/auth/user/{client_id}",
-                timeout=5
-            )
-            return response.status_code == 200
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error validando cliente: {str(e)}")
-            return False
+        return self.user_directory.user_exists(client_id)
     
 
     def create(self, data):
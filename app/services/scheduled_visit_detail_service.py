@@ -2,10 +2,11 @@
 Servicio para lógica de negocio del detalle de visitas programadas
 """
 import logging
-import os
 from typing import Optional
-import requests
 from ..repositories.scheduled_visit_repository import ScheduledVisitRepository
+from .user_directory_service import UserDirectoryService
+from ..config.settings import Config
+from ..utils.concurrency import map_with_deadline
 from ..exceptions.custom_exceptions import SalesPlanValidationError, SalesPlanBusinessLogicError
 
 logger = logging.getLogger(__name__)
@@ -14,10 +15,18 @@ logger = logging.getLogger(__name__)
 class ScheduledVisitDetailService:
     """Servicio para obtener detalle completo de visitas programadas"""
     
-    def __init__(self, scheduled_visit_repository: ScheduledVisitRepository):
+    def __init__(
+        self,
+        scheduled_visit_repository: ScheduledVisitRepository,
+        user_directory: Optional[UserDirectoryService] = None,
+        config: Config = None
+    ):
         logger.info("=== INICIALIZANDO ScheduledVisitDetailService ===")
         self.scheduled_visit_repository = scheduled_visit_repository
-        self.auth_service_url = os.getenv('AUTH_SERVICE_URL', 'http://localhost:8080')
+        self.user_directory = user_directory or UserDirectoryService()
+        self.config = config or Config()
+        self.max_workers = self.config.VISIT_DETAIL_MAX_WORKERS
+        self.deadline = self.config.VISIT_DETAIL_DEADLINE
     
     def get_visit_detail(self, visit_id: str, seller_id: str) -> dict:
         """Obtiene el detalle completo de una visita con información de clientes"""
@@ -32,11 +41,17 @@ class ScheduledVisitDetailService:
             if not visit:
                 raise SalesPlanValidationError(f"No se encontró la visita con ID {visit_id} para el vendedor {seller_id}")
             
-            # Obtener información completa de cada cliente
+            # Obtener información completa de los clientes en paralelo, respetando el orden guardado
+            client_ids = [client.client_id for client in visit.clients]
+            results = map_with_deadline(self._get_client_detail, client_ids, self.max_workers, self.deadline)
+            
             clients_details = []
-            for client in visit.clients:
-                client_detail = self._get_client_detail(client.client_id)
-                if client_detail:
+            for client_id, (completed, client_detail) in zip(client_ids, results):
+                if not completed:
+                    # El cliente se retorna parcial para no bloquear el detalle por la consulta más lenta
+                    logger.warning(f"Tiempo agotado obteniendo detalle del cliente {client_id}")
+                    clients_details.append({'id': client_id, 'partial': True})
+                elif client_detail:
                     clients_details.append(client_detail)
             
             return {
@@ -52,36 +67,20 @@ class ScheduledVisitDetailService:
         except Exception as e:
             raise SalesPlanBusinessLogicError(f"Error al obtener detalle de visita: {str(e)}")
     
+    def get_visit_detail_version(self, visit_id: str, seller_id: str) -> Optional[tuple]:
+        """
+        Versión barata de la visita y sus clientes, usada como validador de GET condicionales.
+        Retorna None si la visita no existe para que la petición siga el flujo normal (404).
+        """
+        version = self.scheduled_visit_repository.get_visits_version(seller_id=seller_id, visit_id=visit_id)
+        if not version[0]:
+            return None
+        return version
+    
     def _validate_seller_exists(self, seller_id: str) -> bool:
         """Valida que el vendedor existe en el servicio de autenticador"""
-        try:
-            response = requests.get(
-                f"{self.auth_service_url}/auth/user/{seller_id}",
-                timeout=5
-            )
-            return response.status_code == 200
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error validando vendedor: {str(e)}")
-            return False
+        return self.user_directory.user_exists(seller_id)
     
     def _get_client_detail(self, client_id: str) -> Optional[dict]:
         """Obtiene el detalle completo de un cliente desde el servicio de autenticación"""
-        try:
-            response = requests.get(
-                f"{self.auth_service_url}/auth/user/{client_id}",
-                timeout=5
-            )
-            
-            if response.status_code == 200:
-                response_data = response.json()
-                # El servicio puede retornar data envuelta en "data" o directamente
-                if 'data' in response_data:
-                    return response_data['data']
-                return response_data
-            
-            logger.warning(f"No se pudo obtener detalle del cliente {client_id}: Status {response.status_code}")
-            return None
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error obteniendo detalle del cliente {client_id}: {str(e)}")
-            return None
-
+        return self.user_directory.get_user(client_id)
@@ -0,0 +1,117 @@
+"""
+Servicio para la ruta de un vendedor en un rango de fechas
+"""
+import logging
+from datetime import date, datetime
+from typing import Optional, Tuple
+from ..repositories.scheduled_visit_repository import ScheduledVisitRepository
+from .user_directory_service import UserDirectoryService
+from ..config.settings import Config
+from ..exceptions.custom_exceptions import SalesPlanValidationError, SalesPlanBusinessLogicError
+
+logger = logging.getLogger(__name__)
+
+
+class ScheduledVisitRouteService:
+    """Servicio para obtener las visitas de un rango de fechas con sus clientes"""
+
+    def __init__(
+        self,
+        scheduled_visit_repository: ScheduledVisitRepository,
+        user_directory: Optional[UserDirectoryService] = None,
+        config: Config = None
+    ):
+        logger.info("=== INICIALIZANDO ScheduledVisitRouteService ===")
+        self.scheduled_visit_repository = scheduled_visit_repository
+        self.user_directory = user_directory or UserDirectoryService()
+        self.config = config or Config()
+        self.max_days = self.config.SELLER_ROUTE_MAX_DAYS
+
+    def get_route(self, seller_id: str, date_from: Optional[str], date_to: Optional[str]) -> dict:
+        """
+        Obtiene las visitas del vendedor entre `date_from` y `date_to` (DD-MM-YYYY, inclusive) con
+        sus clientes, estados y hallazgos. Las visitas y sus clientes se leen en una sola consulta y
+        los datos de los clientes se resuelven en una sola ronda, sin repetir los que aparecen en
+        varias visitas.
+        """
+        start, end = self.parse_range(date_from, date_to)
+        try:
+            if not self.user_directory.user_exists(seller_id):
+                raise SalesPlanValidationError(f"El vendedor con ID {seller_id} no existe")
+
+            db_visits = self.scheduled_visit_repository.get_route_for_range(seller_id, start, end)
+            # Un cliente que aparece en varias visitas del rango se consulta una sola vez
+            client_ids = list(dict.fromkeys(
+                db_client.client_id for db_visit in db_visits for db_client in db_visit.clients
+            ))
+            users = self.user_directory.get_users(client_ids) if client_ids else {}
+
+            visits = []
+            for db_visit in db_visits:
+                visits.append({
+                    'id': db_visit.id,
+                    'date': db_visit.date.strftime('%d-%m-%Y'),
+                    'clients': [
+                        {
+                            'client_id': db_client.client_id,
+                            'status': db_client.status,
+                            'find': db_client.find,
+                            'filename': db_client.filename,
+                            'filename_url': db_client.filename_url,
+                            'client': users.get(db_client.client_id)
+                        }
+                        for db_client in db_visit.clients
+                    ],
+                    'created_at': db_visit.created_at.isoformat() if db_visit.created_at else None,
+                    'updated_at': db_visit.updated_at.isoformat() if db_visit.updated_at else None
+                })
+
+            return {
+                'seller_id': seller_id,
+                'from': start.strftime('%d-%m-%Y'),
+                'to': end.strftime('%d-%m-%Y'),
+                'visits': visits
+            }
+        except SalesPlanValidationError:
+            raise
+        except Exception as e:
+            raise SalesPlanBusinessLogicError(f"Error al obtener la ruta del vendedor: {str(e)}")
+
+    def get_route_version(self, seller_id: str, date_from: Optional[str], date_to: Optional[str]) -> Optional[tuple]:
+        """
+        Versión barata de la ruta, usada como validador de GET condicionales.
+        Retorna None si el rango es inválido para que la petición siga el flujo normal.
+        """
+        try:
+            start, end = self.parse_range(date_from, date_to)
+        except SalesPlanValidationError:
+            return None
+
+        return self.scheduled_visit_repository.get_visits_version(
+            seller_id=seller_id,
+            date_from=start,
+            date_to=end
+        )
+
+    def parse_range(self, date_from: Optional[str], date_to: Optional[str]) -> Tuple[date, date]:
+        """Valida el rango de fechas (DD-MM-YYYY) y su longitud máxima"""
+        if not date_from or not date_to:
+            raise SalesPlanValidationError("Los parámetros 'from' y 'to' son obligatorios (DD-MM-YYYY)")
+
+        start = self._parse_date(date_from)
+        end = self._parse_date(date_to)
+
+        if start > end:
+            raise SalesPlanValidationError("La fecha 'from' debe ser menor o igual a la fecha 'to'")
+
+        if (end - start).days + 1 > self.max_days:
+            raise SalesPlanValidationError(f"El rango de fechas no puede superar {self.max_days} días")
+
+        return start, end
+
+    @staticmethod
+    def _parse_date(value: str) -> date:
+        try:
+            return datetime.strptime(value, '%d-%m-%Y').date()
+        except ValueError:
+            raise SalesPlanValidationError(f"El formato de fecha '{value}' es inválido. Use DD-MM-YYYY")
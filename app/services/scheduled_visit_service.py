@@ -2,12 +2,12 @@
 Servicio para lógica de negocio de visitas programadas
 """
 import logging
-import os
 from typing import List, Optional
 from datetime import datetime, date
-import requests
 from ..models.scheduled_visit import ScheduledVisit, ScheduledVisitClient
 from ..repositories.scheduled_visit_repository import ScheduledVisitRepository
+from .user_directory_service import UserDirectoryService
+from ..utils.concurrency import first_failed_check
 from ..exceptions.custom_exceptions import SalesPlanValidationError, SalesPlanBusinessLogicError
 
 logger = logging.getLogger(__name__)
@@ -16,43 +16,61 @@ logger = logging.getLogger(__name__)
 class ScheduledVisitService:
     """Servicio para lógica de negocio de visitas programadas"""
     
-    def __init__(self, scheduled_visit_repository: ScheduledVisitRepository):
+    def __init__(
+        self,
+        scheduled_visit_repository: ScheduledVisitRepository,
+        user_directory: Optional[UserDirectoryService] = None
+    ):
         logger.info("=== INICIALIZANDO ScheduledVisitService ===")
         self.scheduled_visit_repository = scheduled_visit_repository
-        self.auth_service_url = os.getenv('AUTH_SERVICE_URL', 'http://localhost:8080')
+        self.user_directory = user_directory or UserDirectoryService()
+        self.max_workers = self.user_directory.max_workers
     
     def create_scheduled_visit(self, visit_data: dict) -> ScheduledVisit:
         """Crea una nueva visita programada"""
         logger.info(f"=== INICIANDO CREACIÓN DE VISITA PROGRAMADA ===")
         
         try:
-            # Validar que el vendedor existe
-            if not self._validate_seller_exists(visit_data['seller_id']):
-                raise SalesPlanValidationError(f"El vendedor con ID {visit_data['seller_id']} no existe")
+            seller_id = visit_data['seller_id']
+            
+            # Las validaciones locales se resuelven primero; las remotas (vendedor y clientes) se
+            # ejecutan en paralelo y los errores se reportan en el mismo orden de siempre:
+            # vendedor, fecha, lista de clientes y cada cliente en el orden recibido
+            checks = [lambda: self._validate_seller_exists(seller_id)]
+            check_errors = [f"El vendedor con ID {seller_id} no existe"]
+            local_error = None
             
             # Convertir la fecha del formato DD-MM-YYYY a objeto date
             date_str = visit_data['date']
             try:
                 visit_date = datetime.strptime(date_str, '%d-%m-%Y').date()
             except ValueError:
-                raise SalesPlanValidationError(f"El formato de fecha '{date_str}' es inválido. Use DD-MM-YYYY")
+                visit_date = None
+                local_error = f"El formato de fecha '{date_str}' es inválido. Use DD-MM-YYYY"
             
-            # Validar que todos los clientes existen
             clients_data = visit_data.get('clients', [])
-            if not clients_data or len(clients_data) == 0:
-                raise SalesPlanValidationError("Debe haber al menos un cliente en la visita")
+            if local_error is None and (not clients_data or len(clients_data) == 0):
+                local_error = "Debe haber al menos un cliente en la visita"
             
             clients = []
-            for client_data in clients_data:
-                client_id = client_data.get('client_id')
-                if not client_id:
-                    raise SalesPlanValidationError("El client_id es obligatorio para cada cliente")
-                
-                # Validar que el cliente existe
-                if not self._validate_client_exists(client_id):
-                    raise SalesPlanValidationError(f"El cliente con ID {client_id} no existe")
-                
-                clients.append(ScheduledVisitClient(client_id=client_id))
+            if local_error is None:
+                for client_data in clients_data:
+                    client_id = client_data.get('client_id')
+                    if not client_id:
+                        local_error = "El client_id es obligatorio para cada cliente"
+                        break
+                    
+                    checks.append(lambda client_id=client_id: self._validate_client_exists(client_id))
+                    check_errors.append(f"El cliente con ID {client_id} no existe")
+                    clients.append(ScheduledVisitClient(client_id=client_id))
+            
+            # Validar en paralelo que el vendedor y todos los clientes existen
+            failed_at = first_failed_check(checks, self.max_workers)
+            if failed_at is not None:
+                raise SalesPlanValidationError(check_errors[failed_at])
+            
+            if local_error:
+                raise SalesPlanValidationError(local_error)
             
             # Crear el modelo de visita programada
             scheduled_visit = ScheduledVisit(
@@ -118,29 +136,27 @@ class ScheduledVisitService:
         except Exception as e:
             raise SalesPlanBusinessLogicError(f"Error al obtener visitas programadas: {str(e)}")
     
+    def get_scheduled_visits_version(self, seller_id: str, visit_date: Optional[str] = None) -> Optional[tuple]:
+        """
+        Versión barata de las visitas del vendedor, usada como validador de GET condicionales.
+        Retorna None si la fecha es inválida para que la petición siga el flujo normal.
+        """
+        date_filter = None
+        if visit_date:
+            try:
+                date_filter = datetime.strptime(visit_date, '%d-%m-%Y').date()
+            except ValueError:
+                return None
+        
+        return self.scheduled_visit_repository.get_visits_version(seller_id=seller_id, visit_date=date_filter)
+    
     def _validate_seller_exists(self, seller_id: str) -> bool:
         """Valida que el vendedor existe en el servicio de autenticación"""
-        try:
-            response = requests.get(
-                f"{self.auth_service_url}/auth/user/{seller_id}",
-                timeout=5
-            )
-            return response.status_code == 200
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error validando vendedor: {str(e)}")
-            return False
+        return self.user_directory.user_exists(seller_id)
     
     def _validate_client_exists(self, client_id: str) -> bool:
         """Valida que el cliente existe en el servicio de autenticación"""
-        try:
-            response = requests.get(
-                f"{self.auth_service_url}/auth/user/{client_id}",
-                timeout=5
-            )
-            return response.status_code == 200
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error validando cliente: {str(e)}")
-            return False
+        return self.user_directory.user_exists(client_id)
     
     # Métodos heredados de BaseService - implementación mínima
     def create(self, data):
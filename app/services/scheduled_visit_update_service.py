@@ -7,7 +7,11 @@ from typing import Optional
 from werkzeug.datastructures import FileStorage
 from ..repositories.scheduled_visit_repository import ScheduledVisitRepository
 from ..services.cloud_storage_service import CloudStorageService
-from ..exceptions.custom_exceptions import SalesPlanValidationError, SalesPlanBusinessLogicError
+from ..exceptions.custom_exceptions import (
+    SalesPlanValidationError,
+    SalesPlanBusinessLogicError,
+    FileTooLargeError
+)
 
 logger = logging.getLogger(__name__)
 
@@ -32,67 +36,60 @@ class ScheduledVisitUpdateService:
         find: str,
         file: Optional[FileStorage] = None
     ) -> dict:
-        """Actualiza un cliente específico de una visita y sube el archivo a Cloud Storage si se proporciona"""
+        """
+        Actualiza un cliente específico de una visita y sube el archivo a Cloud Storage si se proporciona.
+        
+        El UPDATE se ejecuta primero sin confirmar: si la visita no existe, no es del vendedor o no
+        incluye al cliente, no se sube nada. El archivo se sube con la fila ya bloqueada y la
+        transacción se confirma después; si la subida falla se revierte la actualización, y si lo
+        que falla es la confirmación se elimina el archivo subido.
+        
+        Raises:
+            FileTooLargeError: Si el archivo supera el tamaño máximo; no se actualiza la visita
+        """
+        has_file = bool(file and file.filename)
+        update_data = {
+            'status': 'COMPLETED',
+            'find': find,
+            'filename': self._unique_filename(file.filename) if has_file else None,
+            'filename_url': None
+        }
+        uploaded = False
         try:
-            # Validar que la visita existe y pertenece al vendedor
-            visit = self.scheduled_visit_repository.get_by_id_and_seller(visit_id, seller_id)
-            if not visit:
-                raise SalesPlanValidationError(
-                    f"No se encontró la visita con ID {visit_id} para el vendedor {seller_id}"
-                )
+            # Actualizar el registro en una sola sentencia; la visita, el vendedor y el cliente se
+            # validan en la misma condición del UPDATE
+            updated = self.scheduled_visit_repository.update_client_visit(
+                seller_id,
+                visit_id,
+                client_id,
+                update_data,
+                commit=not has_file
+            )
             
-            # Validar que el cliente existe en la visita
-            client_visit = self.scheduled_visit_repository.get_client_visit(visit_id, client_id)
-            if not client_visit:
+            if not updated:
+                if has_file:
+                    self.scheduled_visit_repository.rollback()
                 raise SalesPlanValidationError(
-                    f"No se encontró el cliente {client_id} en la visita {visit_id}"
+                    f"No se encontró el cliente {client_id} en la visita {visit_id} del vendedor {seller_id}"
                 )
             
-            # Preparar los datos para actualizar
-            update_data = {
-                'status': 'COMPLETED',
-                'find': find,
-                'filename': None,
-                'filename_url': None
-            }
-            
-            # Si se proporciona archivo, subirlo a Cloud Storage
-            if file and file.filename:
+            if has_file:
                 logger.info(f"Subiendo archivo para cliente {client_id} de visita {visit_id}")
-                
-                # Generar nombre único para el archivo
-                # Extraer nombre base y extensión del archivo original
-                original_filename = file.filename
-                if '.' in original_filename:
-                    file_base = '.'.join(original_filename.split('.')[:-1])
-                    file_extension = original_filename.split('.')[-1]
-                else:
-                    file_base = original_filename
-                    file_extension = 'bin'
-                
-                # Generar nombre único: nombre_base-uuid_completo.extension
-                unique_id = uuid.uuid4().hex
-                unique_filename = f"{file_base}-{unique_id}.{file_extension}"
-                
-                # Subir archivo a Cloud Storage
-                success, message, url = self.cloud_storage_service.upload_file(file, unique_filename)
-                
+                success, message, url = self.cloud_storage_service.upload_file(file, update_data['filename'])
                 if not success:
                     raise SalesPlanBusinessLogicError(f"Error al subir archivo: {message}")
+                uploaded = True
+                logger.info(f"Archivo subido exitosamente: {update_data['filename']}")
                 
-                update_data['filename'] = unique_filename
                 update_data['filename_url'] = url
-                logger.info(f"Archivo subido exitosamente: {unique_filename}")
-            
-            # Actualizar el registro
-            updated = self.scheduled_visit_repository.update_client_visit(
-                visit_id, 
-                client_id, 
-                update_data
-            )
-            
-            if not updated:
-                raise SalesPlanBusinessLogicError("No se pudo actualizar el cliente de la visita")
+                self.scheduled_visit_repository.update_client_visit(
+                    seller_id,
+                    visit_id,
+                    client_id,
+                    {'filename_url': url},
+                    commit=False
+                )
+                self.scheduled_visit_repository.commit()
             
             logger.info(f"Cliente {client_id} de visita {visit_id} actualizado exitosamente")
             
@@ -108,5 +105,31 @@ class ScheduledVisitUpdateService:
         except SalesPlanValidationError:
             raise
         except Exception as e:
+            if has_file:
+                self.scheduled_visit_repository.rollback()
+            if uploaded:
+                self._discard_uploaded_file(update_data['filename'])
+            if isinstance(e, (FileTooLargeError, SalesPlanBusinessLogicError)):
+                raise
             raise SalesPlanBusinessLogicError(f"Error al actualizar cliente de la visita: {str(e)}")
+    
+    @staticmethod
+    def _unique_filename(original_filename: str) -> str:
+        """Nombre único en el bucket: nombre_base-uuid_completo.extension"""
+        if '.' in original_filename:
+            file_base = '.'.join(original_filename.split('.')[:-1])
+            file_extension = original_filename.split('.')[-1]
+        else:
+            file_base = original_filename
+            file_extension = 'bin'
+        return f"{file_base}-{uuid.uuid4().hex}.{file_extension}"
+    
+    def _discard_uploaded_file(self, filename: Optional[str]) -> None:
+        """Elimina el archivo subido para una actualización que no se pudo confirmar"""
+        if not filename:
+            return
+        
+        success, message = self.cloud_storage_service.delete_image(filename)
+        if not success:
+            logger.warning(f"No se pudo eliminar el archivo huérfano {filename}: {message}")
 
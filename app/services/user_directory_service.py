@@ -0,0 +1,268 @@
+"""
+Servicio de directorio de usuarios (clientes y vendedores) del servicio de autenticación
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import requests
+from ..config.settings import Config
+from ..exceptions.custom_exceptions import UserDirectoryUnavailableError
+from ..utils.cache import TTLCache, MISSING
+from ..utils.http_client import HttpClient, get_http_client
+
+logger = logging.getLogger(__name__)
+
+# Caché compartida por todo el proceso. Un valor None representa un usuario inexistente (404).
+_user_cache = TTLCache(max_size=Config.USER_CACHE_MAX_SIZE, ttl=Config.USER_CACHE_TTL)
+
+# Resultados de búsqueda de clientes por nombre normalizado: {nombre: [ids]}
+_client_name_cache = TTLCache(max_size=Config.CLIENT_NAME_CACHE_MAX_SIZE, ttl=Config.CLIENT_NAME_CACHE_TTL)
+
+
+def get_user_cache() -> TTLCache:
+    """Retorna la caché de usuarios compartida por el proceso"""
+    return _user_cache
+
+
+def get_client_name_cache() -> TTLCache:
+    """Retorna la caché de búsquedas de clientes por nombre compartida por el proceso"""
+    return _client_name_cache
+
+
+def reset_user_directory() -> None:
+    """Limpia las cachés de usuarios y vuelve a habilitar el endpoint masivo"""
+    _user_cache.clear()
+    _client_name_cache.clear()
+    UserDirectoryService._bulk_unsupported = False
+
+
+class UserDirectoryService:
+    """Resuelve usuarios del servicio de autenticación con caché y consultas agrupadas"""
+
+    # Contrato del endpoint masivo: POST {"ids": [...]} -> {"data": {"users": [{"id": ..., ...}]}}
+    BULK_LOOKUP_PATH = '/auth/users/batch'
+
+    # Códigos con los que el servicio de autenticación indica que no soporta el endpoint masivo
+    BULK_UNSUPPORTED_STATUS = (404, 405, 501)
+
+    # Se marca a nivel de proceso la primera vez que el endpoint masivo responde que no existe
+    _bulk_unsupported = False
+
+    def __init__(
+        self,
+        config: Config = None,
+        cache: Optional[TTLCache] = None,
+        http_client: Optional[HttpClient] = None,
+        name_cache: Optional[TTLCache] = None
+    ):
+        self.config = config or Config()
+        self.auth_service_url = self.config.AUTH_SERVICE_URL
+        self.max_workers = max(1, self.config.AUTH_LOOKUP_MAX_WORKERS)
+        self.bulk_enabled = self.config.AUTH_BULK_LOOKUP_ENABLED
+        self.negative_ttl = self.config.USER_CACHE_NEGATIVE_TTL
+        self.cache = cache if cache is not None else get_user_cache()
+        self.name_cache = name_cache if name_cache is not None else get_client_name_cache()
+        self.http_client = http_client or get_http_client()
+
+    def get_users(self, user_ids: Iterable[str]) -> Dict[str, Optional[dict]]:
+        """
+        Resuelve un conjunto de usuarios en una sola ronda
+
+        Args:
+            user_ids: IDs de usuario (pueden venir repetidos o vacíos)
+
+        Returns:
+            Dict[str, Optional[dict]]: {user_id: datos_usuario}. Si no se encuentra, usa None.
+        """
+        users, unresolved = self.lookup_users(user_ids)
+        users.update(dict.fromkeys(unresolved))
+        return users
+
+    def lookup_users(self, user_ids: Iterable[str]) -> Tuple[Dict[str, Optional[dict]], Set[str]]:
+        """
+        Resuelve un conjunto de usuarios distinguiendo los inexistentes de los no verificados
+
+        Args:
+            user_ids: IDs de usuario (pueden venir repetidos o vacíos)
+
+        Returns:
+            Tuple[Dict[str, Optional[dict]], Set[str]]: ({user_id: datos_usuario}, no_resueltos).
+            El diccionario solo contiene respuestas definitivas (None si el usuario no existe);
+            los IDs que no se pudieron consultar por un fallo del servicio van en el conjunto.
+        """
+        unique_ids = list(dict.fromkeys(uid for uid in user_ids if uid))
+        users: Dict[str, Optional[dict]] = {}
+        pending: List[str] = []
+        for user_id in unique_ids:
+            cached = self.cache.get(user_id)
+            if cached is MISSING:
+                pending.append(user_id)
+            else:
+                users[user_id] = cached
+
+        if not pending:
+            return users, set()
+
+        fetched = None
+        if self.bulk_enabled and not UserDirectoryService._bulk_unsupported:
+            fetched = self._fetch_bulk(pending)
+        if fetched is not None:
+            users.update(fetched)
+            return users, set()
+
+        unresolved = set()
+        for user_id, (definitive, user) in self._fetch_concurrently(pending).items():
+            if definitive:
+                users[user_id] = user
+            else:
+                unresolved.add(user_id)
+        return users, unresolved
+
+    def get_user(self, user_id: str) -> Optional[dict]:
+        """Obtiene los datos de un usuario. Si no se encuentra, retorna None."""
+        return self._fetch_user(user_id)
+
+    def user_exists(self, user_id: str) -> bool:
+        """Indica si el usuario existe en el servicio de autenticación"""
+        return self.get_user(user_id) is not None
+
+    def find_client_ids_by_name(self, client_name: str) -> List[str]:
+        """
+        Busca los IDs de clientes cuyo nombre coincide. Las búsquedas repetidas del mismo nombre
+        (sin distinguir mayúsculas ni espacios extremos) se sirven desde caché.
+
+        Returns:
+            List[str]: IDs encontrados; lista vacía solo si el servicio confirma que no hay coincidencias
+
+        Raises:
+            UserDirectoryUnavailableError: Si el servicio falla, para no confundirlo con una búsqueda vacía
+        """
+        key = ' '.join(client_name.split()).lower()
+        cached = self.name_cache.get(key)
+        if cached is not MISSING:
+            return list(cached)
+
+        try:
+            response = self.http_client.get(
+                f"{self.auth_service_url}/auth/user",
+                params={'name': client_name, 'role': 'Cliente'}
+            )
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error buscando clientes por nombre: {str(e)}")
+            raise UserDirectoryUnavailableError(
+                f"No se pudo buscar clientes por nombre en el servicio de autenticación: {str(e)}"
+            )
+
+        if response.status_code != 200:
+            logger.warning(f"Error buscando clientes por nombre: Status {response.status_code}")
+            raise UserDirectoryUnavailableError(
+                f"No se pudo buscar clientes por nombre en el servicio de autenticación: Status {response.status_code}"
+            )
+
+        data = response.json()
+        users = data.get('data', {}).get('users', [])
+        client_ids = [user['id'] for user in users]
+        self.name_cache.set(key, tuple(client_ids))
+        return client_ids
+
+    def _fetch_bulk(self, user_ids: List[str]) -> Optional[Dict[str, Optional[dict]]]:
+        """Consulta el endpoint masivo. Retorna None si no está disponible para usar el respaldo."""
+        try:
+            response = self.http_client.post(
+                f"{self.auth_service_url}{self.BULK_LOOKUP_PATH}",
+                json={'ids': user_ids}
+            )
+            if response.status_code in self.BULK_UNSUPPORTED_STATUS:
+                logger.warning(
+                    f"Endpoint masivo de usuarios no disponible (Status {response.status_code}), "
+                    f"usando consultas concurrentes"
+                )
+                UserDirectoryService._bulk_unsupported = True
+                return None
+            if response.status_code != 200:
+                logger.warning(f"Error en consulta masiva de usuarios: Status {response.status_code}")
+                return None
+
+            data = response.json()
+            users = data.get('data', {}).get('users', [])
+            found = {user['id']: user for user in users if isinstance(user, dict) and user.get('id')}
+
+            result = {}
+            for user_id in user_ids:
+                user = found.get(user_id)
+                self._store(user_id, user)
+                result[user_id] = user
+            return result
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error en consulta masiva de usuarios: {str(e)}")
+            return None
+
+    def _fetch_concurrently(self, user_ids: List[str]) -> Dict[str, Tuple[bool, Optional[dict]]]:
+        """
+        Respaldo local del endpoint masivo: consultas individuales con concurrencia acotada
+
+        Returns:
+            Dict[str, Tuple[bool, Optional[dict]]]: {user_id: (respuesta_definitiva, datos_usuario)}
+
+        Los IDs ya se buscaron en caché, así que se consultan directamente sin volver a contarlos
+        como fallos de caché.
+        """
+        if len(user_ids) == 1:
+            return {user_ids[0]: self._request_and_store(user_ids[0])}
+
+        workers = min(self.max_workers, len(user_ids))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='user-directory') as executor:
+            results = list(executor.map(self._request_and_store, user_ids))
+        return dict(zip(user_ids, results))
+
+    def _fetch_user(self, user_id: str) -> Optional[dict]:
+        """Obtiene un usuario desde la caché o, si no está, desde el servicio de autenticación"""
+        return self._fetch_user_status(user_id)[1]
+
+    def _fetch_user_status(self, user_id: str) -> Tuple[bool, Optional[dict]]:
+        """Como _fetch_user, pero indica si la respuesta es definitiva (caché, 200 o 404)"""
+        cached = self.cache.get(user_id)
+        if cached is not MISSING:
+            return True, cached
+
+        return self._request_and_store(user_id)
+
+    def _request_and_store(self, user_id: str) -> Tuple[bool, Optional[dict]]:
+        """Consulta un usuario que no está en caché y guarda la respuesta si es definitiva"""
+        definitive, user = self._request_user(user_id)
+        if definitive:
+            self._store(user_id, user)
+        return definitive, user
+
+    def _request_user(self, user_id: str) -> Tuple[bool, Optional[dict]]:
+        """
+        Consulta un usuario individual en el servicio de autenticación
+
+        Returns:
+            Tuple[bool, Optional[dict]]: (respuesta_definitiva, datos_usuario). Solo las respuestas
+            definitivas (200 y 404) se guardan en caché.
+        """
+        try:
+            response = self.http_client.get(f"{self.auth_service_url}/auth/user/{user_id}")
+            if response.status_code == 200:
+                try:
+                    response_data = response.json()
+                except ValueError:
+                    response_data = {}
+                # El servicio puede retornar data envuelta en "data" o directamente
+                if isinstance(response_data, dict) and 'data' in response_data:
+                    return True, response_data['data'] or {}
+                return True, response_data
+
+            logger.warning(f"No se pudo obtener el usuario {user_id}: Status {response.status_code}")
+            return response.status_code == 404, None
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error obteniendo usuario {user_id}: {str(e)}")
+            return False, None
+
+    def _store(self, user_id: str, user: Optional[dict]) -> None:
+        """Guarda el usuario en caché; los inexistentes usan el TTL negativo"""
+        if user is None:
+            self.cache.set(user_id, None, ttl=self.negative_ttl)
+        else:
+            self.cache.set(user_id, user)
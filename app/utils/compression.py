@@ -0,0 +1,92 @@
+"""
+Compresión negociada de respuestas con gzip
+"""
+import gzip
+import logging
+import zlib
+from typing import Iterable, Iterator, Optional
+from flask import Flask, Response, request
+from ..config.settings import Config
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_MIMETYPES = ('application/json', 'text/plain', 'text/html', 'text/csv')
+
+
+SUPPORTED_ENCODINGS = ('gzip',)
+
+
+def compress(data: bytes, level: int) -> bytes:
+    """Comprime un cuerpo completo con gzip"""
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def compress_stream(chunks: Iterable[bytes], level: int) -> Iterator[bytes]:
+    """Comprime una respuesta por partes sin cargarla completa en memoria"""
+    # wbits=31 produce el formato gzip (cabecera y CRC) en lugar de zlib crudo
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+class ResponseCompressor:
+    """Hook after_request que comprime las respuestas según Accept-Encoding"""
+
+    def __init__(
+        self,
+        min_size: int = 1024,
+        level: int = 6,
+        mimetypes: Iterable[str] = COMPRESSIBLE_MIMETYPES
+    ):
+        self.min_size = min_size
+        self.level = level
+        self.mimetypes = tuple(mimetypes)
+
+    def negotiate(self) -> Optional[str]:
+        """Mejor codificación aceptada por el cliente, o None"""
+        return request.accept_encodings.best_match(SUPPORTED_ENCODINGS)
+
+    def __call__(self, response: Response) -> Response:
+        if (
+            response.status_code < 200
+            or response.status_code >= 300
+            or response.status_code == 204
+            or response.mimetype not in self.mimetypes
+            or 'Content-Encoding' in response.headers
+        ):
+            return response
+
+        # El cuerpo depende de Accept-Encoding aunque esta respuesta no se comprima
+        response.vary.add('Accept-Encoding')
+
+        encoding = self.negotiate()
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = compress_stream(response.iter_encoded(), self.level)
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < self.min_size:
+                return response
+            response.set_data(compress(data, self.level))
+
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+
+def init_compression(app: Flask, config: Config = None) -> None:
+    """Registra la compresión de respuestas en la aplicación"""
+    config = config or Config()
+    if not config.COMPRESSION_ENABLED:
+        logger.info("Compresión de respuestas deshabilitada")
+        return
+
+    app.after_request(ResponseCompressor(
+        min_size=config.COMPRESSION_MIN_SIZE,
+        level=config.COMPRESSION_LEVEL
+    ))
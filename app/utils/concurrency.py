@@ -0,0 +1,85 @@
+"""
+Utilidades para ejecutar consultas de E/S en paralelo con concurrencia acotada
+"""
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+
+def first_failed_check(checks: List[Callable[[], bool]], max_workers: int) -> Optional[int]:
+    """
+    Ejecuta verificaciones en paralelo y retorna el índice de la primera que falla según el orden
+    de la lista, o None si todas pasan.
+
+    El resultado es determinista: una falla en la posición i solo se reporta cuando todas las
+    verificaciones anteriores terminaron con éxito. Las verificaciones posteriores a una falla
+    conocida se cancelan sin esperar su resultado.
+
+    Args:
+        checks: Funciones sin argumentos que retornan True si la verificación pasa
+        max_workers: Número máximo de verificaciones simultáneas
+    """
+    if not checks:
+        return None
+
+    if len(checks) == 1:
+        return None if checks[0]() else 0
+
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(checks))))
+    try:
+        futures = [executor.submit(check) for check in checks]
+        index_of = {future: index for index, future in enumerate(futures)}
+        pending = set(futures)
+        failed_at: Optional[int] = None
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = index_of[future]
+                if future.cancelled() or (failed_at is not None and index > failed_at):
+                    continue
+                if not future.result():
+                    failed_at = index
+
+            if failed_at is not None:
+                # Solo interesan las verificaciones anteriores a la falla conocida
+                for future in list(pending):
+                    if index_of[future] > failed_at:
+                        future.cancel()
+                        pending.discard(future)
+
+        return failed_at
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def map_with_deadline(
+    func: Callable[[Any], Any],
+    items: Sequence[Any],
+    max_workers: int,
+    timeout: Optional[float]
+) -> List[Tuple[bool, Any]]:
+    """
+    Aplica `func` a cada elemento en paralelo y espera como máximo `timeout` segundos en total.
+
+    Returns:
+        List[Tuple[bool, Any]]: Un par (completado, resultado) por elemento, en el mismo orden de
+        `items`. Los elementos que no terminan antes del plazo retornan (False, None).
+    """
+    if not items:
+        return []
+
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(items))))
+    try:
+        futures = [executor.submit(func, item) for item in items]
+        wait(futures, timeout=timeout)
+
+        results: List[Tuple[bool, Any]] = []
+        for future in futures:
+            if future.done() and not future.cancelled():
+                results.append((True, future.result()))
+            else:
+                future.cancel()
+                results.append((False, None))
+        return results
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
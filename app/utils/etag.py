@@ -0,0 +1,33 @@
+"""
+Validadores ETag débiles para GET condicionales (If-None-Match / 304)
+"""
+import hashlib
+from typing import Any
+from flask import Response, after_this_request, request
+
+
+def make_etag(*parts: Any) -> str:
+    """Calcula un ETag (sin comillas) a partir de las partes que determinan la respuesta"""
+    digest = hashlib.sha1(repr(parts).encode('utf-8'))
+    return digest.hexdigest()[:32]
+
+
+def etag_matches(etag: str) -> bool:
+    """Indica si el cliente ya tiene esta versión (comparación débil de If-None-Match)"""
+    return request.if_none_match.contains_weak(etag)
+
+
+def not_modified_response(etag: str) -> Response:
+    """Respuesta 304 sin cuerpo con el ETag vigente"""
+    response = Response(status=304)
+    response.set_etag(etag, weak=True)
+    return response
+
+
+def attach_etag(etag: str) -> None:
+    """Agrega el ETag a la respuesta de la petición actual si resulta exitosa (200)"""
+    @after_this_request
+    def _set_etag(response):
+        if response.status_code == 200:
+            response.set_etag(etag, weak=True)
+        return response
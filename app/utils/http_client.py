@@ -0,0 +1,75 @@
+"""
+Cliente HTTP compartido con pool de conexiones keep-alive para llamadas salientes
+"""
+import logging
+import threading
+from typing import Optional
+import requests
+from urllib3.util.retry import Retry
+from ..config.settings import Config
+
+logger = logging.getLogger(__name__)
+
+# Solo se reintentan métodos idempotentes
+RETRY_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS'])
+RETRY_STATUS = (502, 503, 504)
+
+
+class HttpClient:
+    """Cliente HTTP con sesión persistente, reintentos con backoff y timeouts de conexión y lectura"""
+
+    def __init__(self, config: Config = None):
+        self.config = config or Config()
+        self.timeout = (self.config.HTTP_CONNECT_TIMEOUT, self.config.HTTP_READ_TIMEOUT)
+        self.session = self._build_session()
+
+    def _build_session(self) -> requests.Session:
+        """Crea la sesión con el pool de conexiones y la política de reintentos"""
+        retry = Retry(
+            total=self.config.HTTP_MAX_RETRIES,
+            backoff_factor=self.config.HTTP_BACKOFF_FACTOR,
+            status_forcelist=RETRY_STATUS,
+            allowed_methods=RETRY_METHODS,
+            raise_on_status=False
+        )
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=self.config.HTTP_POOL_CONNECTIONS,
+            pool_maxsize=self.config.HTTP_POOL_MAXSIZE,
+            max_retries=retry
+        )
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """GET con reintentos y timeout por defecto"""
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.get(url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """POST sin reintentos automáticos y con timeout por defecto"""
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.post(url, **kwargs)
+
+    def close(self) -> None:
+        """Cierra las conexiones del pool"""
+        self.session.close()
+
+
+_http_client: Optional[HttpClient] = None
+_http_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Retorna el cliente HTTP compartido por el proceso, creándolo la primera vez"""
+    global _http_client
+    if _http_client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                _http_client = HttpClient()
+                logger.info(
+                    f"Cliente HTTP inicializado - Pool: {_http_client.config.HTTP_POOL_MAXSIZE}, "
+                    f"Timeouts: {_http_client.timeout}"
+                )
+    return _http_client
@@ -0,0 +1,53 @@
+"""
+Métricas simples en memoria para dimensionar recursos compartidos
+"""
+import threading
+from bisect import bisect_left
+from itertools import accumulate
+from typing import Any, Dict, Sequence
+
+# Límites superiores de cada bucket en milisegundos
+DEFAULT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+
+class Histogram:
+    """
+    Histograma acumulado de duraciones, seguro entre hilos. Cada bucket `le_X` cuenta las
+    observaciones menores o iguales a X (convención de Prometheus), así que `le_inf` es el total.
+    """
+
+    def __init__(self, buckets_ms: Sequence[float] = DEFAULT_BUCKETS_MS):
+        self.buckets_ms = tuple(sorted(buckets_ms))
+        self._lock = threading.Lock()
+        self.reset()
+
+    def observe(self, value_ms: float) -> None:
+        """Registra una duración en milisegundos"""
+        index = bisect_left(self.buckets_ms, value_ms)
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._sum += value_ms
+            if value_ms > self._max:
+                self._max = value_ms
+
+    def reset(self) -> None:
+        """Reinicia todas las observaciones"""
+        with self._lock:
+            self._counts = [0] * (len(self.buckets_ms) + 1)
+            self._count = 0
+            self._sum = 0.0
+            self._max = 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Retorna los buckets acumulados (cantidad de observaciones <= límite) y estadísticas básicas"""
+        with self._lock:
+            labels = [f"le_{bound:g}" for bound in self.buckets_ms] + ['le_inf']
+            # Internamente cada observación se cuenta solo en su bucket; se acumulan al exponerlas
+            return {
+                'count': self._count,
+                'sum_ms': round(self._sum, 3),
+                'avg_ms': round(self._sum / self._count, 3) if self._count else 0.0,
+                'max_ms': round(self._max, 3),
+                'buckets': dict(zip(labels, accumulate(self._counts)))
+            }
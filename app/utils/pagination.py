@@ -0,0 +1,30 @@
+"""
+Cursores opacos para la paginación por llave (keyset)
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+
+
+def encode_cursor(created_at: datetime, entity_id: int) -> str:
+    """Codifica la llave (created_at, id) del último elemento de la página"""
+    payload = json.dumps([created_at.isoformat(), entity_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decodifica un cursor generado por `encode_cursor`
+
+    Raises:
+        ValueError: Si el cursor no es válido
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, entity_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if not isinstance(entity_id, int) or isinstance(entity_id, bool):
+            raise ValueError("id inválido")
+        return datetime.fromisoformat(created_at), entity_id
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise ValueError(f"Cursor inválido: {cursor}") from e
@@ -0,0 +1,127 @@
+"""
+Caché de respuestas de endpoints de lectura con backend intercambiable
+"""
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Hashable, Optional, Tuple
+from ..config.settings import Config
+from .cache import TTLCache, MISSING
+
+
+class CacheBackend(ABC):
+    """Almacenamiento de respuestas. Un backend compartido (p. ej. Redis) implementa esta interfaz."""
+
+    @abstractmethod
+    def get(self, key: Hashable) -> Any:  # pragma: no cover
+        """Retorna el valor vigente o MISSING"""
+        pass
+
+    @abstractmethod
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:  # pragma: no cover
+        """Guarda un valor con el TTL indicado (segundos)"""
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:  # pragma: no cover
+        """Elimina todas las entradas"""
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores del backend, si los expone"""
+        return {}
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """Backend LRU en memoria del proceso"""
+
+    def __init__(self, max_size: int = 256, ttl: float = 30.0):
+        self._cache = TTLCache(max_size=max_size, ttl=ttl)
+
+    def get(self, key: Hashable) -> Any:
+        return self._cache.get(key)
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        self._cache.set(key, value, ttl=ttl)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
+
+
+class ResponseCache:
+    """
+    Caché de respuestas por conjunto de parámetros normalizado.
+
+    Cada invalidación incrementa una generación; una respuesta calculada antes de una escritura
+    no se guarda después de ella, así las escrituras se ven de inmediato. La invalidación es local
+    al proceso: con varios workers, un backend compartido debe implementar `clear` globalmente.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: float, enabled: bool = True):
+        self.backend = backend
+        self.ttl = ttl
+        self.enabled = enabled
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(params: Dict[str, Any]) -> Tuple:
+        """Llave independiente del orden de los parámetros, sin vacíos y con textos recortados"""
+        normalized = []
+        for name, value in params.items():
+            if isinstance(value, str):
+                value = value.strip()
+            if value is None or value == '':
+                continue
+            normalized.append((name, value))
+        return tuple(sorted(normalized))
+
+    @property
+    def generation(self) -> int:
+        """Generación actual; cambia en cada invalidación"""
+        return self._generation
+
+    def get(self, key: Tuple) -> Any:
+        """Retorna la respuesta guardada o MISSING"""
+        if not self.enabled:
+            return MISSING
+        return self.backend.get(key)
+
+    def set(self, key: Tuple, value: Any, generation: Optional[int] = None) -> None:
+        """Guarda la respuesta si no hubo invalidaciones desde `generation`"""
+        if not self.enabled:
+            return
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self.backend.set(key, value, self.ttl)
+
+    def invalidate(self) -> None:
+        """Descarta todas las respuestas guardadas"""
+        with self._lock:
+            self._generation += 1
+            self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores de la caché de respuestas"""
+        return dict(self.backend.stats(), enabled=self.enabled, generation=self._generation)
+
+
+_sales_plan_response_cache = ResponseCache(
+    InMemoryCacheBackend(max_size=Config.SALES_PLAN_CACHE_MAX_SIZE, ttl=Config.SALES_PLAN_CACHE_TTL),
+    ttl=Config.SALES_PLAN_CACHE_TTL,
+    enabled=Config.SALES_PLAN_CACHE_ENABLED
+)
+
+
+def get_sales_plan_response_cache() -> ResponseCache:
+    """Retorna la caché de respuestas del listado de planes de ventas"""
+    return _sales_plan_response_cache
+
+
+def set_sales_plan_response_cache_backend(backend: CacheBackend) -> None:
+    """Reemplaza el backend de la caché del listado de planes (p. ej. por uno compartido)"""
+    _sales_plan_response_cache.backend = backend
+    _sales_plan_response_cache.invalidate()
@@ -0,0 +1,61 @@
+"""
+Serialización JSON de las respuestas de la API con codificador intercambiable
+
+Por defecto usa orjson si está instalado (serializa datetime/date en C) y si no, la librería
+estándar. Los modelos pueden incluirse directamente en la respuesta implementando `__json__`.
+"""
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Optional
+from flask import make_response, Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """Tipos que el codificador no conoce: modelos (`__json__`), fechas y Decimal"""
+    if hasattr(obj, '__json__'):
+        return obj.__json__()
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Tipo no serializable a JSON: {type(obj).__name__}")
+
+
+def _dumps_orjson(data: Any) -> bytes:
+    return orjson.dumps(data, default=_default)
+
+
+def _dumps_json(data: Any) -> bytes:
+    return json.dumps(data, default=_default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+ENCODERS: Dict[str, Callable[[Any], bytes]] = {'json': _dumps_json}
+if orjson is not None:
+    ENCODERS['orjson'] = _dumps_orjson
+
+
+def get_encoder(name: Optional[str] = None) -> Callable[[Any], bytes]:
+    """
+    Retorna el codificador indicado ('orjson' o 'json'). 'auto' o None elige orjson si está
+    disponible. Un nombre desconocido o no instalado usa la librería estándar.
+    """
+    if name in (None, 'auto'):
+        name = 'orjson' if orjson is not None else 'json'
+    return ENCODERS.get(name, _dumps_json)
+
+
+def make_json_representation(encoder: Callable[[Any], bytes]) -> Callable[..., Response]:
+    """Crea la representación 'application/json' de flask_restful con el codificador dado"""
+    def output_json(data: Any, code: int, headers: Optional[dict] = None) -> Response:
+        response = make_response(encoder(data), code)
+        response.mimetype = 'application/json'
+        response.headers.extend(headers or {})
+        return response
+
+    return output_json
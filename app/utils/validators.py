@@ -0,0 +1,42 @@
+"""
+Validaciones de formato compartidas por los modelos
+
+Los patrones se compilan una sola vez al importar el módulo; la creación masiva valida miles de
+identificadores y no debe recompilar ni buscar el patrón en la caché de `re` en cada llamada.
+"""
+import re
+from typing import Any
+
+UUID_LENGTH = 36
+
+UUID_PATTERN = re.compile(r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}')
+
+NAME_PATTERN = re.compile(r'[a-zA-Z0-9áéíóúÁÉÍÓÚñÑ\s-]+')
+
+
+def is_uuid(value: Any) -> bool:
+    """Indica si el valor es un UUID en formato texto (8-4-4-4-12 hexadecimal, sin llaves)"""
+    return (
+        isinstance(value, str)
+        and len(value) == UUID_LENGTH
+        and UUID_PATTERN.fullmatch(value) is not None
+    )
+
+
+def is_valid_name(value: str) -> bool:
+    """Indica si el nombre solo contiene letras, números, espacios, guiones y tildes"""
+    return NAME_PATTERN.fullmatch(value) is not None
+
+
+def validate_uuid(value: Any, field: str, required_message: str) -> None:
+    """
+    Valida un identificador obligatorio en formato UUID
+
+    Raises:
+        ValueError: Con `required_message` si falta, o indicando el campo si no es un UUID válido
+    """
+    if not value:
+        raise ValueError(required_message)
+
+    if not is_uuid(value):
+        raise ValueError(f"El {field} debe ser un UUID válido")
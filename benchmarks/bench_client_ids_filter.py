@@ -0,0 +1,103 @@
+"""
+Benchmark del filtro por IDs de cliente del listado de planes de ventas
+
+Compara la cadena de OR anterior con el IN de parámetros expandidos y el = ANY(:array) de
+PostgreSQL para 1k y 10k IDs: tiempo de compilación, tamaño del SQL y número de parámetros. Si
+BENCH_DATABASE_URL apunta a una base de datos, además ejecuta cada consulta contra ella
+(por defecto SQLite en memoria con 20k planes).
+
+Uso:
+    python benchmarks/bench_client_ids_filter.py
+    BENCH_DATABASE_URL=postgresql+psycopg2://... python benchmarks/bench_client_ids_filter.py
+"""
+import os
+import sys
+import time
+import uuid
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import ARRAY, String, any_, bindparam, create_engine, or_, select  # noqa: E402
+from sqlalchemy.dialects import postgresql  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from app.models.db_models import Base, SalesPlanDB  # noqa: E402
+
+SIZES = (1_000, 10_000)
+TOTAL_PLANS = 20_000
+REPEAT = 5
+
+
+def predicates(client_ids):
+    """Variantes del filtro a comparar"""
+    return {
+        'or_chain': lambda: or_(*[SalesPlanDB.client_id == cid for cid in client_ids]),
+        'in_expanding': lambda: SalesPlanDB.client_id.in_(client_ids),
+        'any_array': lambda: SalesPlanDB.client_id == any_(
+            bindparam('client_ids', value=client_ids, type_=ARRAY(String))
+        ),
+    }
+
+
+def best_of(func, repeat=REPEAT):
+    """Mejor tiempo en milisegundos de `repeat` ejecuciones"""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best, result
+
+
+def bench_compile():
+    dialect = postgresql.dialect()
+    print(f"{'ids':>6} {'variante':<14} {'compilar (ms)':>14} {'SQL (bytes)':>12} {'parámetros':>11}")
+    for size in SIZES:
+        client_ids = [str(uuid.uuid4()) for _ in range(size)]
+        for name, build in predicates(client_ids).items():
+            def compile_statement():
+                statement = select(SalesPlanDB.id).where(build())
+                return statement.compile(dialect=dialect, compile_kwargs={'render_postcompile': True})
+            elapsed, compiled = best_of(compile_statement)
+            print(f"{size:>6} {name:<14} {elapsed:>14.2f} {len(str(compiled)):>12} {len(compiled.params):>11}")
+
+
+def bench_execute(url):
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+
+    client_ids = [str(uuid.uuid4()) for _ in range(TOTAL_PLANS)]
+    if session.query(SalesPlanDB).count() < TOTAL_PLANS:
+        now = datetime.utcnow()
+        session.bulk_insert_mappings(SalesPlanDB, [
+            {
+                'name': f'Plan bench {uuid.uuid4()}', 'start_date': now, 'end_date': now,
+                'client_id': client_id, 'seller_id': 'bench-seller', 'target_revenue': 1.0
+            }
+            for client_id in client_ids
+        ])
+        session.commit()
+    else:
+        client_ids = [row[0] for row in session.query(SalesPlanDB.client_id).limit(TOTAL_PLANS)]
+
+    print(f"\nEjecución contra {engine.dialect.name} ({TOTAL_PLANS} planes)")
+    print(f"{'ids':>6} {'variante':<14} {'ejecutar (ms)':>14} {'filas':>7}")
+    for size in SIZES:
+        subset = client_ids[:size]
+        for name, build in predicates(subset).items():
+            if name == 'any_array' and engine.dialect.name != 'postgresql':
+                continue
+            try:
+                elapsed, rows = best_of(lambda: session.query(SalesPlanDB.id).filter(build()).all(), repeat=3)
+                print(f"{size:>6} {name:<14} {elapsed:>14.2f} {len(rows):>7}")
+            except Exception as e:
+                session.rollback()
+                print(f"{size:>6} {name:<14} {'error':>14}  {str(e).splitlines()[0][:60]}")
+    session.close()
+
+
+if __name__ == '__main__':
+    bench_compile()
+    bench_execute(os.getenv('BENCH_DATABASE_URL', 'sqlite://'))
@@ -0,0 +1,101 @@
+"""
+Benchmark de compresión de respuestas: tamaño del cuerpo frente a costo de CPU
+
+Usa cuerpos representativos de GET /sales-plan (página de 100 planes con nombres) y de
+GET /sellers/<id>/route/<visit_id> (visita con 50 clientes y su registro completo del servicio de
+autenticación). Compara gzip en varios niveles.
+
+Uso:
+    python benchmarks/bench_compression.py
+"""
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.compression import compress  # noqa: E402
+
+REPEAT = 50
+
+
+def sales_plan_page(per_page=100):
+    base = datetime(2025, 1, 1)
+    items = []
+    for i in range(per_page):
+        items.append({
+            'id': i + 1,
+            'name': f'Plan de ventas trimestral {i}',
+            'start_date': (base + timedelta(days=i)).isoformat(),
+            'end_date': (base + timedelta(days=i + 90)).isoformat(),
+            'client_id': str(uuid.uuid4()),
+            'seller_id': str(uuid.uuid4()),
+            'target_revenue': 150000.5 + i,
+            'objectives': 'Aumentar la participación en hospitales de la zona norte',
+            'created_at': base.isoformat(),
+            'updated_at': base.isoformat(),
+            'client_name': f'Hospital San José {i}',
+            'seller_name': 'María Fernanda Gómez'
+        })
+    return {
+        'success': True,
+        'message': 'Planes de ventas obtenidos exitosamente',
+        'data': {'items': items, 'pagination': {'page': 1, 'per_page': per_page, 'total': 5000, 'total_pages': 50}}
+    }
+
+
+def visit_detail(clients=50):
+    return {
+        'success': True,
+        'message': 'Detalle de visita obtenido exitosamente',
+        'data': {
+            'id': str(uuid.uuid4()),
+            'seller_id': str(uuid.uuid4()),
+            'date': '01-12-2025',
+            'clients': [
+                {
+                    'id': str(uuid.uuid4()),
+                    'name': f'Clínica Los Andes {i}',
+                    'email': f'compras{i}@clinicalosandes.com',
+                    'role': 'Cliente',
+                    'identification_type': 'NIT',
+                    'identification_number': f'900{i:06d}',
+                    'phone': '+57 601 555 0000',
+                    'address': f'Calle {i} # 45-67, Bogotá',
+                    'institution_type': 'Clínica',
+                    'logo_url': f'https://storage.googleapis.com/medisupply/logos/{uuid.uuid4()}.png',
+                    'created_at': '2025-01-01T00:00:00',
+                    'updated_at': '2025-01-01T00:00:00'
+                }
+                for i in range(clients)
+            ],
+            'created_at': '2025-11-01T10:00:00',
+            'updated_at': '2025-11-01T10:00:00'
+        }
+    }
+
+
+def variants():
+    yield 'gzip-1', 1
+    yield 'gzip-6', 6
+    yield 'gzip-9', 9
+
+
+def bench(name, payload):
+    body = json.dumps(payload).encode('utf-8')
+    print(f"\n{name}: {len(body)} bytes sin comprimir")
+    print(f"{'variante':<8} {'bytes':>8} {'ratio':>7} {'ms/resp':>8}")
+    for label, level in variants():
+        start = time.perf_counter()
+        for _ in range(REPEAT):
+            compressed = compress(body, level)
+        elapsed = (time.perf_counter() - start) * 1000 / REPEAT
+        print(f"{label:<8} {len(compressed):>8} {len(body) / len(compressed):>6.1f}x {elapsed:>8.3f}")
+
+
+if __name__ == '__main__':
+    bench('GET /sales-plan (100 planes)', sales_plan_page())
+    bench('GET /sellers/<id>/route/<visit_id> (50 clientes)', visit_detail())
@@ -0,0 +1,104 @@
+"""
+Benchmark de materialización de modelos de dominio: memoria y tiempo para 100k planes de ventas
+
+Construye los planes con `SalesPlanRepository._db_to_model` a partir de filas ya leídas y compara
+el modelo con `__slots__` frente a una clase equivalente con `__dict__` por instancia (mismo
+constructor), que es como estaba definido el modelo antes.
+
+Uso:
+    python benchmarks/bench_model_materialization.py [cantidad]
+"""
+import gc
+import os
+import sys
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.sales_plan import SalesPlan  # noqa: E402
+
+COUNT = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+
+class DictSalesPlan:
+    """Mismo constructor que SalesPlan pero con `__dict__` por instancia"""
+    __init__ = SalesPlan.__init__
+
+
+def make_rows(count):
+    base = datetime(2025, 1, 1)
+    client_id = str(uuid.uuid4())
+    seller_id = str(uuid.uuid4())
+    return [
+        SimpleNamespace(
+            id=i,
+            name=f'Plan de ventas {i}',
+            start_date=base + timedelta(days=i % 365),
+            end_date=base + timedelta(days=i % 365 + 90),
+            client_id=client_id,
+            seller_id=seller_id,
+            target_revenue=150000.5,
+            objectives='Aumentar ventas',
+            created_at=base,
+            updated_at=base
+        )
+        for i in range(count)
+    ]
+
+
+def materialize(model_class, rows):
+    return [
+        model_class(
+            id=row.id,
+            name=row.name,
+            start_date=row.start_date,
+            end_date=row.end_date,
+            client_id=row.client_id,
+            seller_id=row.seller_id,
+            target_revenue=row.target_revenue,
+            objectives=row.objectives,
+            created_at=row.created_at,
+            updated_at=row.updated_at
+        )
+        for row in rows
+    ]
+
+
+def measure(model_class, rows):
+    gc.collect()
+    tracemalloc.start()
+    models = materialize(model_class, rows)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del models
+
+    best = float('inf')
+    for _ in range(3):
+        gc.collect()
+        start = time.perf_counter()
+        models = materialize(model_class, rows)
+        best = min(best, time.perf_counter() - start)
+        del models
+    return current, best
+
+
+def main():
+    rows = make_rows(COUNT)
+    print(f"Materialización de {COUNT} planes de ventas")
+    print(f"{'modelo':<12} {'memoria':>12} {'bytes/plan':>11} {'tiempo':>10} {'planes/s':>12}")
+    results = {}
+    for label, model_class in (('__dict__', DictSalesPlan), ('__slots__', SalesPlan)):
+        memory, elapsed = measure(model_class, rows)
+        results[label] = memory
+        print(f"{label:<12} {memory / 1024 / 1024:>10.1f}MB {memory / COUNT:>11.0f} "
+              f"{elapsed * 1000:>8.0f}ms {COUNT / elapsed:>12.0f}")
+    reduction = 1 - results['__slots__'] / results['__dict__']
+    print(f"Reducción de memoria: {reduction:.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark de serialización de una página del listado de planes de ventas
+
+Compara el camino anterior (`to_dict` más `json.dumps`) con el actual (`__json__` más el
+codificador de `app.utils.serialization`: orjson si está instalado, si no la librería estándar).
+Verifica primero que ambos producen el mismo JSON.
+
+Uso:
+    python benchmarks/bench_serialization.py [planes_por_página]
+"""
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.sales_plan import SalesPlan  # noqa: E402
+from app.utils import serialization  # noqa: E402
+
+COUNT = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+REPEAT = 200
+
+
+def make_plans(count):
+    return [
+        SalesPlan(
+            id=i,
+            name=f'Plan {i}',
+            start_date=datetime(2025, 1, 1),
+            end_date=datetime(2025, 3, 31, 23, 59, 59),
+            client_id='a527df89-03f4-4c2c-9d4f-8e6b5c7d3a1b',
+            seller_id='b527df89-03f4-4c2c-9d4f-8e6b5c7d3a1b',
+            target_revenue=150000.505,
+            objectives='Aumentar ventas',
+            created_at=datetime(2025, 1, 1, 10, 0, 0, 123456),
+            updated_at=datetime(2025, 1, 2, 10, 0, 0)
+        )
+        for i in range(count)
+    ]
+
+
+def baseline(plans):
+    items = []
+    for plan in plans:
+        item = plan.to_dict()
+        item['client_name'] = 'Cliente'
+        items.append(item)
+    return json.dumps({'success': True, 'data': {'items': items}})
+
+
+def fast(plans, encoder):
+    items = []
+    for plan in plans:
+        item = plan.__json__()
+        item['client_name'] = 'Cliente'
+        items.append(item)
+    return encoder({'success': True, 'data': {'items': items}})
+
+
+def best_of(func):
+    best = float('inf')
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    plans = make_plans(COUNT)
+    encoder_name = 'orjson' if serialization.orjson is not None else 'json'
+    encoder = serialization.get_encoder('auto')
+    assert json.loads(fast(plans, encoder)) == json.loads(baseline(plans))
+
+    baseline_time = best_of(lambda: baseline(plans))
+    fast_time = best_of(lambda: fast(plans, encoder))
+    print(f"Serialización de una página de {COUNT} planes (mejor de {REPEAT})")
+    print(f"{'to_dict + json':<20} {baseline_time * 1e6:>10.0f} µs")
+    print(f"{'__json__ + ' + encoder_name:<20} {fast_time * 1e6:>10.0f} µs")
+    print(f"Aceleración: {baseline_time / fast_time:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark de creación de visitas programadas con 50 y 500 clientes
+
+Compara el camino anterior (un objeto ORM por cliente, flush, commit y refresh) con
+`ScheduledVisitRepository.create` (INSERT de la visita más un INSERT de varias filas para los
+clientes, sin refresh): tiempo por visita y número de sentencias enviadas a la base de datos.
+Por defecto usa SQLite en un archivo temporal; BENCH_DATABASE_URL permite apuntar a PostgreSQL.
+
+Uso:
+    python benchmarks/bench_visit_create.py
+    BENCH_DATABASE_URL=postgresql+psycopg2://... python benchmarks/bench_visit_create.py
+"""
+import os
+import sys
+import tempfile
+import time
+import uuid
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, event  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from app.models.db_models import Base, ScheduledVisitDB, ScheduledVisitClientDB  # noqa: E402
+from app.models.scheduled_visit import ScheduledVisit, ScheduledVisitClient  # noqa: E402
+from app.repositories.scheduled_visit_repository import ScheduledVisitRepository  # noqa: E402
+
+SIZES = (50, 500)
+REPEAT = 10
+
+
+def create_orm(session, visit):
+    """Camino anterior: unidad de trabajo del ORM y refresh posterior al commit"""
+    db_visit = ScheduledVisitDB(id=visit.id, seller_id=visit.seller_id, date=visit.date)
+    session.add(db_visit)
+    for client in visit.clients:
+        session.add(ScheduledVisitClientDB(visit_id=visit.id, client_id=client.client_id, status='SCHEDULED'))
+    session.flush()
+    session.commit()
+    session.refresh(db_visit)
+
+
+def create_bulk(session, visit):
+    """Camino actual del repositorio"""
+    ScheduledVisitRepository(session).create(visit)
+
+
+def make_visit(day, size):
+    return ScheduledVisit(
+        seller_id=str(uuid.uuid4()),
+        date=date(2030, 1, 1) + timedelta(days=day),
+        clients=[ScheduledVisitClient(str(uuid.uuid4())) for _ in range(size)]
+    )
+
+
+def main():
+    url = os.getenv('BENCH_DATABASE_URL')
+    if url is None:
+        url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_visits.db')}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+
+    statements = []
+    event.listen(engine, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+
+    print(f"Creación de visitas contra {engine.dialect.name}")
+    print(f"{'clientes':>8} {'camino':<6} {'ms/visita':>10} {'sentencias':>11}")
+    day = 0
+    for size in SIZES:
+        for name, create in (('orm', create_orm), ('bulk', create_bulk)):
+            best = float('inf')
+            for _ in range(REPEAT):
+                visit = make_visit(day, size)
+                day += 1
+                session = Session()
+                statements.clear()
+                start = time.perf_counter()
+                create(session, visit)
+                best = min(best, (time.perf_counter() - start) * 1000)
+                session.close()
+            print(f"{size:>8} {name:<6} {best:>10.2f} {len(statements):>11}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,17 @@
 """
 Configuración global de pytest para el proyecto de plan de ventas
 """
+import json
+import os
+import subprocess
+import textwrap
 import pytest
 from unittest.mock import MagicMock, Mock
 import sys
 from datetime import datetime
 
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 
 def pytest_configure(config):
     """Configuración que se ejecuta antes de que se importen los módulos de prueba"""
@@ -21,6 +27,7 @@ def pytest_configure(config):
     }
     mock_response.status_code = 200
     mock_requests.get.return_value = mock_response
+    mock_requests.Session.return_value.get.return_value = mock_response
     mock_requests.exceptions.RequestException = Exception
 
     mock_session = MagicMock()
@@ -74,12 +81,63 @@ def pytest_configure(config):
     mock_sqlalchemy.cascade = MagicMock()
     mock_sqlalchemy.or_ = MagicMock()
     
+    class FakeQueuePool:
+        """Sustituto mínimo de sqlalchemy.pool.QueuePool que permite heredar de él"""
+        def connect(self):
+            return MagicMock()
+    
+    mock_sqlalchemy.pool = MagicMock()
+    mock_sqlalchemy.pool.QueuePool = FakeQueuePool
+    
     sys.modules['sqlalchemy'] = mock_sqlalchemy
     sys.modules['sqlalchemy.ext'] = mock_sqlalchemy.ext
     sys.modules['sqlalchemy.ext.declarative'] = mock_sqlalchemy.ext.declarative
     sys.modules['sqlalchemy.orm'] = mock_sqlalchemy.orm
     sys.modules['sqlalchemy.exc'] = mock_sqlalchemy.exc
     sys.modules['sqlalchemy.engine'] = mock_sqlalchemy.engine
+    sys.modules['sqlalchemy.pool'] = mock_sqlalchemy.pool
+
+
+@pytest.fixture(autouse=True)
+def reset_user_directory():
+    """Limpia la caché compartida de usuarios entre tests"""
+    from app.services.user_directory_service import reset_user_directory as reset
+    reset()
+    yield
+    reset()
+
+
+@pytest.fixture(autouse=True)
+def reset_response_cache():
+    """Limpia la caché de respuestas de los listados entre tests"""
+    from app.utils.response_cache import get_sales_plan_response_cache
+    get_sales_plan_response_cache().invalidate()
+    yield
+    get_sales_plan_response_cache().invalidate()
+
+
+@pytest.fixture
+def run_isolated():
+    """
+    Ejecuta código en un intérprete aparte, con SQLAlchemy real. Este archivo reemplaza sqlalchemy
+    por mocks en todo el proceso de pytest, así que el orden real de las sentencias o el SQL
+    compilado por dialecto solo se pueden probar fuera de él. El código debe imprimir un JSON en
+    su última línea, que es lo que retorna el fixture.
+    """
+    def run(code: str):
+        env = dict(os.environ, PYTHONPATH=PROJECT_ROOT, DATABASE_URL='sqlite://')
+        result = subprocess.run(
+            [sys.executable, '-c', textwrap.dedent(code)],
+            cwd=PROJECT_ROOT,
+            env=env,
+            capture_output=True,
+            text=True,
+            timeout=60
+        )
+        assert result.returncode == 0, result.stderr
+        return json.loads(result.stdout.strip().splitlines()[-1])
+
+    return run
 
 
 @pytest.fixture
@@ -0,0 +1,78 @@
+"""
+Tests para la caché TTL + LRU
+"""
+import pytest
+from unittest.mock import patch
+from app.utils.cache import TTLCache, MISSING
+
+
+class TestTTLCache:
+    """Tests para TTLCache"""
+
+    def test_get_missing_key(self):
+        """Test clave inexistente retorna el valor por defecto y cuenta un fallo"""
+        cache = TTLCache(max_size=2, ttl=10)
+
+        assert cache.get('x') is MISSING
+        assert cache.get('x', 'default') == 'default'
+        assert cache.stats()['misses'] == 2
+
+    def test_set_and_get(self):
+        """Test guardar y obtener un valor cuenta un acierto"""
+        cache = TTLCache(max_size=2, ttl=10)
+        cache.set('x', 1)
+
+        assert cache.get('x') == 1
+        assert cache.stats()['hits'] == 1
+
+    def test_none_is_a_valid_value(self):
+        """Test None se guarda como valor (caché negativa)"""
+        cache = TTLCache(max_size=2, ttl=10)
+        cache.set('x', None)
+
+        assert cache.get('x') is None
+
+    def test_entry_expires(self):
+        """Test una entrada expira al superar su TTL"""
+        cache = TTLCache(max_size=2, ttl=10)
+        with patch('app.utils.cache.time.monotonic', return_value=100.0):
+            cache.set('x', 1, ttl=5)
+        with patch('app.utils.cache.time.monotonic', return_value=106.0):
+            assert cache.get('x') is MISSING
+
+        stats = cache.stats()
+        assert stats['expirations'] == 1
+        assert stats['size'] == 0
+
+    def test_lru_eviction(self):
+        """Test se desaloja la entrada menos usada recientemente"""
+        cache = TTLCache(max_size=2, ttl=10)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        assert cache.get('b') is MISSING
+        assert cache.get('a') == 1
+        assert cache.get('c') == 3
+        assert cache.stats()['evictions'] == 1
+        assert len(cache) == 2
+
+    def test_delete_and_clear(self):
+        """Test eliminar entradas y reiniciar contadores"""
+        cache = TTLCache(max_size=2, ttl=10)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.delete('a')
+        assert cache.get('a') is MISSING
+
+        cache.clear()
+        stats = cache.stats()
+        assert stats['size'] == 0
+        assert stats['misses'] == 0
+        assert stats['hit_ratio'] == 0.0
+
+    def test_invalid_max_size(self):
+        """Test tamaño máximo inválido"""
+        with pytest.raises(ValueError):
+            TTLCache(max_size=0)
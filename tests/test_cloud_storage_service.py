@@ -32,7 +32,12 @@ mock_pil.Image = mock_image
 sys.modules['PIL'] = mock_pil
 sys.modules['PIL.Image'] = mock_image
 
-from app.services.cloud_storage_service import CloudStorageService
+from app.services.cloud_storage_service import (
+    CloudStorageService,
+    SizeLimitedReader,
+    UploadSizeExceededError
+)
+from app.exceptions.custom_exceptions import FileTooLargeError
 
 
 @pytest.fixture
@@ -45,6 +50,9 @@ def mock_config():
     config.GOOGLE_APPLICATION_CREDENTIALS = '/path/to/credentials.json'
     config.MAX_CONTENT_LENGTH = 10 * 1024 * 1024  # 10 MB
     config.SIGNING_SERVICE_ACCOUNT_EMAIL = 'test@test.com'
+    config.UPLOAD_STREAMING_ENABLED = False
+    config.UPLOAD_CHUNK_SIZE = 256 * 1024
+    config.STORAGE_EMULATOR_HOST = ''
     return config
 
 
@@ -201,11 +209,8 @@ class TestCloudStorageService:
         mock_file.seek = Mock()
         mock_file.tell = Mock(return_value=11 * 1024 * 1024)
         
-        success, message, url = service.upload_file(mock_file, 'large.pdf')
-        
-        assert success is False
-        assert "excede el tamaño máximo" in message
-        assert url is None
+        with pytest.raises(FileTooLargeError, match="excede el tamaño máximo"):
+            service.upload_file(mock_file, 'large.pdf')
     
     def test_upload_file_no_filename(self, service):
         """Prueba subir archivo sin nombre"""
@@ -389,3 +394,161 @@ class TestCloudStorageService:
                 # Verificar que se llamó con el content_type correcto
                 call_kwargs = mock_blob.upload_from_file.call_args[1]
                 assert call_kwargs['content_type'] == expected_content_type
+
+
+def fake_resumable_upload(chunk_size):
+    """Simula la subida reanudable: lee el stream en partes de `chunk_size` hasta agotarlo"""
+    def upload_from_file(stream, content_type=None):
+        assert stream.tell() == 0
+        while True:
+            payload = stream.read(chunk_size)
+            assert len(payload) <= chunk_size
+            if len(payload) < chunk_size:
+                return
+    return upload_from_file
+
+
+class TestSizeLimitedReader:
+    """Pruebas para SizeLimitedReader"""
+    
+    def test_counts_bytes_read(self):
+        """Prueba que cuenta los bytes leídos"""
+        reader = SizeLimitedReader(BytesIO(b'x' * 100), max_bytes=1000)
+        
+        assert reader.read(60) == b'x' * 60
+        assert reader.read(60) == b'x' * 40
+        assert reader.tell() == 100
+    
+    def test_aborts_when_limit_exceeded(self):
+        """Prueba que aborta en cuanto se supera el límite"""
+        reader = SizeLimitedReader(BytesIO(b'x' * 100), max_bytes=50)
+        
+        assert reader.read(50) == b'x' * 50
+        with pytest.raises(UploadSizeExceededError):
+            reader.read(10)
+    
+    def test_unbounded_read_is_capped(self):
+        """Prueba que una lectura sin tamaño no lee más allá del límite"""
+        stream = BytesIO(b'x' * 10000)
+        reader = SizeLimitedReader(stream, max_bytes=100)
+        
+        with pytest.raises(UploadSizeExceededError):
+            reader.read()
+        assert stream.tell() == 101
+    
+    def test_seek_absolute(self):
+        """Prueba que seek reposiciona el stream y el conteo"""
+        reader = SizeLimitedReader(BytesIO(b'abcdef'), max_bytes=100)
+        reader.read(4)
+        
+        reader.seek(2)
+        
+        assert reader.tell() == 2
+        assert reader.read(2) == b'cd'
+    
+    def test_seek_relative_not_supported(self):
+        """Prueba que seek relativo no está soportado"""
+        reader = SizeLimitedReader(BytesIO(b'abc'), max_bytes=100)
+        
+        with pytest.raises(Exception):
+            reader.seek(0, 2)
+
+
+class TestCloudStorageServiceStreaming:
+    """Pruebas para la subida por partes"""
+    
+    @pytest.fixture
+    def streaming_service(self, mock_config):
+        """Servicio con la subida por partes habilitada"""
+        mock_config.UPLOAD_STREAMING_ENABLED = True
+        mock_config.MAX_CONTENT_LENGTH = 1024 * 1024
+        service = CloudStorageService(config=mock_config)
+        service._bucket = Mock()
+        return service
+    
+    def _file(self, size, filename='evidencia.pdf'):
+        file = Mock()
+        file.filename = filename
+        file.stream = BytesIO(b'x' * size)
+        return file
+    
+    def test_upload_file_uses_streaming_mode(self, streaming_service):
+        """Prueba que upload_file delega en la subida por partes si está habilitada"""
+        with patch.object(streaming_service, 'upload_file_stream', return_value=(True, 'ok', 'url')) as mock_stream:
+            result = streaming_service.upload_file(self._file(10), 'evidencia.pdf')
+        
+        assert result == (True, 'ok', 'url')
+        mock_stream.assert_called_once()
+    
+    def test_upload_file_stream_success(self, streaming_service):
+        """Prueba subir por partes sin medir el archivo antes"""
+        mock_blob = streaming_service.bucket.blob.return_value
+        mock_blob.upload_from_file.side_effect = fake_resumable_upload(256 * 1024)
+        file = self._file(600 * 1024)
+        
+        with patch.object(streaming_service, 'get_file_url', return_value='https://storage/evidencia.pdf'):
+            success, message, url = streaming_service.upload_file_stream(file, 'evidencia.pdf')
+        
+        assert success is True
+        assert url == 'https://storage/evidencia.pdf'
+        streaming_service.bucket.blob.assert_called_once_with('test-folder/evidencia.pdf', chunk_size=256 * 1024)
+        stream, = mock_blob.upload_from_file.call_args[0]
+        assert isinstance(stream, SizeLimitedReader)
+        assert stream.tell() == 600 * 1024
+        assert mock_blob.upload_from_file.call_args[1]['content_type'] == 'application/pdf'
+        assert 'size' not in mock_blob.upload_from_file.call_args[1]
+    
+    def test_upload_file_stream_aborts_when_too_large(self, streaming_service):
+        """Prueba que la subida se aborta al superar MAX_CONTENT_LENGTH"""
+        mock_blob = streaming_service.bucket.blob.return_value
+        mock_blob.upload_from_file.side_effect = fake_resumable_upload(256 * 1024)
+        file = self._file(3 * 1024 * 1024)
+        
+        with pytest.raises(FileTooLargeError, match="excede el tamaño máximo permitido de 1 MB"):
+            streaming_service.upload_file_stream(file, 'evidencia.pdf')
+        
+        # Se dejó de leer poco después del límite, no el archivo completo
+        assert file.stream.tell() <= 1024 * 1024 + 256 * 1024
+    
+    def test_upload_file_stream_no_file(self, streaming_service):
+        """Prueba subir por partes sin archivo"""
+        success, message, url = streaming_service.upload_file_stream(None, 'evidencia.pdf')
+        
+        assert success is False
+        assert "No se proporcionó archivo" in message
+    
+    def test_upload_file_stream_gcs_error(self, streaming_service):
+        """Prueba error de GCS en la subida por partes"""
+        streaming_service.bucket.blob.return_value.upload_from_file.side_effect = GoogleCloudError("Upload failed")
+        
+        success, message, url = streaming_service.upload_file_stream(self._file(10), 'evidencia.pdf')
+        
+        assert success is False
+        assert "Error de Google Cloud Storage" in message
+    
+    @pytest.mark.parametrize('configured, expected', [
+        (1024 * 1024, 1024 * 1024),
+        (1024 * 1024 + 1000, 1024 * 1024),
+        (1000, 256 * 1024),
+    ])
+    def test_upload_chunk_size_aligned(self, streaming_service, configured, expected):
+        """Prueba que el tamaño de parte se alinea a 256 KB"""
+        streaming_service.config.UPLOAD_CHUNK_SIZE = configured
+        
+        assert streaming_service._upload_chunk_size() == expected
+    
+    def test_client_uses_emulator(self, mock_config):
+        """Prueba que con STORAGE_EMULATOR_HOST el cliente apunta al emulador sin credenciales"""
+        mock_config.STORAGE_EMULATOR_HOST = 'http://localhost:4443'
+        mock_credentials = Mock()
+        storage_module = Mock()
+        # Globales reales del módulo del servicio (otras pruebas reemplazan su entrada en sys.modules)
+        service_globals = CloudStorageService.client.fget.__globals__
+        
+        with patch.dict(sys.modules, {'google.auth.credentials': mock_credentials}), \
+                patch.dict(service_globals, {'storage': storage_module}):
+            CloudStorageService(config=mock_config).client
+        
+        kwargs = storage_module.Client.call_args[1]
+        assert kwargs['credentials'] is mock_credentials.AnonymousCredentials.return_value
+        assert kwargs['client_options'] == {'api_endpoint': 'http://localhost:4443'}
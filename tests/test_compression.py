@@ -0,0 +1,109 @@
+"""
+Tests para la compresión negociada de respuestas
+"""
+import gzip
+import json
+import pytest
+from flask import Flask, Response
+from app.config.settings import Config
+from app.utils.compression import ResponseCompressor, init_compression
+
+
+@pytest.fixture
+def client():
+    """Cliente de una aplicación con compresión y rutas de prueba"""
+    app = Flask(__name__)
+    app.after_request(ResponseCompressor(min_size=100))
+
+    @app.route('/grande')
+    def grande():
+        return {'items': [{'id': i, 'name': 'Plan de ventas'} for i in range(50)]}
+
+    @app.route('/pequena')
+    def pequena():
+        return {'ok': True}
+
+    @app.route('/error')
+    def error():
+        return {'items': ['x' * 500]}, 500
+
+    @app.route('/stream')
+    def stream():
+        return Response((f'linea {i}\n' for i in range(1000)), mimetype='text/plain')
+
+    @app.route('/imagen')
+    def imagen():
+        return Response(b'\x89PNG' * 100, mimetype='image/png')
+
+    return app.test_client()
+
+
+class TestResponseCompressor:
+    """Tests para ResponseCompressor"""
+
+    def test_compresses_large_json(self, client):
+        """Test un JSON sobre el umbral se comprime con gzip"""
+        response = client.get('/grande', headers={'Accept-Encoding': 'gzip, deflate'})
+
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response.headers['Vary']
+        assert int(response.headers['Content-Length']) == len(response.data)
+        assert len(json.loads(gzip.decompress(response.data))['items']) == 50
+
+    def test_without_accept_encoding(self, client):
+        """Test sin Accept-Encoding se responde sin comprimir"""
+        response = client.get('/grande', headers={'Accept-Encoding': 'identity'})
+
+        assert 'Content-Encoding' not in response.headers
+        assert 'Accept-Encoding' in response.headers['Vary']
+        assert len(response.get_json()['items']) == 50
+
+    def test_gzip_rejected_with_q0(self, client):
+        """Test gzip;q=0 desactiva la compresión"""
+        response = client.get('/grande', headers={'Accept-Encoding': 'gzip;q=0'})
+
+        assert 'Content-Encoding' not in response.headers
+
+    def test_small_body_not_compressed(self, client):
+        """Test un cuerpo bajo el umbral no se comprime"""
+        response = client.get('/pequena', headers={'Accept-Encoding': 'gzip'})
+
+        assert 'Content-Encoding' not in response.headers
+
+    def test_errors_and_binary_not_compressed(self, client):
+        """Test errores y tipos no comprimibles se dejan intactos"""
+        assert 'Content-Encoding' not in client.get('/error', headers={'Accept-Encoding': 'gzip'}).headers
+        assert 'Content-Encoding' not in client.get('/imagen', headers={'Accept-Encoding': 'gzip'}).headers
+
+    def test_streamed_response(self, client):
+        """Test las respuestas por partes se comprimen sin Content-Length"""
+        response = client.get('/stream', headers={'Accept-Encoding': 'gzip'})
+
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Content-Length' not in response.headers
+        assert gzip.decompress(response.data).decode().count('\n') == 1000
+
+
+class TestInitCompression:
+    """Tests para init_compression"""
+
+    def test_disabled_by_config(self):
+        """Test con la compresión deshabilitada no se registra el hook"""
+        app = Flask(__name__)
+        config = Config()
+        config.COMPRESSION_ENABLED = False
+
+        init_compression(app, config)
+
+        assert app.after_request_funcs.get(None) is None
+
+    def test_enabled(self):
+        """Test registra el hook con la configuración"""
+        app = Flask(__name__)
+        config = Config()
+        config.COMPRESSION_MIN_SIZE = 10
+
+        init_compression(app, config)
+
+        compressor = app.after_request_funcs[None][0]
+        assert compressor.min_size == 10
@@ -0,0 +1,94 @@
+"""
+Tests para las utilidades de concurrencia
+"""
+import threading
+import time
+from app.utils.concurrency import first_failed_check, map_with_deadline
+
+
+class TestFirstFailedCheck:
+    """Tests para first_failed_check"""
+
+    def test_empty_checks(self):
+        """Test sin verificaciones no hay fallas"""
+        assert first_failed_check([], max_workers=4) is None
+
+    def test_single_check(self):
+        """Test una sola verificación se ejecuta en el hilo actual"""
+        assert first_failed_check([lambda: True], max_workers=4) is None
+        assert first_failed_check([lambda: False], max_workers=4) == 0
+
+    def test_all_pass(self):
+        """Test todas las verificaciones pasan"""
+        assert first_failed_check([lambda: True] * 5, max_workers=2) is None
+
+    def test_reports_first_failure_in_order(self):
+        """Test se reporta la primera falla según el orden aunque otra termine antes"""
+        def slow_failure():
+            time.sleep(0.05)
+            return False
+
+        checks = [lambda: True, slow_failure, lambda: False]
+
+        assert first_failed_check(checks, max_workers=3) == 1
+
+    def test_runs_concurrently(self):
+        """Test las verificaciones se ejecutan en paralelo"""
+        barrier = threading.Barrier(3, timeout=2)
+
+        def check():
+            barrier.wait()
+            return True
+
+        assert first_failed_check([check, check, check], max_workers=3) is None
+
+    def test_stops_early_on_failure(self):
+        """Test no espera verificaciones posteriores a una falla conocida"""
+        release = threading.Event()
+
+        def blocked():
+            release.wait(2)
+            return True
+
+        start = time.monotonic()
+        result = first_failed_check([lambda: False, blocked], max_workers=2)
+        elapsed = time.monotonic() - start
+        release.set()
+
+        assert result == 0
+        assert elapsed < 1
+
+
+class TestMapWithDeadline:
+    """Tests para map_with_deadline"""
+
+    def test_empty_items(self):
+        """Test sin elementos retorna lista vacía"""
+        assert map_with_deadline(str, [], max_workers=2, timeout=1) == []
+
+    def test_preserves_order(self):
+        """Test los resultados respetan el orden de entrada aunque terminen en otro orden"""
+        def work(value):
+            time.sleep(0.01 * (3 - value))
+            return value * 10
+
+        results = map_with_deadline(work, [1, 2, 3], max_workers=3, timeout=2)
+
+        assert results == [(True, 10), (True, 20), (True, 30)]
+
+    def test_deadline_marks_slow_items(self):
+        """Test los elementos que no terminan antes del plazo se marcan como incompletos"""
+        release = threading.Event()
+
+        def work(value):
+            if value == 'slow':
+                release.wait(2)
+            return value
+
+        start = time.monotonic()
+        results = map_with_deadline(work, ['fast', 'slow'], max_workers=2, timeout=0.1)
+        elapsed = time.monotonic() - start
+        release.set()
+
+        assert results == [(True, 'fast'), (False, None)]
+        assert elapsed < 1
@@ -3,7 +3,23 @@ Tests para database.py
 """
 import pytest
 from unittest.mock import MagicMock, patch
-from app.config.database import SessionLocal, auto_close_session
+from flask import Flask
+from app.config.database import (
+    SessionLocal,
+    auto_close_session,
+    get_request_session,
+    peek_request_session,
+    close_request_session,
+    init_db_session
+)
+
+
+@pytest.fixture
+def app():
+    """Aplicación Flask para testing"""
+    app = Flask(__name__)
+    app.config['TESTING'] = True
+    return app
 
 
 class TestDatabase:
@@ -70,107 +86,208 @@ class TestDatabase:
         
         assert result == "success"
     
-    def test_auto_close_session_commits_transaction(self):
+    def test_auto_close_session_commits_transaction(self, app):
         """Test: Decorador hace commit de transacción"""
         mock_session = MagicMock()
         mock_session.in_transaction.return_value = True
         
         class TestController:
-            def __init__(self):
-                self.order_repository = MagicMock()
-            
             @auto_close_session
             def test_method(self):
+                get_request_session()
                 return "success"
         
         controller = TestController()
         
-        with patch('app.config.database.SessionLocal', return_value=mock_session):
+        with app.app_context(), patch('app.config.database.SessionLocal', return_value=mock_session):
             controller.test_method()
         
         mock_session.commit.assert_called()
     
-    def test_auto_close_session_rollback_on_error(self):
+    def test_auto_close_session_rollback_on_error(self, app):
         """Test: Decorador hace rollback en error"""
         mock_session = MagicMock()
         mock_session.in_transaction.return_value = True
         
         class TestController:
-            def __init__(self):
-                self.order_repository = MagicMock()
-            
             @auto_close_session
             def test_method(self):
+                get_request_session()
                 raise ValueError("Test error")
         
         controller = TestController()
         
-        with patch('app.config.database.SessionLocal', return_value=mock_session):
+        with app.app_context(), patch('app.config.database.SessionLocal', return_value=mock_session):
             with pytest.raises(ValueError):
                 controller.test_method()
         
         mock_session.rollback.assert_called()
     
-    def test_auto_close_session_refresh_on_commit(self):
-        """Test: Decorador hace refresh después de commit"""
+    def test_auto_close_session_refresh_on_commit(self, app):
+        """Test: Decorador hace commit de lo agregado por el repositorio"""
+        from app.repositories.sales_plan_repository import SalesPlanRepository
         mock_session = MagicMock()
         mock_session.in_transaction.return_value = True
         mock_added_entity = MagicMock()
         
         class TestController:
             def __init__(self):
-                self.order_repository = MagicMock()
-                self.order_repository.session = mock_session
+                self.sales_plan_repository = SalesPlanRepository()
             
             @auto_close_session
             def test_method(self):
-                mock_session.add(mock_added_entity)
+                self.sales_plan_repository.session.add(mock_added_entity)
                 return mock_added_entity
         
-        controller = TestController()
-        
-        with patch('app.config.database.SessionLocal', return_value=mock_session):
+        with app.app_context(), patch('app.config.database.SessionLocal', return_value=mock_session):
+            controller = TestController()
             controller.test_method()
         
+        mock_session.add.assert_called_once_with(mock_added_entity)
         mock_session.commit.assert_called()
     
-    def test_auto_close_session_rollback_exception(self):
-        """Test: Decorador con excepción en rollback (línea 103-104)"""
+    def test_auto_close_session_does_not_open_unused_session(self, app):
+        """Test: Decorador no abre sesión si el endpoint no la usa"""
+        class TestController:
+            @auto_close_session
+            def test_method(self):
+                return "success"
+        
+        with app.app_context(), patch('app.config.database.SessionLocal') as mock_session_local:
+            assert TestController().test_method() == "success"
+            assert peek_request_session() is None
+        
+        mock_session_local.assert_not_called()
+    
+    def test_auto_close_session_rollback_exception(self, app):
+        """Test: Decorador con excepción en rollback"""
         mock_session = MagicMock()
         mock_session.in_transaction.return_value = True
         mock_session.rollback.side_effect = Exception("Rollback error")
         
         class TestController:
-            def __init__(self):
-                self.order_repository = MagicMock()
-            
             @auto_close_session
             def test_method(self):
+                get_request_session()
                 raise ValueError("Test error")
         
         controller = TestController()
         
-        with patch('app.config.database.SessionLocal', return_value=mock_session):
+        with app.app_context(), patch('app.config.database.SessionLocal', return_value=mock_session):
             with pytest.raises(ValueError):
                 controller.test_method()
     
-    def test_auto_close_session_close_exception(self):
-        """Test: Decorador con excepción en close (línea 120-121)"""
+    def test_request_session_is_reused_within_request(self, app):
+        """Test: Una sola sesión por petición, compartida por controladores y repositorios"""
+        from app.repositories.sales_plan_repository import SalesPlanRepository
+        from app.repositories.scheduled_visit_repository import ScheduledVisitRepository
+        
+        with app.app_context(), patch('app.config.database.SessionLocal',
+                                      side_effect=lambda: MagicMock()) as mock_session_local:
+            session = get_request_session()
+            
+            assert get_request_session() is session
+            assert SalesPlanRepository().session is session
+            assert ScheduledVisitRepository().session is session
+        
+        mock_session_local.assert_called_once()
+    
+    def test_request_session_closed_in_teardown(self, app):
+        """Test: La sesión de la petición se cierra en el teardown de la aplicación"""
         mock_session = MagicMock()
         mock_session.in_transaction.return_value = False
-        mock_session.close.side_effect = Exception("Close error")
+        init_db_session(app)
         
-        class TestController:
-            def __init__(self):
-                self.order_repository = MagicMock()
+        with patch('app.config.database.SessionLocal', return_value=mock_session):
+            with app.app_context():
+                get_request_session()
+        
+        mock_session.close.assert_called_once()
+    
+    def test_close_request_session_rolls_back_on_error(self, app):
+        """Test: El teardown revierte la transacción pendiente si la petición falló"""
+        mock_session = MagicMock()
+        mock_session.in_transaction.return_value = True
+        
+        with app.app_context(), patch('app.config.database.SessionLocal', return_value=mock_session):
+            get_request_session()
+            close_request_session(ValueError("Test error"))
             
-            @auto_close_session
-            def test_method(self):
-                return "success"
+            assert peek_request_session() is None
         
-        controller = TestController()
+        mock_session.rollback.assert_called_once()
+        mock_session.close.assert_called_once()
+    
+    def test_close_request_session_close_exception(self, app):
+        """Test: Error al cerrar la sesión no se propaga"""
+        mock_session = MagicMock()
+        mock_session.in_transaction.return_value = False
+        mock_session.close.side_effect = Exception("Close error")
         
-        with patch('app.config.database.SessionLocal', return_value=mock_session):
-            result = controller.test_method()
-            assert result == "success"
+        with app.app_context(), patch('app.config.database.SessionLocal', return_value=mock_session):
+            get_request_session()
+            close_request_session()
+    
+    def test_request_session_outside_app_context(self):
+        """Test: Fuera de una petición se obtiene una sesión nueva"""
+        with patch('app.config.database.SessionLocal', side_effect=lambda: MagicMock()):
+            assert get_request_session() is not get_request_session()
+            assert peek_request_session() is None
+            close_request_session()
 
+
+class TestConnectionPool:
+    """Tests para la configuración y métricas del pool de conexiones"""
+    
+    def test_engine_options_from_config(self):
+        """Test: Las opciones del pool vienen de la configuración y echo está apagado por defecto"""
+        from app.config import database
+        
+        options = database._engine_options()
+        
+        assert options['echo'] is False
+        assert options['poolclass'] is database.InstrumentedQueuePool
+        assert options['pool_size'] == database.config.DB_POOL_SIZE
+        assert options['max_overflow'] == database.config.DB_MAX_OVERFLOW
+        assert options['pool_timeout'] == database.config.DB_POOL_TIMEOUT
+        assert options['pool_recycle'] == database.config.DB_POOL_RECYCLE
+        assert options['pool_pre_ping'] == database.config.DB_POOL_PRE_PING
+    
+    def test_engine_options_sqlite_keeps_default_pool(self):
+        """Test: Con SQLite no se fuerza QueuePool"""
+        from app.config import database
+        
+        with patch.object(database, 'DATABASE_URL', 'sqlite:///:memory:'):
+            options = database._engine_options()
+        
+        assert 'poolclass' not in options
+    
+    def test_instrumented_pool_records_wait_time(self):
+        """Test: Cada checkout del pool se registra en el histograma"""
+        from app.config import database
+        database.pool_wait_histogram.reset()
+        
+        database.InstrumentedQueuePool().connect()
+        
+        snapshot = database.pool_wait_histogram.snapshot()
+        assert snapshot['count'] == 1
+        assert snapshot['buckets']['le_inf'] == 1
+    
+    def test_get_pool_status(self):
+        """Test: El estado del pool expone conexiones en uso, overflow y tiempos de espera"""
+        from app.config import database
+        
+        pool = database.InstrumentedQueuePool()
+        pool.size = MagicMock(return_value=5)
+        pool.checkedout = MagicMock(return_value=2)
+        pool.checkedin = MagicMock(return_value=3)
+        pool.overflow = MagicMock(return_value=-3)
+        pool.timeout = MagicMock(return_value=30)
+        
+        with patch.object(database.engine, 'pool', pool):
+            status = database.get_pool_status()
+        
+        assert status['pool_class'] == 'InstrumentedQueuePool'
+        assert status['checked_out'] == 2
+        assert status['overflow'] == -3
+        assert 'buckets' in status['wait_time_ms']
@@ -0,0 +1,102 @@
+"""
+Tests para los validadores ETag y el GET condicional de BaseController
+"""
+import pytest
+from unittest.mock import Mock
+from flask import Flask
+from app.controllers.base_controller import BaseController
+from app.utils.etag import make_etag, etag_matches, not_modified_response
+
+
+@pytest.fixture
+def app():
+    """Aplicación Flask para testing"""
+    app = Flask(__name__)
+    app.config['TESTING'] = True
+    return app
+
+
+class TestEtag:
+    """Tests para las utilidades de ETag"""
+
+    def test_make_etag_is_stable(self):
+        """Test el ETag depende solo de las partes"""
+        assert make_etag('a', (1, 2)) == make_etag('a', (1, 2))
+        assert make_etag('a', (1, 2)) != make_etag('a', (1, 3))
+
+    def test_etag_matches_weak(self, app):
+        """Test la comparación acepta ETags débiles y listas"""
+        etag = make_etag('a')
+        with app.test_request_context(headers={'If-None-Match': f'"otro", W/"{etag}"'}):
+            assert etag_matches(etag) is True
+        with app.test_request_context():
+            assert etag_matches(etag) is False
+
+    def test_not_modified_response(self):
+        """Test la respuesta 304 no tiene cuerpo e incluye el ETag"""
+        response = not_modified_response('abc')
+
+        assert response.status_code == 304
+        assert response.get_data() == b''
+        assert response.headers['ETag'] == 'W/"abc"'
+
+
+class TestBaseControllerNotModified:
+    """Tests para BaseController.not_modified"""
+
+    def test_returns_304_when_client_has_version(self, app):
+        """Test retorna 304 si el If-None-Match coincide"""
+        etag = make_etag('recurso', (3, 'v'), 'p')
+        with app.test_request_context(headers={'If-None-Match': f'W/"{etag}"'}):
+            response = BaseController().not_modified('recurso', lambda: (3, 'v'), 'p')
+
+        assert response.status_code == 304
+
+    def test_attaches_etag_to_200(self, app):
+        """Test sin coincidencia agrega el ETag a la respuesta exitosa"""
+        with app.test_request_context():
+            assert BaseController().not_modified('recurso', lambda: (3, 'v')) is None
+            response = app.process_response(app.make_response(({'ok': True}, 200)))
+
+        assert response.headers['ETag'] == f'W/"{make_etag("recurso", (3, "v"))}"'
+
+    def test_etag_not_attached_to_errors(self, app):
+        """Test las respuestas de error no llevan ETag"""
+        with app.test_request_context():
+            BaseController().not_modified('recurso', lambda: (3, 'v'))
+            response = app.process_response(app.make_response(({'error': 'x'}, 500)))
+
+        assert 'ETag' not in response.headers
+
+    def test_version_errors_skip_etag(self, app):
+        """Test si la versión falla o es None se sigue sin ETag"""
+        loader = Mock(side_effect=Exception("BD caída"))
+        with app.test_request_context(headers={'If-None-Match': '*'}):
+            assert BaseController().not_modified('recurso', loader) is None
+            assert BaseController().not_modified('recurso', lambda: None) is None
+            response = app.process_response(app.make_response(({'ok': True}, 200)))
+
+        assert 'ETag' not in response.headers
+
+    def test_attach_false_returns_etag_without_attaching(self, app):
+        """Test con attach=False retorna el ETag para agregarlo después, sin agregarlo a la respuesta"""
+        etag = make_etag('recurso', (3, 'v'), 'p')
+        with app.test_request_context():
+            assert BaseController().not_modified('recurso', lambda: (3, 'v'), 'p', attach=False) == (None, etag)
+            response = app.process_response(app.make_response(({'ok': True}, 200)))
+
+        assert 'ETag' not in response.headers
+
+    def test_attach_false_returns_304_and_etag(self, app):
+        """Test con attach=False y versión vigente retorna el 304 junto con el ETag"""
+        etag = make_etag('recurso', (3, 'v'))
+        with app.test_request_context(headers={'If-None-Match': f'W/"{etag}"'}):
+            response, returned_etag = BaseController().not_modified('recurso', lambda: (3, 'v'), attach=False)
+
+        assert response.status_code == 304
+        assert returned_etag == etag
+
+    def test_attach_false_without_version(self, app):
+        """Test con attach=False y versión no disponible retorna (None, None)"""
+        with app.test_request_context():
+            assert BaseController().not_modified('recurso', lambda: None, attach=False) == (None, None)
@@ -0,0 +1,62 @@
+"""
+Tests para el cliente HTTP compartido
+"""
+from unittest.mock import MagicMock, patch
+from app.config.settings import Config
+from app.utils.http_client import HttpClient, get_http_client, RETRY_METHODS
+
+
+class TestHttpClient:
+    """Tests para HttpClient"""
+
+    def test_session_mounts_pooled_adapter(self):
+        """Test la sesión monta el adaptador con pool y reintentos para http y https"""
+        import requests
+        config = Config()
+        config.HTTP_POOL_MAXSIZE = 7
+
+        with patch.object(requests.adapters, 'HTTPAdapter') as mock_adapter, \
+                patch.object(requests, 'Session') as mock_session_class:
+            client = HttpClient(config)
+
+        kwargs = mock_adapter.call_args.kwargs
+        assert kwargs['pool_maxsize'] == 7
+        assert kwargs['max_retries'].allowed_methods == RETRY_METHODS
+        assert 'POST' not in kwargs['max_retries'].allowed_methods
+        mounted = [c.args[0] for c in mock_session_class.return_value.mount.call_args_list]
+        assert mounted == ['http://', 'https://']
+        assert client.session is mock_session_class.return_value
+
+    def test_get_uses_connect_and_read_timeouts(self):
+        """Test GET usa timeouts separados de conexión y lectura por defecto"""
+        config = Config()
+        config.HTTP_CONNECT_TIMEOUT = 1.5
+        config.HTTP_READ_TIMEOUT = 4.0
+        client = HttpClient(config)
+        client.session = MagicMock()
+
+        client.get('http://auth/user/1')
+
+        client.session.get.assert_called_once_with('http://auth/user/1', timeout=(1.5, 4.0))
+
+    def test_post_allows_timeout_override(self):
+        """Test POST permite sobrescribir el timeout"""
+        client = HttpClient(Config())
+        client.session = MagicMock()
+
+        client.post('http://auth/users', json={}, timeout=1)
+
+        client.session.post.assert_called_once_with('http://auth/users', json={}, timeout=1)
+
+    def test_close(self):
+        """Test cerrar el cliente cierra la sesión"""
+        client = HttpClient(Config())
+        client.session = MagicMock()
+
+        client.close()
+
+        client.session.close.assert_called_once()
+
+    def test_get_http_client_is_shared(self):
+        """Test el cliente HTTP es único por proceso"""
+        assert get_http_client() is get_http_client()
@@ -0,0 +1,27 @@
+"""
+Tests para el controlador de métricas
+"""
+from unittest.mock import patch
+from app.controllers.metrics_controller import MetricsView
+from app.services.user_directory_service import get_user_cache
+
+
+class TestMetricsView:
+    """Pruebas para MetricsView"""
+
+    def test_get_user_directory_cache_stats(self):
+        """Prueba que expone los contadores de la caché de usuarios"""
+        get_user_cache().set('u1', {'name': 'Usuario'})
+        get_user_cache().get('u1')
+
+        with patch('app.controllers.metrics_controller.get_pool_status', return_value={'checked_out': 1}):
+            response, status_code = MetricsView().get()
+
+        assert status_code == 200
+        stats = response['user_directory_cache']
+        assert stats['size'] == 1
+        assert stats['hits'] == 1
+        assert {'misses', 'evictions', 'max_size'} <= set(stats)
+        assert response['db_pool'] == {'checked_out': 1}
+        assert response['client_name_cache']['size'] == 0
+        assert 'generation' in response['sales_plan_response_cache']
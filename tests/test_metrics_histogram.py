@@ -0,0 +1,34 @@
+"""
+Tests para el histograma de métricas
+"""
+from app.utils.metrics import Histogram
+
+
+class TestHistogram:
+    """Tests para Histogram"""
+
+    def test_observe_places_values_in_buckets(self):
+        """Test cada bucket cuenta las observaciones menores o iguales a su límite (acumulado)"""
+        histogram = Histogram(buckets_ms=(1, 10))
+        histogram.observe(0.5)
+        histogram.observe(1)
+        histogram.observe(7)
+        histogram.observe(50)
+
+        snapshot = histogram.snapshot()
+
+        assert snapshot['buckets'] == {'le_1': 2, 'le_10': 3, 'le_inf': 4}
+        assert snapshot['count'] == 4
+        assert snapshot['max_ms'] == 50
+        assert snapshot['avg_ms'] == 14.625
+
+    def test_reset(self):
+        """Test reiniciar el histograma"""
+        histogram = Histogram()
+        histogram.observe(3)
+        histogram.reset()
+
+        snapshot = histogram.snapshot()
+        assert snapshot['count'] == 0
+        assert set(snapshot['buckets'].values()) == {0}
+        assert snapshot['avg_ms'] == 0.0
@@ -0,0 +1,156 @@
+"""
+Tests para las migraciones ligeras del esquema
+"""
+from unittest.mock import MagicMock, patch
+import pytest
+from app.config.migrations import Migration, MigrationError, MIGRATIONS, run_migrations
+
+
+class TestRunMigrations:
+    """Tests para run_migrations"""
+
+    def _engine(self, dialect='postgresql', applied=()):
+        """Engine falso que registra las sentencias ejecutadas"""
+        engine = MagicMock()
+        engine.dialect.name = dialect
+        connection = MagicMock()
+        engine.begin.return_value.__enter__.return_value = connection
+        executed = []
+
+        def execute(statement, params=None):
+            executed.append((statement, params))
+            result = MagicMock()
+            result.first.return_value = (1,) if params and params.get('version') in applied and 'description' not in params else None
+            return result
+
+        connection.execute.side_effect = execute
+        return engine, executed
+
+    def test_applies_pending_migrations_in_order(self):
+        """Test aplica las migraciones pendientes y retorna sus versiones"""
+        engine, executed = self._engine()
+        migrations = [
+            Migration('0001', 'uno', ('CREATE INDEX uno',)),
+            Migration('0002', 'dos', ('CREATE INDEX dos',)),
+        ]
+
+        with patch('app.config.migrations.text', side_effect=lambda sql: sql):
+            applied = run_migrations(engine, migrations)
+
+        assert applied == ['0001', '0002']
+        statements = [statement for statement, _ in executed]
+        assert statements.index('CREATE INDEX uno') < statements.index('CREATE INDEX dos')
+
+    def test_skips_already_applied(self):
+        """Test no vuelve a ejecutar migraciones registradas"""
+        engine, executed = self._engine(applied=('0001',))
+        migrations = [Migration('0001', 'uno', ('CREATE INDEX uno',))]
+
+        with patch('app.config.migrations.text', side_effect=lambda sql: sql):
+            applied = run_migrations(engine, migrations)
+
+        assert applied == []
+        assert 'CREATE INDEX uno' not in [statement for statement, _ in executed]
+
+    def test_skips_other_dialects(self):
+        """Test las migraciones de otro motor no se ejecutan"""
+        engine, executed = self._engine(dialect='sqlite')
+        migrations = [Migration('0001', 'trgm', ('CREATE EXTENSION pg_trgm',), dialects=('postgresql',))]
+
+        with patch('app.config.migrations.text', side_effect=lambda sql: sql):
+            applied = run_migrations(engine, migrations)
+
+        assert applied == []
+        assert 'CREATE EXTENSION pg_trgm' not in [statement for statement, _ in executed]
+
+    def test_failed_migration_does_not_block_others(self):
+        """Test una migración fallida queda pendiente y las demás se aplican"""
+        engine, executed = self._engine()
+        connection = engine.begin.return_value.__enter__.return_value
+        original = connection.execute.side_effect
+
+        def execute(statement, params=None):
+            if statement == 'CREATE INDEX roto':
+                raise Exception('permiso denegado')
+            return original(statement, params)
+
+        connection.execute.side_effect = execute
+        migrations = [
+            Migration('0001', 'rota', ('CREATE INDEX roto',)),
+            Migration('0002', 'dos', ('CREATE INDEX dos',)),
+        ]
+
+        with patch('app.config.migrations.text', side_effect=lambda sql: sql):
+            applied = run_migrations(engine, migrations)
+
+        assert applied == ['0002']
+
+    def test_failed_required_migration_stops_startup(self):
+        """Test una migración requerida fallida detiene el proceso sin aplicar las siguientes"""
+        engine, executed = self._engine()
+        connection = engine.begin.return_value.__enter__.return_value
+        original = connection.execute.side_effect
+
+        def execute(statement, params=None):
+            if statement == 'CREATE UNIQUE INDEX unico':
+                raise Exception('could not create unique index')
+            return original(statement, params)
+
+        connection.execute.side_effect = execute
+        migrations = [
+            Migration('0001', 'unico', ('CREATE UNIQUE INDEX unico',), required=True),
+            Migration('0002', 'dos', ('CREATE INDEX dos',)),
+        ]
+
+        with patch('app.config.migrations.text', side_effect=lambda sql: sql):
+            with pytest.raises(MigrationError) as exc_info:
+                run_migrations(engine, migrations)
+
+        assert '0001' in str(exc_info.value)
+        assert 'CREATE INDEX dos' not in [statement for statement, _ in executed]
+
+    def test_unique_visit_index_is_required(self):
+        """Test el índice único de visitas por vendedor y fecha es una migración requerida"""
+        migration = next(m for m in MIGRATIONS if 'ux_scheduled_visits_seller_id_date' in m.statements[0])
+        assert migration.required is True
+
+    def test_migrations_are_idempotent(self):
+        """Test todas las sentencias de índices usan IF NOT EXISTS"""
+        versions = [migration.version for migration in MIGRATIONS]
+        assert versions == sorted(versions)
+        assert len(set(versions)) == len(versions)
+        for migration in MIGRATIONS:
+            for statement in migration.statements:
+                assert 'IF NOT EXISTS' in statement
+
+    def test_duplicate_visits_stop_startup(self, run_isolated):
+        """Test con visitas duplicadas ya guardadas el índice único no se crea y el arranque se detiene"""
+        result = run_isolated("""
+    import json
+    from sqlalchemy import create_engine, text
+    from app.config.migrations import MigrationError, run_migrations
+    from app.models.db_models import Base
+
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(text("DROP INDEX ux_scheduled_visits_seller_id_date"))
+        for visit_id in ('v1', 'v2'):
+            connection.execute(
+                text("INSERT INTO scheduled_visits (id, seller_id, date) VALUES (:id, 's1', '2030-12-01')"),
+                {'id': visit_id}
+            )
+
+    try:
+        run_migrations(engine)
+        error = None
+    except MigrationError as e:
+        error = str(e)
+    with engine.connect() as connection:
+        applied = [row[0] for row in connection.execute(text("SELECT version FROM schema_migrations"))]
+    print(json.dumps({'error': error, 'applied': applied}))
+""")
+
+        assert result['error'] is not None
+        assert '0001' in result['error']
+        assert result['applied'] == []
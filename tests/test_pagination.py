@@ -0,0 +1,25 @@
+"""
+Tests para los cursores de paginación
+"""
+import pytest
+from datetime import datetime
+from app.utils.pagination import encode_cursor, decode_cursor
+
+
+class TestCursor:
+    """Tests para encode_cursor y decode_cursor"""
+
+    def test_round_trip(self):
+        """Test el cursor decodificado conserva la llave original"""
+        key = (datetime(2025, 1, 2, 3, 4, 5, 678000), 42)
+
+        cursor = encode_cursor(*key)
+
+        assert decode_cursor(cursor) == key
+        assert '=' not in cursor
+
+    @pytest.mark.parametrize('cursor', ['no-es-base64!', 'W10', 'WyJ4Iiw1XQ', 'WyIyMDI1LTAxLTAxIiwiYSJd'])
+    def test_invalid_cursor(self, cursor):
+        """Test cursores corruptos o con llave inválida"""
+        with pytest.raises(ValueError, match="Cursor inválido"):
+            decode_cursor(cursor)
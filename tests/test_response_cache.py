@@ -0,0 +1,88 @@
+"""
+Tests para la caché de respuestas
+"""
+from app.utils.cache import MISSING
+from app.utils.response_cache import (
+    CacheBackend, InMemoryCacheBackend, ResponseCache,
+    get_sales_plan_response_cache, set_sales_plan_response_cache_backend
+)
+
+
+class DictBackend(CacheBackend):
+    """Backend mínimo para probar la interfaz"""
+
+    def __init__(self):
+        self.entries = {}
+
+    def get(self, key):
+        return self.entries.get(key, MISSING)
+
+    def set(self, key, value, ttl):
+        self.entries[key] = value
+
+    def clear(self):
+        self.entries.clear()
+
+
+class TestResponseCache:
+    """Tests para ResponseCache"""
+
+    def test_make_key_normalizes_params(self):
+        """Test la llave no depende del orden ni de parámetros vacíos"""
+        first = ResponseCache.make_key({'page': 1, 'name': ' Plan ', 'seller_id': None, 'client_id': ''})
+        second = ResponseCache.make_key({'name': 'Plan', 'page': 1})
+
+        assert first == second
+
+    def test_get_and_set(self):
+        """Test guarda y recupera respuestas"""
+        cache = ResponseCache(InMemoryCacheBackend(), ttl=30)
+        key = cache.make_key({'page': 1})
+
+        assert cache.get(key) is MISSING
+        cache.set(key, {'data': 1})
+        assert cache.get(key) == {'data': 1}
+
+    def test_invalidate_clears_entries(self):
+        """Test la invalidación descarta todas las respuestas"""
+        cache = ResponseCache(InMemoryCacheBackend(), ttl=30)
+        key = cache.make_key({'page': 1})
+        cache.set(key, {'data': 1})
+
+        cache.invalidate()
+
+        assert cache.get(key) is MISSING
+
+    def test_stale_response_is_not_stored_after_invalidation(self):
+        """Test una respuesta calculada antes de una escritura no se guarda"""
+        cache = ResponseCache(InMemoryCacheBackend(), ttl=30)
+        key = cache.make_key({'page': 1})
+        generation = cache.generation
+
+        cache.invalidate()
+        cache.set(key, {'data': 'vieja'}, generation=generation)
+
+        assert cache.get(key) is MISSING
+
+    def test_disabled_cache(self):
+        """Test con la caché deshabilitada no se guarda nada"""
+        cache = ResponseCache(InMemoryCacheBackend(), ttl=30, enabled=False)
+        key = cache.make_key({'page': 1})
+
+        cache.set(key, {'data': 1})
+
+        assert cache.get(key) is MISSING
+
+    def test_pluggable_backend(self):
+        """Test el backend del listado de planes se puede reemplazar"""
+        cache = get_sales_plan_response_cache()
+        original = cache.backend
+        backend = DictBackend()
+        try:
+            set_sales_plan_response_cache_backend(backend)
+            cache.set(('k',), 'v')
+
+            assert backend.entries == {('k',): 'v'}
+            assert cache.stats()['enabled'] is True
+        finally:
+            set_sales_plan_response_cache_backend(original)
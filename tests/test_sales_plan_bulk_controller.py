@@ -0,0 +1,107 @@
+"""
+Tests para el controlador de creación masiva de planes de ventas
+"""
+import pytest
+from unittest.mock import Mock, patch
+from flask import Flask
+from app.controllers.sales_plan_bulk_controller import SalesPlanBulkController
+from app.exceptions.custom_exceptions import SalesPlanValidationError, SalesPlanBusinessLogicError
+
+
+@pytest.fixture
+def app():
+    """Aplicación Flask para testing"""
+    app = Flask(__name__)
+    app.config['TESTING'] = True
+    return app
+
+
+def make_controller():
+    """Controlador con el servicio mockeado"""
+    with patch('app.controllers.sales_plan_bulk_controller.SalesPlanService'), \
+            patch('app.controllers.sales_plan_bulk_controller.SalesPlanRepository'):
+        return SalesPlanBulkController()
+
+
+class TestSalesPlanBulkController:
+    """Tests para SalesPlanBulkController"""
+
+    def test_post_all_created(self, app):
+        """Test todos los planes creados responde 201 con el resultado de cada uno"""
+        results = [
+            {'index': 0, 'success': True, 'data': {'id': 1}},
+            {'index': 1, 'success': True, 'data': {'id': 2}},
+        ]
+        with app.test_request_context(json={'plans': [{'name': 'A'}, {'name': 'B'}]}):
+            controller = make_controller()
+            controller.sales_plan_service.create_sales_plans_bulk = Mock(return_value=results)
+
+            response, status = controller.post()
+
+        assert status == 201
+        assert response['data'] == {'created': 2, 'failed': 0, 'results': results}
+        controller.sales_plan_service.create_sales_plans_bulk.assert_called_once_with([{'name': 'A'}, {'name': 'B'}])
+
+    def test_post_partial_failure(self, app):
+        """Test si algún plan falla responde 207"""
+        results = [
+            {'index': 0, 'success': True, 'data': {'id': 1}},
+            {'index': 1, 'success': False, 'error': 'El cliente con ID x no existe'},
+        ]
+        with app.test_request_context(json=[{'name': 'A'}, {'name': 'B'}]):
+            controller = make_controller()
+            controller.sales_plan_service.create_sales_plans_bulk = Mock(return_value=results)
+
+            response, status = controller.post()
+
+        assert status == 207
+        assert response['data']['created'] == 1
+        assert response['data']['failed'] == 1
+
+    @pytest.mark.parametrize('body', [{}, {'plans': []}, {'plans': 'x'}, []])
+    def test_post_requires_plans(self, app, body):
+        """Test se requiere una lista de planes no vacía"""
+        with app.test_request_context(json=body):
+            controller = make_controller()
+
+            response, status = controller.post()
+
+        assert status == 422
+        controller.sales_plan_service.create_sales_plans_bulk.assert_not_called()
+
+    def test_post_invalid_json(self, app):
+        """Test cuerpo que no es JSON válido"""
+        with app.test_request_context(data='no-json', content_type='application/json'):
+            controller = make_controller()
+
+            response, status = controller.post()
+
+        assert status == 422
+
+    def test_post_batch_too_large(self, app):
+        """Test el tamaño del lote está limitado por configuración"""
+        with app.test_request_context(json={'plans': [{}, {}, {}]}):
+            controller = make_controller()
+            controller.max_batch_size = 2
+
+            response, status = controller.post()
+
+        assert status == 413
+        assert 'más de 2 planes' in response['details']
+        controller.sales_plan_service.create_sales_plans_bulk.assert_not_called()
+
+    @pytest.mark.parametrize('error, expected_status', [
+        (SalesPlanValidationError("Uno o más nombres del lote ya existen"), 422),
+        (SalesPlanBusinessLogicError("Error al crear planes de ventas"), 500),
+        (Exception("inesperado"), 500),
+    ])
+    def test_post_errors(self, app, error, expected_status):
+        """Test errores del servicio"""
+        with app.test_request_context(json={'plans': [{'name': 'A'}]}):
+            controller = make_controller()
+            controller.sales_plan_service.create_sales_plans_bulk = Mock(side_effect=error)
+
+            response, status = controller.post()
+
+        assert status == expected_status
+        assert response['success'] is False
@@ -8,7 +8,11 @@ from datetime import datetime
 from app.controllers.sales_plan_create_controller import SalesPlanCreateController
 from app.controllers.sales_plan_controller import SalesPlanController, SalesPlanDeleteAllController
 from app.models.sales_plan import SalesPlan
-from app.exceptions.custom_exceptions import SalesPlanValidationError, SalesPlanBusinessLogicError
+from app.exceptions.custom_exceptions import (
+    SalesPlanValidationError,
+    SalesPlanBusinessLogicError,
+    UserDirectoryUnavailableError
+)
 
 TEST_SELLER_ID = '8f1b7d3f-4e3b-4f5e-9b2a-7d2a6b9f1c05'
 
@@ -26,7 +30,7 @@ class TestSalesPlanCreateController:
     
     @patch('app.services.sales_plan_service.SalesPlanService.create_sales_plan')
     @patch('app.services.sales_plan_service.SalesPlanService._validate_client_exists')
-    @patch('app.services.sales_plan_service.requests.get')
+    @patch('app.utils.http_client.HttpClient.get')
     def test_post_success(self, mock_get, mock_validate, mock_create, app):
         """Test crear plan exitosamente"""
         # Configurar mocks
@@ -286,13 +290,12 @@ class TestSalesPlanController:
             controller = SalesPlanController()
             
             mock_plan = Mock(spec=SalesPlan)
-            mock_plan.to_dict.return_value = {'id': 1, 'name': 'Plan Q1 2025'}
+            mock_plan.__json__.return_value = {'id': 1, 'name': 'Plan Q1 2025'}
             mock_plan.client_id = 'test-client-id'
             mock_plan.seller_id = 'test-seller-id'
             controller.sales_plan_service.get_sales_plans = Mock(return_value=([mock_plan], 1))
 
-            controller.sales_plan_service.get_client_names_for_ids = Mock(return_value={})
-            controller.sales_plan_service.get_seller_names_for_ids = Mock(return_value={})
+            controller.sales_plan_service.get_user_names_for_ids = Mock(return_value={})
             
             response, status = controller.get()
             
@@ -305,12 +308,11 @@ class TestSalesPlanController:
             controller = SalesPlanController()
             
             mock_plan = Mock(spec=SalesPlan)
-            mock_plan.to_dict.return_value = {'id': 1, 'name': 'Plan Q1 2025'}
+            mock_plan.__json__.return_value = {'id': 1, 'name': 'Plan Q1 2025'}
             mock_plan.client_id = 'test-client-id'
             mock_plan.seller_id = 'test-seller-id'
             controller.sales_plan_service.get_sales_plans = Mock(return_value=([mock_plan], 10))
-            controller.sales_plan_service.get_client_names_for_ids = Mock(return_value={})
-            controller.sales_plan_service.get_seller_names_for_ids = Mock(return_value={})
+            controller.sales_plan_service.get_user_names_for_ids = Mock(return_value={})
             
             response, status = controller.get()
             
@@ -321,15 +323,14 @@ class TestSalesPlanController:
         """Test obtener planes con filtros"""
         with app.test_request_context('?name=Q1&client_id=test'):
             mock_plan = Mock(spec=SalesPlan)
-            mock_plan.to_dict.return_value = {'id': 1, 'name': 'Plan Q1 2025'}
+            mock_plan.__json__.return_value = {'id': 1, 'name': 'Plan Q1 2025'}
             mock_plan.name = 'Plan Q1 2025'
             mock_plan.client_id = 'test-client-id'
             mock_plan.seller_id = 'test-seller-id'
             
             mock_service = Mock()
             mock_service.get_sales_plans = Mock(return_value=([mock_plan], 1))
-            mock_service.get_client_names_for_ids = Mock(return_value={})
-            mock_service.get_seller_names_for_ids = Mock(return_value={})
+            mock_service.get_user_names_for_ids = Mock(return_value={})
             mock_service_class.return_value = mock_service
             
             controller = SalesPlanController()
@@ -345,12 +346,11 @@ class TestSalesPlanController:
             mock_plan = Mock(spec=SalesPlan)
             mock_plan.client_id = 'c-1'
             mock_plan.seller_id = 's-1'
-            mock_plan.to_dict.return_value = {'id': 7, 'name': 'Plan Demo'}
+            mock_plan.__json__.return_value = {'id': 7, 'name': 'Plan Demo'}
 
             mock_service = Mock()
             mock_service.get_sales_plans = Mock(return_value=([mock_plan], 1))
-            mock_service.get_client_names_for_ids = Mock(return_value={'c-1': 'Cliente X'})
-            mock_service.get_seller_names_for_ids = Mock(return_value={'s-1': 'Seller Y'})
+            mock_service.get_user_names_for_ids = Mock(return_value={'c-1': 'Cliente X', 's-1': 'Seller Y'})
             mock_service_class.return_value = mock_service
 
             controller = SalesPlanController()
@@ -421,6 +421,204 @@ class TestSalesPlanController:
             
             assert status == 500
 
+    
+    @patch('app.controllers.sales_plan_controller.SalesPlanService')
+    def test_get_cursor_mode(self, mock_service_class, app):
+        """Test modo cursor retorna next_cursor y total opcional"""
+        with app.test_request_context('?pagination=cursor&per_page=1&count=exact'):
+            mock_plan = Mock(spec=SalesPlan)
+            mock_plan.client_id = 'c-1'
+            mock_plan.seller_id = 's-1'
+            mock_plan.__json__.return_value = {'id': 7}
+            
+            mock_service = Mock()
+            mock_service.get_sales_plans_by_cursor = Mock(return_value=([mock_plan], 'abc', 5))
+            mock_service.get_user_names_for_ids = Mock(return_value={'c-1': 'Cliente X'})
+            mock_service_class.return_value = mock_service
+            
+            controller = SalesPlanController()
+            response, status = controller.get()
+            
+            assert status == 200
+            assert response['data']['pagination'] == {
+                'per_page': 1, 'next_cursor': 'abc', 'has_more': True, 'total': 5
+            }
+            assert response['data']['items'][0]['client_name'] == 'Cliente X'
+            assert mock_service.get_sales_plans_by_cursor.call_args.kwargs['count'] == 'exact'
+            mock_service.get_sales_plans.assert_not_called()
+    
+    @patch('app.controllers.sales_plan_controller.SalesPlanService')
+    def test_get_cursor_param_enables_cursor_mode(self, mock_service_class, app):
+        """Test enviar un cursor activa el modo cursor"""
+        with app.test_request_context('?cursor=abc'):
+            mock_service = Mock()
+            mock_service.get_sales_plans_by_cursor = Mock(return_value=([], None, None))
+            mock_service.get_user_names_for_ids = Mock(return_value={})
+            mock_service_class.return_value = mock_service
+            
+            controller = SalesPlanController()
+            response, status = controller.get()
+            
+            assert status == 200
+            assert response['data']['pagination']['has_more'] is False
+            assert mock_service.get_sales_plans_by_cursor.call_args.kwargs['cursor'] == 'abc'
+    
+    @patch('app.controllers.sales_plan_controller.SalesPlanService')
+    def test_get_cursor_mode_invalid_cursor(self, mock_service_class, app):
+        """Test cursor inválido retorna 400"""
+        with app.test_request_context('?cursor=corrupto'):
+            mock_service = Mock()
+            mock_service.get_sales_plans_by_cursor = Mock(side_effect=SalesPlanValidationError("El cursor de paginación no es válido"))
+            mock_service_class.return_value = mock_service
+            
+            controller = SalesPlanController()
+            response, status = controller.get()
+            
+            assert status == 400
+    
+    @patch('app.controllers.sales_plan_controller.SalesPlanService')
+    def test_get_served_from_response_cache(self, mock_service_class, app):
+        """Test la misma combinación de filtros se sirve desde la caché"""
+        mock_service = Mock()
+        mock_service.get_sales_plans = Mock(return_value=([], 0))
+        mock_service.get_user_names_for_ids = Mock(return_value={})
+        mock_service_class.return_value = mock_service
+        
+        with app.test_request_context('?page=1&name=Plan&seller_id='):
+            first, status = SalesPlanController().get()
+        with app.test_request_context('?name=Plan%20&page=1'):
+            second, status = SalesPlanController().get()
+        
+        assert status == 200
+        assert second == first
+        mock_service.get_sales_plans.assert_called_once()
+    
+    @patch('app.controllers.sales_plan_controller.SalesPlanService')
+    def test_get_cache_invalidated_on_write(self, mock_service_class, app):
+        """Test una escritura invalida las respuestas guardadas"""
+        from app.utils.response_cache import get_sales_plan_response_cache
+        mock_service = Mock()
+        mock_service.get_sales_plans = Mock(return_value=([], 0))
+        mock_service.get_user_names_for_ids = Mock(return_value={})
+        mock_service_class.return_value = mock_service
+        
+        with app.test_request_context():
+            SalesPlanController().get()
+            get_sales_plan_response_cache().invalidate()
+            SalesPlanController().get()
+        
+        assert mock_service.get_sales_plans.call_count == 2
+    
+    @patch('app.controllers.sales_plan_controller.SalesPlanService')
+    def test_get_errors_are_not_cached(self, mock_service_class, app):
+        """Test las respuestas de error no se guardan en caché"""
+        mock_service = Mock()
+        mock_service.get_sales_plans = Mock(side_effect=[SalesPlanBusinessLogicError("Error"), ([], 0)])
+        mock_service.get_user_names_for_ids = Mock(return_value={})
+        mock_service_class.return_value = mock_service
+        
+        with app.test_request_context():
+            assert SalesPlanController().get()[1] == 500
+            assert SalesPlanController().get()[1] == 200
+    
+    @patch('app.controllers.sales_plan_controller.SalesPlanService')
+    def test_get_user_directory_unavailable(self, mock_service_class, app):
+        """Test si la búsqueda por nombre falla se responde 503 y no se guarda en caché"""
+        mock_service = Mock()
+        mock_service.get_sales_plans = Mock(side_effect=[UserDirectoryUnavailableError("Status 503"), ([], 0)])
+        mock_service.get_user_names_for_ids = Mock(return_value={})
+        mock_service_class.return_value = mock_service
+        
+        with app.test_request_context('?client_name=Ana'):
+            response, status = SalesPlanController().get()
+            assert status == 503
+            assert response['error'] == "Servicio de autenticación no disponible"
+            assert SalesPlanController().get()[1] == 200
+        
+        assert mock_service.get_sales_plans.call_count == 2
+    
+    @patch('app.utils.http_client.HttpClient.get')
+    def test_get_client_name_outage_does_not_cache_empty_page(self, mock_get, app):
+        """Test una caída del servicio de autenticación no deja guardada una página vacía"""
+        outage = Mock(status_code=503)
+        recovered = Mock(status_code=200)
+        recovered.json.return_value = {'data': {'users': [{'id': 'c-1'}]}}
+        mock_get.return_value = outage
+        
+        with app.test_request_context('?client_name=Ana'):
+            controller = SalesPlanController()
+            assert controller.get()[1] == 503
+            
+            mock_get.return_value = recovered
+            controller = SalesPlanController()
+            controller.sales_plan_service.sales_plan_repository = Mock()
+            controller.sales_plan_service.sales_plan_repository.get_with_filters.return_value = ([], 0)
+            controller.sales_plan_service.sales_plan_repository.get_listing_version.return_value = None
+            response, status = controller.get()
+        
+        assert status == 200
+        controller.sales_plan_service.sales_plan_repository.get_with_filters.assert_called_once()
+        assert controller.sales_plan_service.sales_plan_repository.get_with_filters.call_args.kwargs['client_ids'] == ['c-1']
+    
+    @patch('app.controllers.sales_plan_controller.SalesPlanService')
+    def test_get_not_modified(self, mock_service_class, app):
+        """Test con If-None-Match vigente retorna 304 sin consultar ni enriquecer"""
+        mock_service = Mock()
+        mock_service.get_sales_plans_version = Mock(return_value=(4, 'v'))
+        mock_service.get_sales_plans = Mock(return_value=([], 0))
+        mock_service.get_user_names_for_ids = Mock(return_value={})
+        mock_service_class.return_value = mock_service
+        
+        with app.test_request_context('?page=1'):
+            body, status = SalesPlanController().get()
+            etag = app.process_response(app.make_response((body, status))).headers['ETag']
+        with app.test_request_context('?page=1', headers={'If-None-Match': etag}):
+            response = SalesPlanController().get()
+        
+        assert response.status_code == 304
+        mock_service.get_sales_plans.assert_called_once()
+        mock_service.get_user_names_for_ids.assert_called_once()
+    
+    @patch('app.controllers.sales_plan_controller.SalesPlanService')
+    def test_get_cache_hit_serves_stored_etag(self, mock_service_class, app):
+        """Test un acierto de caché sin If-None-Match sirve el ETag guardado sin consultar la versión"""
+        mock_service = Mock()
+        mock_service.get_sales_plans_version = Mock(return_value=(4, 'v'))
+        mock_service.get_sales_plans = Mock(return_value=([], 0))
+        mock_service.get_user_names_for_ids = Mock(return_value={})
+        mock_service_class.return_value = mock_service
+        
+        with app.test_request_context('?page=1'):
+            body, status = SalesPlanController().get()
+            first_etag = app.process_response(app.make_response((body, status))).headers['ETag']
+        with app.test_request_context('?page=1'):
+            body, status = SalesPlanController().get()
+            second_etag = app.process_response(app.make_response((body, status))).headers['ETag']
+        
+        assert status == 200
+        assert second_etag == first_etag
+        mock_service.get_sales_plans_version.assert_called_once()
+        mock_service.get_sales_plans.assert_called_once()
+    
+    @patch('app.controllers.sales_plan_controller.SalesPlanService')
+    def test_get_cache_hit_with_stale_etag_is_rebuilt(self, mock_service_class, app):
+        """Test con If-None-Match y una versión distinta a la guardada se reconstruye la respuesta"""
+        mock_service = Mock()
+        mock_service.get_sales_plans_version = Mock(side_effect=[(4, 'v'), (5, 'w')])
+        mock_service.get_sales_plans = Mock(return_value=([], 0))
+        mock_service.get_user_names_for_ids = Mock(return_value={})
+        mock_service_class.return_value = mock_service
+        
+        with app.test_request_context('?page=1'):
+            body, status = SalesPlanController().get()
+            etag = app.process_response(app.make_response((body, status))).headers['ETag']
+        with app.test_request_context('?page=1', headers={'If-None-Match': etag}):
+            body, status = SalesPlanController().get()
+            new_etag = app.process_response(app.make_response((body, status))).headers['ETag']
+        
+        assert status == 200
+        assert new_etag != etag
+        assert mock_service.get_sales_plans.call_count == 2
 
 class TestSalesPlanDeleteAllController:
     """Tests para SalesPlanDeleteAllController"""
@@ -323,6 +323,18 @@ class TestSalesPlanModel:
         
         with pytest.raises(ValueError, match="El seller_id debe ser un UUID válido"):
             plan.validate()
-
-
-
+    
+    def test_slots_without_instance_dict(self):
+        """Test el modelo usa __slots__ y no admite atributos no declarados"""
+        plan = SalesPlan(
+            name='Plan Q1 2025',
+            start_date=datetime(2025, 1, 1),
+            end_date=datetime(2025, 3, 31),
+            client_id='a527df89-03f4-4c2c-9d4f-8e6b5c7d3a1b',
+            seller_id=TEST_SELLER_ID,
+            target_revenue=150000.50
+        )
+        
+        assert not hasattr(plan, '__dict__')
+        with pytest.raises(AttributeError):
+            plan.unknown_field = 'x'
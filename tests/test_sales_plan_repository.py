@@ -57,8 +57,8 @@ class TestSalesPlanRepository:
     
     @pytest.fixture
     def repository(self, mock_session):
-        """Repositorio con sesión mockeada"""
-        return SalesPlanRepository(mock_session)
+        """Repositorio con sesión mockeada (conteo en consulta separada)"""
+        return SalesPlanRepository(mock_session, window_count=False)
     
     @pytest.fixture
     def sample_sales_plan(self):
@@ -362,3 +362,279 @@ class TestSalesPlanRepository:
             repository.get_with_filters(page=1, per_page=10)
 
 
+    
+    @patch('app.repositories.sales_plan_repository.tuple_')
+    @patch('app.repositories.sales_plan_repository.SalesPlanDB')
+    def test_get_with_cursor_first_page_exact_count(self, mock_sales_plan_db, mock_tuple, repository, mock_session):
+        """Test primera página por cursor con conteo exacto y página siguiente"""
+        query = mock_session.query.return_value
+        query.count.return_value = 3
+        query.order_by.return_value.limit.return_value.all.return_value = [Mock(), Mock(), Mock()]
+        repository._db_to_model = Mock(side_effect=lambda db_plan: db_plan)
+        
+        plans, has_more, total = repository.get_with_cursor(per_page=2, count='exact')
+        
+        assert len(plans) == 2
+        assert has_more is True
+        assert total == 3
+        query.order_by.return_value.limit.assert_called_once_with(3)
+        query.filter.assert_not_called()
+    
+    @patch('app.repositories.sales_plan_repository.tuple_')
+    @patch('app.repositories.sales_plan_repository.SalesPlanDB')
+    def test_get_with_cursor_next_page_skips_count(self, mock_sales_plan_db, mock_tuple, repository, mock_session):
+        """Test las páginas siguientes filtran por la llave y no cuentan"""
+        key = MagicMock()
+        key.__lt__.return_value = Mock()
+        mock_tuple.return_value = key
+        chain = mock_session.query.return_value.filter.return_value
+        chain.order_by.return_value.limit.return_value.all.return_value = [Mock()]
+        repository._db_to_model = Mock(side_effect=lambda db_plan: db_plan)
+        
+        plans, has_more, total = repository.get_with_cursor(
+            per_page=2, after=(datetime(2025, 1, 1), 10), count='exact'
+        )
+        
+        assert len(plans) == 1
+        assert has_more is False
+        assert total is None
+        mock_session.query.return_value.count.assert_not_called()
+        mock_tuple.assert_any_call(datetime(2025, 1, 1), 10)
+    
+    @patch('app.repositories.sales_plan_repository.SalesPlanDB')
+    def test_get_with_cursor_estimate_non_postgres(self, mock_sales_plan_db, repository, mock_session):
+        """Test la estimación cuenta de forma exacta fuera de PostgreSQL"""
+        mock_session.get_bind.return_value.dialect.name = 'sqlite'
+        query = mock_session.query.return_value
+        query.count.return_value = 7
+        query.order_by.return_value.limit.return_value.all.return_value = []
+        
+        plans, has_more, total = repository.get_with_cursor(per_page=5, count='estimate')
+        
+        assert plans == []
+        assert total == 7
+    
+    @patch('app.repositories.sales_plan_repository.SalesPlanDB')
+    def test_get_with_cursor_estimate_postgres(self, mock_sales_plan_db, repository, mock_session):
+        """Test la estimación usa las filas previstas por EXPLAIN"""
+        mock_session.get_bind.return_value.dialect.name = 'postgresql'
+        mock_session.connection.return_value.exec_driver_sql.return_value.scalar.return_value = [
+            {'Plan': {'Plan Rows': 1234}}
+        ]
+        query = mock_session.query.return_value
+        query.order_by.return_value.limit.return_value.all.return_value = []
+        
+        plans, has_more, total = repository.get_with_cursor(per_page=5, count='estimate')
+        
+        assert total == 1234
+        query.count.assert_not_called()
+    
+    def test_get_with_cursor_sqlalchemy_error(self, repository, mock_session):
+        """Test error de SQLAlchemy en la paginación por cursor"""
+        mock_session.query.side_effect = SQLAlchemyError("Database error")
+        
+        with pytest.raises(Exception, match="Error al obtener planes de ventas"):
+            repository.get_with_cursor(per_page=10)
+    
+    def test_get_with_filters_window_count_single_query(self, mock_session):
+        """Test la página y el total llegan en una sola consulta con COUNT(*) OVER ()"""
+        repository = SalesPlanRepository(mock_session, window_count=True)
+        repository._db_to_model = Mock(side_effect=lambda db_plan: db_plan)
+        first, second = Mock(), Mock()
+        page_query = mock_session.query.return_value.add_columns.return_value
+        page_query.offset.return_value.limit.return_value.all.return_value = [(first, 12), (second, 12)]
+        
+        plans, total = repository.get_with_filters(page=2, per_page=2)
+        
+        assert plans == [first, second]
+        assert total == 12
+        page_query.offset.assert_called_once_with(2)
+        mock_session.query.return_value.count.assert_not_called()
+    
+    def test_get_with_filters_window_count_empty_first_page(self, mock_session):
+        """Test sin resultados en la primera página el total es 0 sin contar aparte"""
+        repository = SalesPlanRepository(mock_session, window_count=True)
+        page_query = mock_session.query.return_value.add_columns.return_value
+        page_query.offset.return_value.limit.return_value.all.return_value = []
+        
+        plans, total = repository.get_with_filters(page=1, per_page=10)
+        
+        assert (plans, total) == ([], 0)
+        mock_session.query.return_value.count.assert_not_called()
+    
+    def test_get_with_filters_window_count_page_out_of_range(self, mock_session):
+        """Test una página fuera de rango conserva el total real"""
+        repository = SalesPlanRepository(mock_session, window_count=True)
+        page_query = mock_session.query.return_value.add_columns.return_value
+        page_query.offset.return_value.limit.return_value.all.return_value = []
+        mock_session.query.return_value.count.return_value = 15
+        
+        plans, total = repository.get_with_filters(page=5, per_page=10)
+        
+        assert (plans, total) == ([], 15)
+    
+    @patch('app.repositories.sales_plan_repository.SalesPlanDB')
+    def test_client_ids_filter_uses_single_in(self, mock_sales_plan_db, repository, mock_session):
+        """Test pocos IDs se filtran con un único IN sin duplicados"""
+        mock_session.get_bind.return_value.dialect.name = 'postgresql'
+        
+        predicate = repository._client_ids_filter(['c-1', 'c-2', 'c-1'])
+        
+        mock_sales_plan_db.client_id.in_.assert_called_once_with(['c-1', 'c-2'])
+        assert predicate is mock_sales_plan_db.client_id.in_.return_value
+    
+    @patch('app.repositories.sales_plan_repository.any_')
+    @patch('app.repositories.sales_plan_repository.bindparam')
+    @patch('app.repositories.sales_plan_repository.SalesPlanDB')
+    def test_client_ids_filter_uses_array_in_postgres(self, mock_sales_plan_db, mock_bindparam, mock_any, repository, mock_session):
+        """Test muchos IDs en PostgreSQL se envían como un solo arreglo"""
+        from app.config.settings import Config
+        mock_session.get_bind.return_value.dialect.name = 'postgresql'
+        client_ids = [f'c-{i}' for i in range(Config.CLIENT_IDS_ARRAY_THRESHOLD + 1)]
+        
+        repository._client_ids_filter(client_ids)
+        
+        assert mock_bindparam.call_args.kwargs['value'] == client_ids
+        mock_any.assert_called_once_with(mock_bindparam.return_value)
+        mock_sales_plan_db.client_id.in_.assert_not_called()
+    
+    @patch('app.repositories.sales_plan_repository.SalesPlanDB')
+    def test_client_ids_filter_large_set_other_dialect(self, mock_sales_plan_db, repository, mock_session):
+        """Test fuera de PostgreSQL los conjuntos grandes usan IN"""
+        from app.config.settings import Config
+        mock_session.get_bind.side_effect = Exception("sin bind")
+        client_ids = [f'c-{i}' for i in range(Config.CLIENT_IDS_ARRAY_THRESHOLD + 1)]
+        
+        repository._client_ids_filter(client_ids)
+        
+        mock_sales_plan_db.client_id.in_.assert_called_once_with(client_ids)
+    
+    @patch('app.repositories.sales_plan_repository.false')
+    @patch('app.repositories.sales_plan_repository.SalesPlanDB')
+    def test_apply_filters_empty_client_ids_matches_nothing(self, mock_sales_plan_db, mock_false, repository):
+        """Test una lista vacía de clientes no elimina el filtro"""
+        query = Mock()
+        
+        repository._apply_filters(query, client_ids=[], client_id='ignorado')
+        
+        query.filter.assert_called_once_with(mock_false.return_value)
+    
+    @patch('app.repositories.sales_plan_repository.get_sales_plan_response_cache')
+    def test_delete_all_invalidates_response_cache(self, mock_get_cache, repository, mock_session):
+        """Test eliminar todos invalida la caché de respuestas del listado"""
+        repository.delete_all()
+        
+        mock_get_cache.return_value.invalidate.assert_called_once()
+    
+    @patch('app.repositories.sales_plan_repository.get_sales_plan_response_cache')
+    @patch('app.repositories.sales_plan_repository.SalesPlanDB')
+    def test_create_invalidates_response_cache(self, mock_sales_plan_db, mock_get_cache, repository, mock_session, sample_sales_plan_model):
+        """Test crear un plan invalida la caché de respuestas después del commit"""
+        repository._db_to_model = Mock(return_value=sample_sales_plan_model)
+        
+        repository.create(sample_sales_plan_model)
+        
+        mock_get_cache.return_value.invalidate.assert_called_once()
+    
+    @patch('app.repositories.sales_plan_repository.get_sales_plan_response_cache')
+    def test_failed_create_keeps_response_cache(self, mock_get_cache, repository, mock_session, sample_sales_plan_model):
+        """Test un error al crear no invalida la caché"""
+        mock_session.commit.side_effect = SQLAlchemyError("Error")
+        
+        with pytest.raises(Exception):
+            repository.create(sample_sales_plan_model)
+        
+        mock_get_cache.return_value.invalidate.assert_not_called()
+    
+    @patch('app.repositories.sales_plan_repository.SalesPlanDB')
+    def test_get_listing_version(self, mock_sales_plan_db, repository, mock_session):
+        """Test la versión del listado es (cantidad, último updated_at)"""
+        mock_session.query.return_value.one.return_value = (5, datetime(2025, 1, 1))
+        
+        assert repository.get_listing_version() == (5, datetime(2025, 1, 1))
+    
+    def test_get_listing_version_error(self, repository, mock_session):
+        """Test error de SQLAlchemy al obtener la versión"""
+        mock_session.query.side_effect = SQLAlchemyError("Error")
+        
+        with pytest.raises(Exception, match="Error al obtener versión"):
+            repository.get_listing_version()
+    
+    @patch('app.repositories.sales_plan_repository.get_sales_plan_response_cache')
+    @patch('app.repositories.sales_plan_repository.insert')
+    @patch('app.repositories.sales_plan_repository.SalesPlanDB')
+    def test_create_many_single_insert(self, mock_sales_plan_db, mock_insert, mock_get_cache, repository, mock_session, sample_sales_plan):
+        """Test crear varios planes con un solo INSERT ... RETURNING y un commit"""
+        second = SalesPlan(
+            name='Plan Q2 2025',
+            start_date=datetime(2025, 4, 1),
+            end_date=datetime(2025, 6, 30),
+            client_id=sample_sales_plan.client_id,
+            seller_id=sample_sales_plan.seller_id,
+            target_revenue=1000
+        )
+        rows = []
+        for plan_id, plan in ((2, second), (1, sample_sales_plan)):
+            row = Mock()
+            row.id = plan_id
+            for field in ('name', 'start_date', 'end_date', 'client_id', 'seller_id',
+                          'target_revenue', 'objectives', 'created_at', 'updated_at'):
+                setattr(row, field, getattr(plan, field))
+            rows.append(row)
+        mock_session.scalars.return_value.all.return_value = rows
+        
+        result = repository.create_many([sample_sales_plan, second])
+        
+        # Las filas devueltas se asocian por nombre, en el orden recibido
+        assert [plan.id for plan in result] == [1, 2]
+        assert mock_session.scalars.call_count == 1
+        params = mock_session.scalars.call_args.args[1]
+        assert [row['name'] for row in params] == ['Plan Q1 2025', 'Plan Q2 2025']
+        mock_session.commit.assert_called_once()
+        mock_session.refresh.assert_not_called()
+        mock_get_cache.return_value.invalidate.assert_called_once()
+    
+    def test_create_many_empty(self, repository, mock_session):
+        """Test un lote vacío no toca la base de datos"""
+        assert repository.create_many([]) == []
+        mock_session.scalars.assert_not_called()
+        mock_session.commit.assert_not_called()
+    
+    @patch('app.repositories.sales_plan_repository.insert')
+    @patch('app.repositories.sales_plan_repository.SalesPlanDB')
+    def test_create_many_duplicate_name(self, mock_sales_plan_db, mock_insert, repository, mock_session, sample_sales_plan):
+        """Test un nombre duplicado al insertar revierte todo el lote"""
+        mock_session.scalars.side_effect = SQLAlchemyError(
+            'UNIQUE constraint failed: sales_plans.name'
+        )
+        
+        with pytest.raises(ValueError, match="no se creó ningún plan"):
+            repository.create_many([sample_sales_plan])
+        mock_session.rollback.assert_called_once()
+        mock_session.commit.assert_not_called()
+    
+    @patch('app.repositories.sales_plan_repository.insert')
+    @patch('app.repositories.sales_plan_repository.SalesPlanDB')
+    def test_create_many_database_error(self, mock_sales_plan_db, mock_insert, repository, mock_session, sample_sales_plan):
+        """Test otro error de base de datos al insertar el lote"""
+        mock_session.scalars.side_effect = SQLAlchemyError("conexión perdida")
+        
+        with pytest.raises(Exception, match="Error al crear planes de ventas"):
+            repository.create_many([sample_sales_plan])
+        mock_session.rollback.assert_called_once()
+    
+    @patch('app.repositories.sales_plan_repository.SalesPlanDB')
+    def test_find_existing_names(self, mock_sales_plan_db, repository, mock_session):
+        """Test busca los nombres existentes con una sola consulta IN"""
+        mock_session.query.return_value.filter.return_value.all.return_value = [('Plan A',)]
+        
+        result = repository.find_existing_names(['Plan A', 'Plan B', 'Plan A'])
+        
+        assert result == {'Plan A'}
+        mock_session.query.assert_called_once()
+        mock_sales_plan_db.name.in_.assert_called_once_with(['Plan A', 'Plan B'])
+    
+    def test_find_existing_names_empty(self, repository, mock_session):
+        """Test sin nombres no consulta la base de datos"""
+        assert repository.find_existing_names([]) == set()
+        mock_session.query.assert_not_called()
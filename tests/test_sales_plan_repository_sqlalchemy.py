@@ -0,0 +1,71 @@
+"""
+Tests de SalesPlanRepository con SQLAlchemy real y el dialecto de PostgreSQL
+"""
+
+SETUP = """
+    import json
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+    from app.repositories.sales_plan_repository import SalesPlanRepository
+
+    # El motor no se conecta: solo aporta el dialecto con el que se compila el SQL
+    engine = create_engine('postgresql+psycopg2://usuario@localhost/ventas')
+    session = Session(bind=engine)
+    executed = []
+
+    class FakeConnection:
+        def exec_driver_sql(self, statement, parameters):
+            executed.append((statement, parameters))
+            result = type('Result', (), {'scalar': lambda self: [{'Plan': {'Plan Rows': 42}}]})
+            return result()
+
+    session.connection = lambda: FakeConnection()
+    repository = SalesPlanRepository(session)
+
+    def estimate(client_ids):
+        from app.models.db_models import SalesPlanDB
+        query = repository._apply_filters(
+            session.query(SalesPlanDB),
+            name='Plan',
+            client_ids=client_ids
+        )
+        total = repository._estimate_count(query)
+        statement, parameters = executed[-1]
+        return {
+            'total': total,
+            'statement': statement,
+            'parameters': {key: value for key, value in parameters.items()}
+        }
+"""
+
+
+class TestSalesPlanRepositoryPostgresSQL:
+    """SQL que se envía al driver de PostgreSQL para estimar el total"""
+
+    def test_estimate_count_expands_in_list(self, run_isolated):
+        """Test el IN de pocos clientes llega al driver con un parámetro por ID"""
+        result = run_isolated(SETUP + """
+    print(json.dumps(estimate(['c-1', 'c-2', 'c-1'])))
+""")
+
+        assert result['total'] == 42
+        assert result['statement'].startswith('EXPLAIN (FORMAT JSON) SELECT')
+        assert 'POSTCOMPILE' not in result['statement']
+        in_values = sorted(
+            value for key, value in result['parameters'].items() if key.startswith('client_id')
+        )
+        assert in_values == ['c-1', 'c-2']
+        for key in result['parameters']:
+            assert f'%({key})s' in result['statement']
+
+    def test_estimate_count_large_set_uses_array(self, run_isolated):
+        """Test un conjunto grande de clientes llega como un solo arreglo (= ANY)"""
+        result = run_isolated(SETUP + """
+    from app.config.settings import Config
+    ids = [f'c-{i}' for i in range(Config.CLIENT_IDS_ARRAY_THRESHOLD + 1)]
+    print(json.dumps(estimate(ids)))
+""")
+
+        assert 'ANY (%(client_ids)s' in result['statement']
+        assert 'POSTCOMPILE' not in result['statement']
+        assert len(result['parameters']['client_ids']) > 1
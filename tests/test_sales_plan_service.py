@@ -7,7 +7,11 @@ from datetime import datetime
 from app.services.sales_plan_service import SalesPlanService
 from app.repositories.sales_plan_repository import SalesPlanRepository
 from app.models.sales_plan import SalesPlan
-from app.exceptions.custom_exceptions import SalesPlanValidationError, SalesPlanBusinessLogicError
+from app.exceptions.custom_exceptions import (
+    SalesPlanValidationError,
+    SalesPlanBusinessLogicError,
+    UserDirectoryUnavailableError
+)
 
 
 class TestSalesPlanService:
@@ -71,7 +75,7 @@ class TestSalesPlanService:
             with pytest.raises(SalesPlanBusinessLogicError):
                 sales_plan_service.create_sales_plan(sample_data)
     
-    @patch('requests.get')
+    @patch('app.utils.http_client.HttpClient.get')
     def test_validate_client_exists_success(self, mock_get, sales_plan_service):
         """Test validar que cliente existe"""
         mock_response = Mock()
@@ -83,7 +87,7 @@ class TestSalesPlanService:
         assert result is True
         mock_get.assert_called_once()
     
-    @patch('requests.get')
+    @patch('app.utils.http_client.HttpClient.get')
     def test_validate_client_exists_not_found(self, mock_get, sales_plan_service):
         """Test validar que cliente no existe"""
         mock_response = Mock()
@@ -94,7 +98,7 @@ class TestSalesPlanService:
         
         assert result is False
     
-    @patch('requests.get')
+    @patch('app.utils.http_client.HttpClient.get')
     def test_validate_client_exists_request_exception(self, mock_get, sales_plan_service):
         """Test validar cliente con excepción de requests"""
         import requests
@@ -104,7 +108,7 @@ class TestSalesPlanService:
         
         assert result is False
     
-    @patch('requests.get')
+    @patch('app.utils.http_client.HttpClient.get')
     def test_get_client_ids_by_name_success(self, mock_get, sales_plan_service):
         """Test obtener IDs de clientes por nombre"""
         mock_response = Mock()
@@ -123,7 +127,7 @@ class TestSalesPlanService:
         
         assert result == ['uuid1', 'uuid2']
     
-    @patch('requests.get')
+    @patch('app.utils.http_client.HttpClient.get')
     def test_get_client_ids_by_name_empty(self, mock_get, sales_plan_service):
         """Test obtener IDs con respuesta vacía"""
         mock_response = Mock()
@@ -135,15 +139,26 @@ class TestSalesPlanService:
         
         assert result == []
     
-    @patch('requests.get')
+    @patch('app.utils.http_client.HttpClient.get')
     def test_get_client_ids_by_name_request_exception(self, mock_get, sales_plan_service):
-        """Test obtener IDs con excepción de requests"""
+        """Test obtener IDs con excepción de requests: la falla no se confunde con cero coincidencias"""
         import requests
         mock_get.side_effect = requests.exceptions.RequestException()
         
-        result = sales_plan_service._get_client_ids_by_name('Test Client')
+        with pytest.raises(UserDirectoryUnavailableError):
+            sales_plan_service._get_client_ids_by_name('Test Client')
+    
+    def test_get_sales_plans_user_directory_unavailable(self, sales_plan_service, mock_repository):
+        """Test la falla del directorio se propaga sin envolver y no consulta la base de datos"""
+        with patch.object(sales_plan_service, '_get_client_ids_by_name',
+                          side_effect=UserDirectoryUnavailableError("Status 503")):
+            with pytest.raises(UserDirectoryUnavailableError):
+                sales_plan_service.get_sales_plans(client_name='Ana')
+            with pytest.raises(UserDirectoryUnavailableError):
+                sales_plan_service.get_sales_plans_by_cursor(client_name='Ana')
         
-        assert result == []
+        mock_repository.get_with_filters.assert_not_called()
+        mock_repository.get_with_cursor.assert_not_called()
     
     def test_get_sales_plans_without_filters(self, sales_plan_service):
         """Test obtener planes sin filtros"""
@@ -206,73 +221,223 @@ class TestSalesPlanService:
         with pytest.raises(SalesPlanBusinessLogicError):
             sales_plan_service.delete_all_sales_plans()
 
-    @patch('requests.get')
-    def test__get_client_name_user_wrapped(self, mock_get, sales_plan_service):
-        """Test obtener nombre de cliente cuando viene envuelto en data.user"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            'data': {
-                'user': {
-                    'id': 'uuid1',
-                    'name': 'Cliente Demo'
-                }
-            }
-        }
-        mock_get.return_value = mock_response
-        name = sales_plan_service._get_client_name('uuid1')
-        assert name == 'Cliente Demo'
+    def test_get_user_names_for_ids_user_wrapped(self, sales_plan_service):
+        """Test extrae el nombre cuando el usuario viene envuelto en 'user'"""
+        with patch.object(sales_plan_service.user_directory, 'get_users',
+                          return_value={'s-1': {'user': {'name': 'S1'}}}):
+            result = sales_plan_service.get_user_names_for_ids([], ['s-1'])
+            assert result == {'s-1': 'S1'}
 
-    @patch('requests.get')
-    def test__get_client_name_flat_data(self, mock_get, sales_plan_service):
-        """Test obtener nombre de cliente cuando viene directo en data"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            'data': {
-                'id': 'uuid1',
-                'name': 'Cliente Plano'
-            }
-        }
-        mock_get.return_value = mock_response
-        name = sales_plan_service._get_client_name('uuid1')
-        assert name == 'Cliente Plano'
+    def test_get_user_names_for_ids_shares_lookup(self, sales_plan_service):
+        """Test un ID que es cliente y vendedor se resuelve una sola vez en una sola ronda"""
+        with patch.object(sales_plan_service.user_directory, 'get_users',
+                          return_value={'c-1': {'name': 'Cliente'}, 'u-1': {'name': 'Ambos'}}) as mock_users:
+            result = sales_plan_service.get_user_names_for_ids(['c-1', 'u-1'], ['u-1'])
 
-    @patch('requests.get')
-    def test__get_client_name_not_found(self, mock_get, sales_plan_service):
-        """Test obtener nombre de cliente con 404 devuelve None"""
-        mock_response = Mock()
-        mock_response.status_code = 404
-        mock_get.return_value = mock_response
-        name = sales_plan_service._get_client_name('uuid1')
-        assert name is None
+            mock_users.assert_called_once_with(['c-1', 'u-1', 'u-1'])
+            assert result == {'c-1': 'Cliente', 'u-1': 'Ambos'}
 
-    @patch('requests.get')
-    def test__get_client_name_request_exception(self, mock_get, sales_plan_service):
-        """Test excepción de requests devuelve None"""
-        import requests
-        mock_get.side_effect = requests.exceptions.RequestException()
-        name = sales_plan_service._get_client_name('uuid1')
-        assert name is None
-
-    def test_get_client_names_for_ids_deduplicates(self, sales_plan_service):
-        """Test mapea y deduplica IDs al consultar nombres"""
-        with patch.object(sales_plan_service, '_get_client_name', side_effect=['A', 'B']) as mock_get:
-            result = sales_plan_service.get_client_names_for_ids(['x', 'y', 'x'])
-            # Verificar que solo se consultó 2 veces (para x e y únicos)
-            assert mock_get.call_count == 2
-            # Verificar que ambas claves están presentes
-            assert 'x' in result
-            assert 'y' in result
-            # Verificar que los valores están asignados (sin importar orden exacto)
-            assert result['x'] in ['A', 'B']
-            assert result['y'] in ['A', 'B']
-            assert result['x'] != result['y']  # Deben ser diferentes
-
-    def test_get_seller_names_for_ids_basic(self, sales_plan_service):
-        """Test mapea seller IDs a nombres reutilizando _get_client_name"""
-        with patch.object(sales_plan_service, '_get_client_name', side_effect=['S1']):
-            result = sales_plan_service.get_seller_names_for_ids(['s-1'])
-            assert result == {'s-1': 'S1'}
+    def test_get_user_names_for_ids_missing_user(self, sales_plan_service):
+        """Test usuarios no encontrados se mapean a None"""
+        with patch.object(sales_plan_service.user_directory, 'get_users', return_value={'c-1': None}):
+            result = sales_plan_service.get_user_names_for_ids(['c-1'], [])
+            assert result == {'c-1': None}
+
+    def test_get_sales_plans_by_cursor_builds_next_cursor(self, sales_plan_service, mock_repository):
+        """Test el cursor siguiente se arma con la llave del último plan"""
+        from app.utils.pagination import decode_cursor
+        last = Mock(created_at=datetime(2025, 2, 1, 8, 0), id=9)
+        mock_repository.get_with_cursor.return_value = ([Mock(), last], True, 20)
+
+        plans, next_cursor, total = sales_plan_service.get_sales_plans_by_cursor(per_page=2, count='exact')
+
+        assert total == 20
+        assert decode_cursor(next_cursor) == (datetime(2025, 2, 1, 8, 0), 9)
+        assert mock_repository.get_with_cursor.call_args.kwargs['after'] is None
+
+    def test_get_sales_plans_by_cursor_last_page(self, sales_plan_service, mock_repository):
+        """Test la última página no retorna cursor siguiente"""
+        from app.utils.pagination import encode_cursor
+        mock_repository.get_with_cursor.return_value = ([Mock()], False, None)
+        cursor = encode_cursor(datetime(2025, 2, 1), 9)
+
+        plans, next_cursor, total = sales_plan_service.get_sales_plans_by_cursor(per_page=2, cursor=cursor)
+
+        assert next_cursor is None
+        assert mock_repository.get_with_cursor.call_args.kwargs['after'] == (datetime(2025, 2, 1), 9)
+
+    def test_get_sales_plans_by_cursor_with_client_name(self, sales_plan_service, mock_repository):
+        """Test el filtro por nombre de cliente se resuelve a IDs"""
+        mock_repository.get_with_cursor.return_value = ([], False, None)
+        with patch.object(sales_plan_service, '_get_client_ids_by_name', return_value=['c-1']):
+            sales_plan_service.get_sales_plans_by_cursor(client_name='Ana')
+
+        kwargs = mock_repository.get_with_cursor.call_args.kwargs
+        assert kwargs['client_ids'] == ['c-1']
+        assert 'client_id' not in kwargs
+
+    def test_get_sales_plans_by_cursor_invalid_cursor(self, sales_plan_service):
+        """Test un cursor corrupto es un error de validación"""
+        with pytest.raises(SalesPlanValidationError, match="cursor"):
+            sales_plan_service.get_sales_plans_by_cursor(cursor='corrupto')
+
+    def test_get_sales_plans_by_cursor_invalid_count(self, sales_plan_service):
+        """Test modo de conteo desconocido"""
+        with pytest.raises(SalesPlanValidationError, match="count"):
+            sales_plan_service.get_sales_plans_by_cursor(count='todo')
+
+    def test_get_sales_plans_by_cursor_error(self, sales_plan_service, mock_repository):
+        """Test error del repositorio en la paginación por cursor"""
+        mock_repository.get_with_cursor.side_effect = Exception("Error")
+
+        with pytest.raises(SalesPlanBusinessLogicError):
+            sales_plan_service.get_sales_plans_by_cursor()
+
+    def test_get_sales_plans_client_name_without_matches_skips_db(self, sales_plan_service, mock_repository):
+        """Test sin clientes para el nombre no se consulta la base de datos"""
+        with patch.object(sales_plan_service, '_get_client_ids_by_name', return_value=[]):
+            plans, total = sales_plan_service.get_sales_plans(client_name='Nadie')
+
+        assert (plans, total) == ([], 0)
+        mock_repository.get_with_filters.assert_not_called()
+
+    def test_get_sales_plans_by_cursor_client_name_without_matches(self, sales_plan_service, mock_repository):
+        """Test modo cursor sin clientes para el nombre no consulta la base de datos"""
+        with patch.object(sales_plan_service, '_get_client_ids_by_name', return_value=[]):
+            assert sales_plan_service.get_sales_plans_by_cursor(client_name='Nadie') == ([], None, None)
+            assert sales_plan_service.get_sales_plans_by_cursor(client_name='Nadie', count='exact') == ([], None, 0)
+
+        mock_repository.get_with_cursor.assert_not_called()
+
+    def test_get_sales_plans_version(self, sales_plan_service, mock_repository):
+        """Test la versión del listado se delega al repositorio con los filtros"""
+        mock_repository.get_listing_version.return_value = (3, datetime(2025, 1, 1))
+
+        assert sales_plan_service.get_sales_plans_version(seller_id='s-1') == (3, datetime(2025, 1, 1))
+        assert mock_repository.get_listing_version.call_args.kwargs['seller_id'] == 's-1'
+
+    def test_get_sales_plans_version_without_matching_clients(self, sales_plan_service, mock_repository):
+        """Test sin clientes para el nombre la versión no consulta la base de datos"""
+        with patch.object(sales_plan_service, '_get_client_ids_by_name', return_value=[]):
+            assert sales_plan_service.get_sales_plans_version(client_name='Nadie') == ('sin-clientes',)
+
+        mock_repository.get_listing_version.assert_not_called()
+
+    def test_get_sales_plans_version_with_client_name(self, sales_plan_service, mock_repository):
+        """Test la versión usa los IDs resueltos por nombre"""
+        mock_repository.get_listing_version.return_value = (1, None)
+        with patch.object(sales_plan_service, '_get_client_ids_by_name', return_value=['c-1']):
+            sales_plan_service.get_sales_plans_version(client_name='Ana')
+
+        assert mock_repository.get_listing_version.call_args.kwargs['client_ids'] == ['c-1']
+
+    def _bulk_item(self, sample_data, name, **overrides):
+        item = dict(sample_data, name=name)
+        item.update(overrides)
+        return item
+
+    def _created_plan(self, plan, plan_id):
+        plan.id = plan_id
+        return plan
+
+    def test_create_sales_plans_bulk_success(self, sales_plan_service, mock_repository, sample_data):
+        """Test creación masiva: una consulta al directorio, una de nombres y una inserción"""
+        items = [self._bulk_item(sample_data, f'Plan {i}') for i in range(3)]
+        mock_repository.find_existing_names.return_value = set()
+        mock_repository.create_many.side_effect = lambda plans: [
+            self._created_plan(plan, i + 1) for i, plan in enumerate(plans)
+        ]
+
+        with patch.object(sales_plan_service.user_directory, 'lookup_users',
+                          return_value=({sample_data['client_id']: {'id': sample_data['client_id']}}, set())) as mock_lookup:
+            results = sales_plan_service.create_sales_plans_bulk(items)
+
+        assert [result['success'] for result in results] == [True, True, True]
+        assert [result['data']['id'] for result in results] == [1, 2, 3]
+        mock_lookup.assert_called_once()
+        mock_repository.find_existing_names.assert_called_once()
+        assert list(mock_repository.find_existing_names.call_args.args[0]) == ['Plan 0', 'Plan 1', 'Plan 2']
+        mock_repository.create_many.assert_called_once()
+
+    def test_create_sales_plans_bulk_reports_errors_per_item(self, sales_plan_service, mock_repository, sample_data):
+        """Test los elementos inválidos se reportan sin impedir la creación de los válidos"""
+        missing_client = 'c527df89-03f4-4c2c-9d4f-8e6b5c7d3a1b'
+        items = [
+            self._bulk_item(sample_data, 'Plan Valido'),
+            self._bulk_item(sample_data, 'Plan Existente'),
+            self._bulk_item(sample_data, 'Plan Valido'),
+            self._bulk_item(sample_data, 'Plan Sin Cliente', client_id=missing_client),
+            self._bulk_item(sample_data, 'Plan@Invalido'),
+            {'name': 'Incompleto'},
+            'no es un objeto',
+        ]
+        mock_repository.find_existing_names.return_value = {'Plan Existente'}
+        mock_repository.create_many.side_effect = lambda plans: [self._created_plan(plan, 10) for plan in plans]
+
+        with patch.object(sales_plan_service.user_directory, 'lookup_users',
+                          return_value=({sample_data['client_id']: {}, missing_client: None}, set())):
+            results = sales_plan_service.create_sales_plans_bulk(items)
+
+        assert [result['index'] for result in results] == list(range(7))
+        assert results[0]['success'] is True
+        assert results[1]['error'] == "Ya existe un plan de ventas con el nombre 'Plan Existente'"
+        assert results[2]['error'] == "El nombre 'Plan Valido' está repetido en el lote"
+        assert results[3]['error'] == f"El cliente con ID {missing_client} no existe"
+        assert results[4]['error'] == "El nombre solo puede contener letras, números, espacios y tildes"
+        assert results[5]['error'] == "El campo 'start_date' es obligatorio"
+        assert results[6]['error'] == "Cada plan debe ser un objeto JSON"
+        assert not any(result.get('retryable') for result in results)
+        created = mock_repository.create_many.call_args.args[0]
+        assert [plan.name for plan in created] == ['Plan Valido']
+
+    def test_create_sales_plans_bulk_unverified_client_is_retryable(self, sales_plan_service, mock_repository, sample_data):
+        """Test un cliente no verificado por fallo del directorio es un error reintentable, no inexistente"""
+        unverified_client = 'd527df89-03f4-4c2c-9d4f-8e6b5c7d3a1b'
+        items = [
+            self._bulk_item(sample_data, 'Plan Valido'),
+            self._bulk_item(sample_data, 'Plan Sin Verificar', client_id=unverified_client),
+        ]
+        mock_repository.find_existing_names.return_value = set()
+        mock_repository.create_many.side_effect = lambda plans: [self._created_plan(plan, 10) for plan in plans]
+
+        with patch.object(sales_plan_service.user_directory, 'lookup_users',
+                          return_value=({sample_data['client_id']: {}}, {unverified_client})):
+            results = sales_plan_service.create_sales_plans_bulk(items)
+
+        assert results[0]['success'] is True
+        assert results[1]['success'] is False
+        assert results[1]['retryable'] is True
+        assert 'no existe' not in results[1]['error']
+        assert results[1]['error'].startswith(f"No se pudo verificar el cliente con ID {unverified_client}")
+        created = mock_repository.create_many.call_args.args[0]
+        assert [plan.name for plan in created] == ['Plan Valido']
+
+    def test_create_sales_plans_bulk_all_invalid_skips_lookups(self, sales_plan_service, mock_repository):
+        """Test sin elementos válidos no se consulta el directorio ni los nombres"""
+        mock_repository.create_many.return_value = []
+
+        with patch.object(sales_plan_service.user_directory, 'lookup_users') as mock_lookup:
+            results = sales_plan_service.create_sales_plans_bulk([{}, {'name': 'x'}])
+
+        assert all(not result['success'] for result in results)
+        mock_lookup.assert_not_called()
+        mock_repository.find_existing_names.assert_not_called()
+
+    def test_create_sales_plans_bulk_conflict_on_insert(self, sales_plan_service, mock_repository, sample_data):
+        """Test un conflicto de nombres al insertar es un error de validación"""
+        mock_repository.find_existing_names.return_value = set()
+        mock_repository.create_many.side_effect = ValueError("Uno o más nombres del lote ya existen")
+
+        with patch.object(sales_plan_service.user_directory, 'lookup_users',
+                          return_value=({sample_data['client_id']: {}}, set())):
+            with pytest.raises(SalesPlanValidationError, match="ya existen"):
+                sales_plan_service.create_sales_plans_bulk([sample_data])
 
+    def test_create_sales_plans_bulk_database_error(self, sales_plan_service, mock_repository, sample_data):
+        """Test un error de base de datos es un error de lógica de negocio"""
+        mock_repository.find_existing_names.side_effect = Exception("DB caída")
 
+        with patch.object(sales_plan_service.user_directory, 'lookup_users',
+                          return_value=({sample_data['client_id']: {}}, set())):
+            with pytest.raises(SalesPlanBusinessLogicError, match="Error al crear planes de ventas"):
+                sales_plan_service.create_sales_plans_bulk([sample_data])
@@ -305,3 +305,17 @@ class TestScheduledVisitController:
             assert status == 500
             assert response['success'] is False
 
+    
+    @patch('app.services.scheduled_visit_service.ScheduledVisitService.get_scheduled_visits_version')
+    @patch('app.services.scheduled_visit_service.ScheduledVisitService.get_scheduled_visits')
+    def test_get_not_modified(self, mock_get_visits, mock_version, app):
+        """Test con If-None-Match vigente retorna 304 sin consultar visitas"""
+        from app.utils.etag import make_etag
+        mock_version.return_value = (2, 3, 'v', 'c')
+        etag = make_etag('scheduled-visits', (2, 3, 'v', 'c'), 'seller1', None)
+        
+        with app.test_request_context(headers={'If-None-Match': f'W/"{etag}"'}):
+            response = ScheduledVisitController().get('seller1')
+        
+        assert response.status_code == 304
+        mock_get_visits.assert_not_called()
@@ -158,3 +158,46 @@ class TestScheduledVisitDetailController:
             assert response['data']['clients'][0]['name'] == 'Hospital General'
             assert response['data']['clients'][1]['name'] == 'Clínica Central'
 
+    
+    @patch('app.services.scheduled_visit_detail_service.ScheduledVisitDetailService.get_visit_detail_version')
+    @patch('app.services.scheduled_visit_detail_service.ScheduledVisitDetailService.get_visit_detail')
+    def test_get_not_modified_skips_enrichment(self, mock_get_visit_detail, mock_version, app):
+        """Test con If-None-Match vigente retorna 304 sin consultar clientes"""
+        from app.utils.etag import make_etag
+        from app.controllers.scheduled_visit_detail_controller import ScheduledVisitDetailController
+        mock_version.return_value = (1, 2, 'v', 'c')
+        etag = make_etag('visit-detail', (1, 2, 'v', 'c'), 'seller1', 'visit1')
+        
+        with app.test_request_context(headers={'If-None-Match': f'W/"{etag}"'}):
+            response = ScheduledVisitDetailController().get('seller1', 'visit1')
+        
+        assert response.status_code == 304
+        mock_get_visit_detail.assert_not_called()
+    
+    @patch('app.services.scheduled_visit_detail_service.ScheduledVisitDetailService.get_visit_detail_version')
+    @patch('app.services.scheduled_visit_detail_service.ScheduledVisitDetailService.get_visit_detail')
+    def test_get_partial_detail_has_no_etag(self, mock_get_visit_detail, mock_version, app):
+        """Test un detalle parcial no lleva ETag"""
+        from app.controllers.scheduled_visit_detail_controller import ScheduledVisitDetailController
+        mock_version.return_value = (1, 1, 'v', 'c')
+        mock_get_visit_detail.return_value = {'id': 'visit1', 'clients': [{'id': 'c1', 'partial': True}]}
+        
+        with app.test_request_context():
+            body, status = ScheduledVisitDetailController().get('seller1', 'visit1')
+            response = app.process_response(app.make_response((body, status)))
+        
+        assert status == 200
+        assert 'ETag' not in response.headers
+    
+    @patch('app.services.scheduled_visit_detail_service.ScheduledVisitDetailService.get_visit_detail_version')
+    @patch('app.services.scheduled_visit_detail_service.ScheduledVisitDetailService.get_visit_detail')
+    def test_get_version_error_falls_back(self, mock_get_visit_detail, mock_version, app):
+        """Test si la versión falla se responde el detalle completo"""
+        from app.controllers.scheduled_visit_detail_controller import ScheduledVisitDetailController
+        mock_version.side_effect = Exception("BD")
+        mock_get_visit_detail.return_value = {'id': 'visit1', 'clients': []}
+        
+        with app.test_request_context():
+            body, status = ScheduledVisitDetailController().get('seller1', 'visit1')
+        
+        assert status == 200
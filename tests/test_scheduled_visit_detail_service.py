@@ -77,7 +77,7 @@ class TestScheduledVisitDetailService:
             with pytest.raises(SalesPlanBusinessLogicError, match="Error al obtener detalle de visita"):
                 service.get_visit_detail('visit1', 'seller1')
     
-    @patch('requests.get')
+    @patch('app.utils.http_client.HttpClient.get')
     def test_validate_seller_exists_success(self, mock_get, service):
         """Test validar que vendedor existe"""
         mock_response = Mock()
@@ -88,7 +88,7 @@ class TestScheduledVisitDetailService:
         
         assert result is True
     
-    @patch('requests.get')
+    @patch('app.utils.http_client.HttpClient.get')
     def test_validate_seller_exists_not_found(self, mock_get, service):
         """Test validar que vendedor no existe"""
         mock_response = Mock()
@@ -99,7 +99,7 @@ class TestScheduledVisitDetailService:
         
         assert result is False
     
-    @patch('requests.get')
+    @patch('app.utils.http_client.HttpClient.get')
     def test_validate_seller_exists_request_exception(self, mock_get, service):
         """Test validar vendedor con excepción de requests"""
         import requests
@@ -109,7 +109,7 @@ class TestScheduledVisitDetailService:
         
         assert result is False
     
-    @patch('requests.get')
+    @patch('app.utils.http_client.HttpClient.get')
     def test_get_client_detail_success_with_data_wrapper(self, mock_get, service):
         """Test obtener detalle de cliente con respuesta envuelta en 'data'"""
         mock_response = Mock()
@@ -130,7 +130,7 @@ class TestScheduledVisitDetailService:
         assert result['id'] == 'client1'
         assert result['name'] == 'Hospital General'
     
-    @patch('requests.get')
+    @patch('app.utils.http_client.HttpClient.get')
     def test_get_client_detail_success_without_wrapper(self, mock_get, service):
         """Test obtener detalle de cliente con respuesta directa"""
         mock_response = Mock()
@@ -148,7 +148,7 @@ class TestScheduledVisitDetailService:
         assert result['id'] == 'client1'
         assert result['name'] == 'Hospital General'
     
-    @patch('requests.get')
+    @patch('app.utils.http_client.HttpClient.get')
     def test_get_client_detail_not_found(self, mock_get, service):
         """Test obtener detalle de cliente que no existe"""
         mock_response = Mock()
@@ -159,7 +159,7 @@ class TestScheduledVisitDetailService:
         
         assert result is None
     
-    @patch('requests.get')
+    @patch('app.utils.http_client.HttpClient.get')
     def test_get_client_detail_request_exception(self, mock_get, service):
         """Test obtener detalle de cliente con excepción de requests"""
         import requests
@@ -196,10 +196,58 @@ class TestScheduledVisitDetailService:
                 assert result['id'] == 'visit1'
                 assert len(result['clients']) == 0  # No se agregaron clientes porque retornaron None
     
+    def test_get_visit_detail_keeps_order_and_returns_partial_on_timeout(self, mock_repository):
+        """Test el detalle respeta el orden guardado y retorna parciales los clientes lentos"""
+        import threading
+        from datetime import datetime
+        from app.config.settings import Config
+        
+        config = Config()
+        config.VISIT_DETAIL_DEADLINE = 0.1
+        service = ScheduledVisitDetailService(mock_repository, config=config)
+        
+        mock_visit = Mock()
+        mock_visit.id = 'visit1'
+        mock_visit.seller_id = 'seller1'
+        mock_visit.date = date(2025, 12, 1)
+        mock_visit.created_at = datetime(2025, 11, 1, 10, 0, 0)
+        mock_visit.updated_at = None
+        mock_visit.clients = [Mock(client_id=cid) for cid in ('client1', 'slow', 'client3')]
+        mock_repository.get_by_id_and_seller.return_value = mock_visit
+        release = threading.Event()
+        
+        def detail(client_id):
+            if client_id == 'slow':
+                release.wait(2)
+            return {'id': client_id}
+        
+        with patch.object(service, '_validate_seller_exists', return_value=True):
+            with patch.object(service, '_get_client_detail', side_effect=detail):
+                result = service.get_visit_detail('visit1', 'seller1')
+        release.set()
+        
+        assert result['clients'] == [
+            {'id': 'client1'},
+            {'id': 'slow', 'partial': True},
+            {'id': 'client3'}
+        ]
+    
     def test_init_service(self, mock_repository):
         """Test inicialización del servicio"""
         service = ScheduledVisitDetailService(mock_repository)
         
         assert service.scheduled_visit_repository == mock_repository
-        assert service.auth_service_url is not None
 
+    
+    def test_get_visit_detail_version(self, service, mock_repository):
+        """Test la versión de una visita existente"""
+        mock_repository.get_visits_version.return_value = (1, 3, 'v', 'c')
+        
+        assert service.get_visit_detail_version('visit1', 'seller1') == (1, 3, 'v', 'c')
+        mock_repository.get_visits_version.assert_called_once_with(seller_id='seller1', visit_id='visit1')
+    
+    def test_get_visit_detail_version_not_found(self, service, mock_repository):
+        """Test sin visita no hay versión"""
+        mock_repository.get_visits_version.return_value = (0, 0, None, None)
+        
+        assert service.get_visit_detail_version('visit1', 'seller1') is None
@@ -205,4 +205,14 @@ class TestScheduledVisit:
         )
         assert visit.id is not None
         assert len(visit.id) == 36  # UUID tiene 36 caracteres con guiones
-
+    
+    def test_slots_without_instance_dict(self, valid_clients):
+        """Test la visita y sus clientes usan __slots__"""
+        visit = ScheduledVisit(
+            seller_id='c527df89-03f4-4c2c-9d4f-8e6b5c7d3a1b',
+            date=date(2025, 12, 1),
+            clients=valid_clients
+        )
+        
+        assert not hasattr(visit, '__dict__')
+        assert not hasattr(visit.clients[0], '__dict__')
@@ -73,31 +73,27 @@ class TestScheduledVisitRepository:
             clients=sample_clients
         )
     
+    @patch('app.repositories.scheduled_visit_repository.insert')
     @patch('app.repositories.scheduled_visit_repository.ScheduledVisitDB')
     @patch('app.repositories.scheduled_visit_repository.ScheduledVisitClientDB')
-    def test_create_visit_success(self, mock_client_db, mock_visit_db, repository, sample_visit, mock_session):
-        """Test crear visita exitosamente"""
-        # Configurar mocks de BD
-        mock_db_visit = Mock()
-        mock_db_visit.id = sample_visit.id
-        mock_db_visit.seller_id = sample_visit.seller_id
-        mock_db_visit.date = sample_visit.date
-        mock_db_visit.created_at = datetime.now()
-        mock_db_visit.updated_at = datetime.now()
-        
-        mock_visit_db.return_value = mock_db_visit
-        mock_client_db.return_value = Mock()
-        
-        # Mockear _db_to_model
-        repository._db_to_model = Mock(return_value=sample_visit)
-        
+    def test_create_visit_success(self, mock_client_db, mock_visit_db, mock_insert, repository, sample_visit, mock_session):
+        """Test crear visita: un INSERT de la visita, uno de varias filas de clientes y un commit"""
         result = repository.create(sample_visit)
         
-        assert result == sample_visit
-        assert mock_session.add.call_count >= 3  # 1 visita + 2 clientes
-        mock_session.flush.assert_called_once()
+        assert result is sample_visit
+        assert mock_session.execute.call_count == 2
+        mock_insert.assert_any_call(mock_visit_db)
+        mock_insert.assert_any_call(mock_client_db)
+        mock_insert.return_value.values.assert_called_once_with(
+            id=sample_visit.id,
+            seller_id=sample_visit.seller_id,
+            date=sample_visit.date,
+            created_at=sample_visit.created_at,
+            updated_at=sample_visit.updated_at
+        )
+        mock_session.add.assert_not_called()
         mock_session.commit.assert_called_once()
-        mock_session.refresh.assert_called_once()
+        mock_session.refresh.assert_not_called()
     
     def test_create_visit_duplicate_date_seller(self, repository, sample_visit):
         """Test crear visita con fecha y vendedor duplicados"""
@@ -176,36 +172,6 @@ class TestScheduledVisitRepository:
         with pytest.raises(Exception, match="Error al obtener visitas programadas"):
             repository.get_by_seller_with_filters(seller_id='seller1')
     
-    def test_get_clients_for_visit_success(self, repository):
-        """Test obtener clientes de una visita"""
-        from app.models.scheduled_visit import ScheduledVisitClient
-        
-        expected_clients = [
-            ScheduledVisitClient(client_id='client1'),
-            ScheduledVisitClient(client_id='client2')
-        ]
-        
-        with patch.object(repository, 'get_clients_for_visit', return_value=expected_clients):
-            clients = repository.get_clients_for_visit('visit1')
-            
-            assert len(clients) == 2
-            assert clients[0].client_id == 'client1'
-            assert clients[1].client_id == 'client2'
-    
-    def test_get_clients_for_visit_empty(self, repository):
-        """Test obtener clientes de una visita sin clientes"""
-        # Mockear el método en lugar de ejecutarlo completo
-        with patch.object(repository, 'get_clients_for_visit', return_value=[]):
-            clients = repository.get_clients_for_visit('visit1')
-            assert len(clients) == 0
-    
-    def test_get_clients_for_visit_error(self, repository, mock_session):
-        """Test obtener clientes con error de BD"""
-        mock_session.all.side_effect = Exception("Error de BD")
-        
-        with pytest.raises(Exception, match="Error al obtener clientes de la visita"):
-            repository.get_clients_for_visit('visit1')
-    
     def test_db_to_model(self, repository, sample_clients):
         """Test convertir modelo de BD a modelo de dominio"""
         db_visit = Mock()
@@ -248,15 +214,15 @@ class TestScheduledVisitRepository:
         assert model.updated_at == datetime(2025, 1, 2, 15, 30, 0)
     
     def test_create_visit_flush_error(self, repository, sample_visit, mock_session):
-        """Test crear visita con error durante flush"""
+        """Test crear visita con error al insertar"""
         from sqlalchemy.exc import SQLAlchemyError
-        mock_session.flush.side_effect = SQLAlchemyError("Error durante flush")
-        mock_session.first.return_value = None  # No existe registro duplicado
+        mock_session.execute.side_effect = SQLAlchemyError("Error al insertar")
         
         with pytest.raises(Exception, match="Error al crear visita programada"):
             repository.create(sample_visit)
         
         mock_session.rollback.assert_called_once()
+        mock_session.commit.assert_not_called()
     
     def test_create_visit_with_single_client(self, repository):
         """Test crear visita con un solo cliente"""
@@ -302,23 +268,6 @@ class TestScheduledVisitRepository:
             assert results[1][1] == 2  # Segunda visita con 2 clientes
             assert results[2][1] == 5  # Tercera visita con 5 clientes
     
-    def test_get_clients_for_visit_with_multiple_clients(self, repository):
-        """Test obtener múltiples clientes de una visita"""
-        expected_clients = [
-            ScheduledVisitClient(client_id='client1'),
-            ScheduledVisitClient(client_id='client2'),
-            ScheduledVisitClient(client_id='client3')
-        ]
-        
-        with patch.object(repository, 'get_clients_for_visit', return_value=expected_clients):
-            clients = repository.get_clients_for_visit('visit1')
-            
-            assert len(clients) == 3
-            assert all(isinstance(c, ScheduledVisitClient) for c in clients)
-            assert clients[0].client_id == 'client1'
-            assert clients[1].client_id == 'client2'
-            assert clients[2].client_id == 'client3'
-    
     def test_get_all_not_implemented(self, repository):
         """Test que get_all no está implementado"""
         result = repository.get_all()
@@ -368,33 +317,6 @@ class TestScheduledVisitRepository:
             assert len(results) == 1
             assert results[0][0].date == specific_date
     
-    def test_get_clients_for_visit_single_client(self, repository):
-        """Test obtener un solo cliente de una visita"""
-        expected_client = [ScheduledVisitClient(client_id='single-client')]
-        
-        with patch.object(repository, 'get_clients_for_visit', return_value=expected_client):
-            clients = repository.get_clients_for_visit('visit1')
-            
-            assert len(clients) == 1
-            assert clients[0].client_id == 'single-client'
-    
-    @patch('app.repositories.scheduled_visit_repository.ScheduledVisitClientDB')
-    def test_get_clients_for_visit_real_execution(self, mock_client_db, repository, mock_session):
-        """Test obtener clientes ejecutando código real"""
-        mock_db_client1 = Mock()
-        mock_db_client1.client_id = 'client1'
-        mock_db_client2 = Mock()
-        mock_db_client2.client_id = 'client2'
-        
-        chain = mock_session.query.return_value.filter.return_value
-        chain.all.return_value = [mock_db_client1, mock_db_client2]
-        
-        clients = repository.get_clients_for_visit('visit1')
-        
-        assert len(clients) == 2
-        assert clients[0].client_id == 'client1'
-        assert clients[1].client_id == 'client2'
-    
     @patch('app.repositories.scheduled_visit_repository.ScheduledVisitDB')
     @patch('app.repositories.scheduled_visit_repository.ScheduledVisitClientDB')
     def test_get_by_seller_real_execution_no_date(self, mock_client_db, mock_visit_db, repository, mock_session):
@@ -448,17 +370,45 @@ class TestScheduledVisitRepository:
             assert results[0][1] == 3
     
     @patch('app.repositories.scheduled_visit_repository.ScheduledVisitDB')
-    def test_create_visit_duplicate_real_execution(self, mock_visit_db, repository, sample_visit, mock_session):
-        """Test validación de duplicado ejecutando código real"""
-        # Simular que ya existe una visita
-        existing_visit = Mock()
-        existing_visit.id = 'existing-id'
+    @patch('app.repositories.scheduled_visit_repository.ScheduledVisitClientDB')
+    def test_create_visit_duplicate_real_execution(self, mock_client_db, mock_visit_db, repository, sample_visit, mock_session):
+        """Test el índice único (vendedor, fecha) se traduce al error de duplicado"""
+        from sqlalchemy.exc import IntegrityError
+        error = IntegrityError("duplicate key")
+        error.orig = Exception(
+            'duplicate key value violates unique constraint "ux_scheduled_visits_seller_id_date"'
+        )
+        mock_session.execute.side_effect = error
+        
+        with pytest.raises(ValueError, match="Ya existe una visita programada para este vendedor en la fecha 01-12-2025"):
+            repository.create(sample_visit)
+        
+        mock_session.rollback.assert_called_once()
+        mock_session.commit.assert_not_called()
+    
+    @patch('app.repositories.scheduled_visit_repository.ScheduledVisitDB')
+    @patch('app.repositories.scheduled_visit_repository.ScheduledVisitClientDB')
+    def test_create_visit_does_not_query_before_insert(self, mock_client_db, mock_visit_db, repository, sample_visit, mock_session):
+        """Test la creación no consulta duplicados antes de insertar"""
+        repository._db_to_model = Mock(return_value=sample_visit)
+        
+        repository.create(sample_visit)
         
-        chain = mock_session.query.return_value.filter.return_value
-        chain.first.return_value = existing_visit
+        mock_session.query.assert_not_called()
+    
+    @patch('app.repositories.scheduled_visit_repository.ScheduledVisitDB')
+    @patch('app.repositories.scheduled_visit_repository.ScheduledVisitClientDB')
+    def test_create_visit_other_integrity_error(self, mock_client_db, mock_visit_db, repository, sample_visit, mock_session):
+        """Test otros errores de integridad no se reportan como duplicado"""
+        from sqlalchemy.exc import IntegrityError
+        error = IntegrityError("fk")
+        error.orig = Exception('violates foreign key constraint "scheduled_visit_clients_visit_id_fkey"')
+        mock_session.execute.side_effect = error
         
-        with pytest.raises(ValueError, match="Ya existe una visita programada"):
+        with pytest.raises(Exception, match="Error al crear visita programada"):
             repository.create(sample_visit)
+        
+        mock_session.rollback.assert_called_once()
     
     def test_create_visit_commit_error_real_execution(self, repository, sample_visit, mock_session):
         """Test error en commit ejecutando código real"""
@@ -476,13 +426,6 @@ class TestScheduledVisitRepository:
         with pytest.raises(Exception, match="Error al obtener visitas programadas"):
             repository.get_by_seller_with_filters('seller1')
     
-    def test_get_clients_sqlalchemy_error(self, repository, mock_session):
-        """Test error de SQLAlchemy en get_clients_for_visit"""
-        mock_session.query.side_effect = SQLAlchemyError("Database error")
-        
-        with pytest.raises(Exception, match="Error al obtener clientes de la visita"):
-            repository.get_clients_for_visit('visit1')
-    
     @patch('app.repositories.scheduled_visit_repository.ScheduledVisitDB')
     @patch('app.repositories.scheduled_visit_repository.ScheduledVisitClientDB')
     def test_get_by_seller_with_date_filter_real(self, mock_client_db, mock_visit_db, repository, mock_session):
@@ -537,21 +480,29 @@ class TestScheduledVisitRepository:
         mock_db_visit.created_at = datetime.now()
         mock_db_visit.updated_at = datetime.now()
         
-        chain = mock_session.query.return_value.filter.return_value
+        db_clients = []
+        for client in sample_visit.clients:
+            db_client = Mock()
+            db_client.client_id = client.client_id
+            db_clients.append(db_client)
+        mock_db_visit.clients = db_clients
+        
+        chain = mock_session.query.return_value.options.return_value.filter.return_value
         chain.first.return_value = mock_db_visit
         
-        # Mockear get_clients_for_visit
-        with patch.object(repository, 'get_clients_for_visit', return_value=sample_visit.clients):
-            result = repository.get_by_id_and_seller('visit1', 'seller1')
-            
-            assert result is not None
-            assert result.id == 'visit1'
-            assert result.seller_id == 'seller1'
+        result = repository.get_by_id_and_seller('visit1', 'seller1')
+        
+        assert result is not None
+        assert result.id == 'visit1'
+        assert result.seller_id == 'seller1'
+        assert [client.client_id for client in result.clients] == [client.client_id for client in sample_visit.clients]
+        # Los clientes llegan en la misma consulta (joinedload), sin una segunda consulta
+        mock_session.query.assert_called_once()
     
     @patch('app.repositories.scheduled_visit_repository.ScheduledVisitDB')
     def test_get_by_id_and_seller_not_found(self, mock_visit_db, repository, mock_session):
         """Test obtener visita que no existe"""
-        chain = mock_session.query.return_value.filter.return_value
+        chain = mock_session.query.return_value.options.return_value.filter.return_value
         chain.first.return_value = None
         
         result = repository.get_by_id_and_seller('visit1', 'seller1')
@@ -565,125 +516,162 @@ class TestScheduledVisitRepository:
         with pytest.raises(Exception, match="Error al obtener visita programada"):
             repository.get_by_id_and_seller('visit1', 'seller1')
     
+    @patch('app.repositories.scheduled_visit_repository.insert')
     @patch('app.repositories.scheduled_visit_repository.ScheduledVisitDB')
     @patch('app.repositories.scheduled_visit_repository.ScheduledVisitClientDB')
-    def test_create_visit_sets_status_scheduled(self, mock_client_db, mock_visit_db, repository, sample_visit, mock_session):
+    def test_create_visit_sets_status_scheduled(self, mock_client_db, mock_visit_db, mock_insert, repository, sample_visit, mock_session):
         """Test que al crear una visita el status de los clientes se setea como SCHEDULED"""
-        # Configurar mocks de BD
-        mock_db_visit = Mock()
-        mock_db_visit.id = sample_visit.id
-        mock_db_visit.seller_id = sample_visit.seller_id
-        mock_db_visit.date = sample_visit.date
-        mock_db_visit.created_at = datetime.now()
-        mock_db_visit.updated_at = datetime.now()
+        repository.create(sample_visit)
+        
+        # La segunda sentencia inserta todos los clientes con una lista de parámetros
+        rows = mock_session.execute.call_args_list[1].args[1]
+        assert [row['client_id'] for row in rows] == [client.client_id for client in sample_visit.clients]
+        for row in rows:
+            assert row['status'] == 'SCHEDULED'
+            assert row['visit_id'] == sample_visit.id
+            assert row['created_at'] == sample_visit.created_at
+    
+    @patch('app.repositories.scheduled_visit_repository.insert')
+    @patch('app.repositories.scheduled_visit_repository.ScheduledVisitDB')
+    def test_create_visit_without_clients_single_insert(self, mock_visit_db, mock_insert, repository, mock_session):
+        """Test una visita sin clientes no ejecuta el INSERT de clientes"""
+        visit = ScheduledVisit(
+            id='d527df89-03f4-4c2c-9d4f-8e6b5c7d3a1b',
+            seller_id='c527df89-03f4-4c2c-9d4f-8e6b5c7d3a1b',
+            date=date(2025, 12, 1),
+            clients=[]
+        )
         
-        mock_visit_db.return_value = mock_db_visit
+        repository.create(visit)
         
-        # Capturar las llamadas al constructor de ScheduledVisitClientDB
-        client_instances = []
-        def mock_client_constructor(*args, **kwargs):
-            instance = Mock()
-            client_instances.append(kwargs)
-            return instance
+        assert mock_session.execute.call_count == 1
+        mock_session.commit.assert_called_once()
+    
+    @patch('app.repositories.scheduled_visit_repository.ScheduledVisitDB')
+    @patch('app.repositories.scheduled_visit_repository.ScheduledVisitClientDB')
+    @patch('app.repositories.scheduled_visit_repository.update')
+    def test_update_client_visit_success(self, mock_update, mock_client_db, mock_visit_db, repository, mock_session):
+        """Test actualizar cliente de visita en una sola sentencia UPDATE ... RETURNING"""
+        statement = mock_update.return_value.where.return_value.values.return_value.returning.return_value
+        statement = statement.execution_options.return_value
+        updated_row = {'visit_id': 'visit1', 'client_id': 'client1', 'status': 'COMPLETED'}
+        mock_session.execute.return_value.mappings.return_value.all.return_value = [updated_row]
+        
+        result = repository.update_client_visit(
+            'seller1', 'visit1', 'client1',
+            {'status': 'COMPLETED', 'find': 'Hallazgos importantes', 'ignored': 'x'}
+        )
         
-        mock_client_db.side_effect = mock_client_constructor
+        assert result == updated_row
+        mock_session.execute.assert_called_once_with(statement)
+        mock_session.query.assert_not_called()
+        mock_session.commit.assert_called_once()
+        values = mock_update.return_value.where.return_value.values.call_args.kwargs
+        assert values['status'] == 'COMPLETED'
+        assert values['find'] == 'Hallazgos importantes'
+        assert isinstance(values['updated_at'], datetime)
+        assert 'ignored' not in values
+    
+    @patch('app.repositories.scheduled_visit_repository.ScheduledVisitDB')
+    @patch('app.repositories.scheduled_visit_repository.ScheduledVisitClientDB')
+    @patch('app.repositories.scheduled_visit_repository.update')
+    def test_update_client_visit_not_found(self, mock_update, mock_client_db, mock_visit_db, repository, mock_session):
+        """Test sin filas afectadas (visita, vendedor o cliente inexistente) retorna None"""
+        mock_session.execute.return_value.mappings.return_value.all.return_value = []
         
-        # Mockear _db_to_model
-        repository._db_to_model = Mock(return_value=sample_visit)
+        result = repository.update_client_visit('seller1', 'visit1', 'client1', {'status': 'COMPLETED'})
         
-        result = repository.create(sample_visit)
+        assert result is None
+    
+    @patch('app.repositories.scheduled_visit_repository.ScheduledVisitDB')
+    @patch('app.repositories.scheduled_visit_repository.ScheduledVisitClientDB')
+    @patch('app.repositories.scheduled_visit_repository.update')
+    def test_update_client_visit_sqlalchemy_error(self, mock_update, mock_client_db, mock_visit_db, repository, mock_session):
+        """Test error de SQLAlchemy en update_client_visit"""
+        mock_session.execute.side_effect = SQLAlchemyError("Database error")
         
-        # Verificar que se crearon 2 clientes
-        assert len(client_instances) == 2
+        with pytest.raises(Exception, match="Error al actualizar cliente de la visita"):
+            repository.update_client_visit('seller1', 'visit1', 'client1', {'status': 'COMPLETED'})
         
-        # Verificar que ambos clientes tienen status='SCHEDULED'
-        for client_kwargs in client_instances:
-            assert 'status' in client_kwargs
-            assert client_kwargs['status'] == 'SCHEDULED'
-            assert 'visit_id' in client_kwargs
-            assert 'client_id' in client_kwargs
+        mock_session.rollback.assert_called_once()
     
+    @patch('app.repositories.scheduled_visit_repository.ScheduledVisitDB')
     @patch('app.repositories.scheduled_visit_repository.ScheduledVisitClientDB')
-    def test_get_client_visit_success(self, mock_client_db, repository, mock_session):
-        """Test obtener cliente de visita exitosamente"""
-        mock_db_client = Mock()
-        mock_db_client.visit_id = 'visit1'
-        mock_db_client.client_id = 'client1'
-        mock_db_client.status = 'SCHEDULED'
-        
-        # Configurar atributos de la clase mockeada
-        mock_client_db.visit_id = Mock()
-        mock_client_db.client_id = Mock()
+    @patch('app.repositories.scheduled_visit_repository.update')
+    def test_update_client_visit_without_commit(self, mock_update, mock_client_db, mock_visit_db, repository, mock_session):
+        """Test con commit=False la transacción queda abierta hasta commit() o rollback()"""
+        mock_session.execute.return_value.mappings.return_value.all.return_value = [{'visit_id': 'visit1'}]
         
-        chain = mock_session.query.return_value.filter.return_value
-        chain.first.return_value = mock_db_client
+        result = repository.update_client_visit('seller1', 'visit1', 'client1', {'status': 'COMPLETED'}, commit=False)
         
-        result = repository.get_client_visit('visit1', 'client1')
+        assert result == {'visit_id': 'visit1'}
+        mock_session.commit.assert_not_called()
         
-        assert result is not None
-        assert result.visit_id == 'visit1'
-        assert result.client_id == 'client1'
+        repository.commit()
+        mock_session.commit.assert_called_once()
+        repository.rollback()
+        mock_session.rollback.assert_called_once()
     
-    @patch('app.repositories.scheduled_visit_repository.ScheduledVisitClientDB')
-    def test_get_client_visit_not_found(self, mock_client_db, repository, mock_session):
-        """Test obtener cliente de visita que no existe"""
-        # Configurar atributos de la clase mockeada
-        mock_client_db.visit_id = Mock()
-        mock_client_db.client_id = Mock()
+    def test_commit_error(self, repository, mock_session):
+        """Test error de SQLAlchemy al confirmar la transacción abierta"""
+        mock_session.commit.side_effect = SQLAlchemyError("Database error")
         
-        chain = mock_session.query.return_value.filter.return_value
-        chain.first.return_value = None
+        with pytest.raises(Exception, match="Error al actualizar cliente de la visita"):
+            repository.commit()
         
-        result = repository.get_client_visit('visit1', 'client1')
+        mock_session.rollback.assert_called_once()
+    
+    @patch('app.repositories.scheduled_visit_repository.ScheduledVisitDB')
+    @patch('app.repositories.scheduled_visit_repository.ScheduledVisitClientDB')
+    def test_get_visits_version(self, mock_client_db, mock_visit_db, repository, mock_session):
+        """Test la versión de las visitas en una sola consulta"""
+        chain = mock_session.query.return_value.outerjoin.return_value
+        chain.one.return_value = [1, 2, 'v', 'c']
         
-        assert result is None
+        assert repository.get_visits_version('seller1', visit_id='visit1', visit_date=date(2025, 12, 1)) == (1, 2, 'v', 'c')
+        assert chain.filter.call_count == 3
     
-    def test_get_client_visit_sqlalchemy_error(self, repository, mock_session):
-        """Test error de SQLAlchemy en get_client_visit"""
+    def test_get_visits_version_error(self, repository, mock_session):
+        """Test error de SQLAlchemy al obtener la versión de visitas"""
         mock_session.query.side_effect = SQLAlchemyError("Database error")
         
-        with pytest.raises(Exception, match="Error al obtener cliente de la visita"):
-            repository.get_client_visit('visit1', 'client1')
+        with pytest.raises(Exception, match="Error al obtener versión de visitas"):
+            repository.get_visits_version('seller1')
     
-    def test_update_client_visit_success(self, repository, mock_session):
-        """Test actualizar cliente de visita exitosamente"""
-        mock_db_client = Mock()
-        mock_db_client.status = 'SCHEDULED'
-        mock_db_client.find = None
+    @patch('app.repositories.scheduled_visit_repository.ScheduledVisitDB')
+    @patch('app.repositories.scheduled_visit_repository.ScheduledVisitClientDB')
+    def test_get_visits_version_date_range(self, mock_client_db, mock_visit_db, repository, mock_session):
+        """Test la versión filtra por rango de fechas"""
+        mock_visit_db.date.__ge__.return_value = Mock()
+        mock_visit_db.date.__le__.return_value = Mock()
+        chain = mock_session.query.return_value.outerjoin.return_value
+        chain.one.return_value = [3, 5, 'v', 'c']
         
-        with patch.object(repository, 'get_client_visit', return_value=mock_db_client):
-            update_data = {
-                'status': 'COMPLETED',
-                'find': 'Hallazgos importantes'
-            }
-            
-            result = repository.update_client_visit('visit1', 'client1', update_data)
-            
-            assert result is True
-            assert mock_db_client.status == 'COMPLETED'
-            assert mock_db_client.find == 'Hallazgos importantes'
-            mock_session.commit.assert_called_once()
-    
-    def test_update_client_visit_not_found(self, repository, mock_session):
-        """Test actualizar cliente de visita que no existe"""
-        with patch.object(repository, 'get_client_visit', return_value=None):
-            update_data = {'status': 'COMPLETED'}
-            
-            result = repository.update_client_visit('visit1', 'client1', update_data)
-            
-            assert result is False
+        result = repository.get_visits_version('seller1', date_from=date(2025, 12, 1), date_to=date(2025, 12, 7))
+        
+        assert result == (3, 5, 'v', 'c')
+        assert chain.filter.call_count == 3
+        mock_visit_db.date.__ge__.assert_called_once_with(date(2025, 12, 1))
+        mock_visit_db.date.__le__.assert_called_once_with(date(2025, 12, 7))
     
-    def test_update_client_visit_sqlalchemy_error(self, repository, mock_session):
-        """Test error de SQLAlchemy en update_client_visit"""
-        mock_db_client = Mock()
+    @patch('app.repositories.scheduled_visit_repository.ScheduledVisitDB')
+    def test_get_route_for_range(self, mock_visit_db, repository, mock_session):
+        """Test las visitas del rango y sus clientes se obtienen en una sola consulta"""
+        mock_visit_db.date.__ge__.return_value = Mock()
+        mock_visit_db.date.__le__.return_value = Mock()
+        db_visits = [Mock(), Mock()]
+        query = mock_session.query.return_value
+        query.options.return_value.filter.return_value.order_by.return_value.all.return_value = db_visits
+        
+        result = repository.get_route_for_range('seller1', date(2025, 12, 1), date(2025, 12, 7))
+        
+        assert result == db_visits
+        mock_session.query.assert_called_once_with(mock_visit_db)
+        query.options.assert_called_once()
+    
+    def test_get_route_for_range_error(self, repository, mock_session):
+        """Test error de SQLAlchemy al obtener la ruta"""
+        mock_session.query.side_effect = SQLAlchemyError("Database error")
         
-        with patch.object(repository, 'get_client_visit', return_value=mock_db_client):
-            mock_session.commit.side_effect = SQLAlchemyError("Database error")
-            
-            update_data = {'status': 'COMPLETED'}
-            
-            with pytest.raises(Exception, match="Error al actualizar cliente de la visita"):
-                repository.update_client_visit('visit1', 'client1', update_data)
-            
-            mock_session.rollback.assert_called_once()
-
+        with pytest.raises(Exception, match="Error al obtener la ruta del vendedor"):
+            repository.get_route_for_range('seller1', date(2025, 12, 1), date(2025, 12, 7))
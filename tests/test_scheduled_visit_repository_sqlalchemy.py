@@ -0,0 +1,75 @@
+"""
+Tests de ScheduledVisitRepository con SQLAlchemy real sobre SQLite (llaves foráneas activas)
+"""
+
+SETUP = """
+    import json
+    from datetime import date
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.orm import sessionmaker
+    from app.models.db_models import Base
+    from app.models.scheduled_visit import ScheduledVisit, ScheduledVisitClient
+    from app.repositories.scheduled_visit_repository import ScheduledVisitRepository
+
+    SELLER = 'b527df89-03f4-4c2c-9d4f-8e6b5c7d3a1b'
+    CLIENTS = ['a527df89-03f4-4c2c-9d4f-8e6b5c7d3a1b', 'c527df89-03f4-4c2c-9d4f-8e6b5c7d3a1b']
+
+    engine = create_engine('sqlite://')
+
+    @event.listens_for(engine, 'connect')
+    def enable_foreign_keys(dbapi_connection, _):
+        dbapi_connection.execute('PRAGMA foreign_keys=ON')
+
+    Base.metadata.create_all(engine)
+    inserts = []
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def record_inserts(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith('INSERT'):
+            inserts.append(statement.split()[2])
+
+    session = sessionmaker(bind=engine)()
+    repository = ScheduledVisitRepository(session)
+
+    def new_visit(visit_date):
+        return ScheduledVisit(
+            seller_id=SELLER,
+            date=visit_date,
+            clients=[ScheduledVisitClient(client_id) for client_id in CLIENTS]
+        )
+"""
+
+
+class TestScheduledVisitRepositorySQLAlchemy:
+    """Tests con SQLAlchemy real: orden de los INSERT y restricciones de la base de datos"""
+
+    def test_create_inserts_visit_before_clients(self, run_isolated):
+        """Test la visita se inserta antes que sus clientes, como exige la llave foránea"""
+        result = run_isolated(SETUP + """
+    visit = repository.create(new_visit(date(2030, 12, 1)))
+    stored = repository.get_visit_with_clients(visit.id, SELLER)
+    print(json.dumps({
+        'inserts': inserts,
+        'clients': [client.client_id for client in stored.clients]
+    }))
+""")
+
+        assert result['inserts'] == ['scheduled_visits', 'scheduled_visit_clients']
+        assert result['clients'] == [
+            'a527df89-03f4-4c2c-9d4f-8e6b5c7d3a1b',
+            'c527df89-03f4-4c2c-9d4f-8e6b5c7d3a1b'
+        ]
+
+    def test_create_duplicate_date_raises_value_error(self, run_isolated):
+        """Test el índice único (vendedor, fecha) se traduce en el error de visita duplicada"""
+        result = run_isolated(SETUP + """
+    repository.create(new_visit(date(2030, 12, 1)))
+    try:
+        repository.create(new_visit(date(2030, 12, 1)))
+        error = None
+    except ValueError as e:
+        error = str(e)
+    print(json.dumps({'error': error}))
+""")
+
+        assert result['error'] == "Ya existe una visita programada para este vendedor en la fecha 01-12-2030"
@@ -0,0 +1,93 @@
+"""
+Tests para el controlador ScheduledVisitRouteController
+"""
+import pytest
+from unittest.mock import Mock
+from flask import Flask
+from app.exceptions.custom_exceptions import SalesPlanValidationError, SalesPlanBusinessLogicError
+
+ROUTE = {
+    'seller_id': 'seller1',
+    'from': '01-12-2025',
+    'to': '07-12-2025',
+    'visits': [
+        {
+            'id': 'visit1',
+            'date': '01-12-2025',
+            'clients': [{'client_id': 'client1', 'status': 'SCHEDULED', 'client': {'id': 'client1'}}]
+        }
+    ]
+}
+
+
+class TestScheduledVisitRouteController:
+    """Tests para ScheduledVisitRouteController"""
+
+    @pytest.fixture
+    def app(self):
+        """Crea una aplicación Flask para testing"""
+        app = Flask(__name__)
+        app.config['TESTING'] = True
+        return app
+
+    def _controller(self):
+        from app.controllers.scheduled_visit_route_controller import ScheduledVisitRouteController
+        controller = ScheduledVisitRouteController()
+        controller.scheduled_visit_route_service = Mock()
+        controller.scheduled_visit_route_service.get_route_version.return_value = (1, 1, None, None)
+        return controller
+
+    def test_get_success(self, app):
+        """Test obtener la ruta del rango"""
+        with app.test_request_context('/sellers/seller1/route?from=01-12-2025&to=07-12-2025'):
+            controller = self._controller()
+            controller.scheduled_visit_route_service.get_route.return_value = ROUTE
+
+            response, status = controller.get('seller1')
+
+        assert status == 200
+        assert response['data'] == ROUTE
+        assert response['message'] == 'Ruta del vendedor obtenida exitosamente'
+        controller.scheduled_visit_route_service.get_route.assert_called_once_with('seller1', '01-12-2025', '07-12-2025')
+
+    def test_get_not_modified(self, app):
+        """Test responde 304 si el cliente ya tiene la versión vigente"""
+        from app.utils.etag import make_etag
+        etag = make_etag('seller-route', (1, 1, None, None), 'seller1', '01-12-2025', '07-12-2025')
+        with app.test_request_context(
+            '/sellers/seller1/route?from=01-12-2025&to=07-12-2025',
+            headers={'If-None-Match': f'W/"{etag}"'}
+        ):
+            controller = self._controller()
+
+            response = controller.get('seller1')
+
+        assert response.status_code == 304
+        controller.scheduled_visit_route_service.get_route.assert_not_called()
+
+    @pytest.mark.parametrize('error, expected_status', [
+        (SalesPlanValidationError("El rango de fechas no puede superar 31 días"), 400),
+        (SalesPlanBusinessLogicError("Error al obtener la ruta del vendedor"), 500),
+        (Exception("inesperado"), 500),
+    ])
+    def test_get_errors(self, app, error, expected_status):
+        """Test errores del servicio"""
+        with app.test_request_context('/sellers/seller1/route?from=01-12-2025&to=07-12-2025'):
+            controller = self._controller()
+            controller.scheduled_visit_route_service.get_route.side_effect = error
+
+            response, status = controller.get('seller1')
+
+        assert status == expected_status
+        assert response['success'] is False
+
+    def test_get_version_error_still_responds(self, app):
+        """Test si la versión falla se responde normalmente sin ETag"""
+        with app.test_request_context('/sellers/seller1/route?from=01-12-2025&to=07-12-2025'):
+            controller = self._controller()
+            controller.scheduled_visit_route_service.get_route_version.side_effect = Exception("DB")
+            controller.scheduled_visit_route_service.get_route.return_value = ROUTE
+
+            response, status = controller.get('seller1')
+
+        assert status == 200
@@ -0,0 +1,136 @@
+"""
+Tests para el servicio ScheduledVisitRouteService
+"""
+import pytest
+from unittest.mock import Mock
+from datetime import date, datetime
+from app.services.scheduled_visit_route_service import ScheduledVisitRouteService
+from app.exceptions.custom_exceptions import SalesPlanValidationError, SalesPlanBusinessLogicError
+
+
+def make_db_client(client_id, status='SCHEDULED', find=None):
+    db_client = Mock()
+    db_client.client_id = client_id
+    db_client.status = status
+    db_client.find = find
+    db_client.filename = None
+    db_client.filename_url = None
+    return db_client
+
+
+def make_db_visit(visit_id, visit_date, clients):
+    db_visit = Mock()
+    db_visit.id = visit_id
+    db_visit.date = visit_date
+    db_visit.clients = clients
+    db_visit.created_at = datetime(2025, 11, 1, 10, 0, 0)
+    db_visit.updated_at = datetime(2025, 11, 2, 10, 0, 0)
+    return db_visit
+
+
+class TestScheduledVisitRouteService:
+    """Tests para ScheduledVisitRouteService"""
+
+    @pytest.fixture
+    def mock_repository(self):
+        """Mock del repositorio"""
+        return Mock()
+
+    @pytest.fixture
+    def mock_directory(self):
+        """Mock del directorio de usuarios"""
+        directory = Mock()
+        directory.user_exists.return_value = True
+        directory.get_users.side_effect = lambda ids: {user_id: {'id': user_id, 'name': f'Cliente {user_id}'} for user_id in ids}
+        return directory
+
+    @pytest.fixture
+    def service(self, mock_repository, mock_directory):
+        """Servicio con dependencias mockeadas"""
+        config = Mock()
+        config.SELLER_ROUTE_MAX_DAYS = 31
+        return ScheduledVisitRouteService(mock_repository, user_directory=mock_directory, config=config)
+
+    def test_get_route_embeds_clients(self, service, mock_repository, mock_directory):
+        """Test las visitas del rango incluyen sus clientes con estado y datos del directorio"""
+        mock_repository.get_route_for_range.return_value = [
+            make_db_visit('visit1', date(2025, 12, 1), [
+                make_db_client('client1', status='COMPLETED', find='Todo bien'),
+                make_db_client('client2')
+            ]),
+            make_db_visit('visit2', date(2025, 12, 2), [make_db_client('client1')]),
+        ]
+
+        result = service.get_route('seller1', '01-12-2025', '07-12-2025')
+
+        mock_repository.get_route_for_range.assert_called_once_with('seller1', date(2025, 12, 1), date(2025, 12, 7))
+        assert result['from'] == '01-12-2025'
+        assert result['to'] == '07-12-2025'
+        assert [visit['date'] for visit in result['visits']] == ['01-12-2025', '02-12-2025']
+        first_client = result['visits'][0]['clients'][0]
+        assert first_client['status'] == 'COMPLETED'
+        assert first_client['find'] == 'Todo bien'
+        assert first_client['client'] == {'id': 'client1', 'name': 'Cliente client1'}
+        assert result['visits'][0]['created_at'] == '2025-11-01T10:00:00'
+
+    def test_get_route_deduplicates_client_lookups(self, service, mock_repository, mock_directory):
+        """Test un cliente presente en varias visitas se consulta una sola vez"""
+        mock_repository.get_route_for_range.return_value = [
+            make_db_visit('visit1', date(2025, 12, 1), [make_db_client('client1'), make_db_client('client2')]),
+            make_db_visit('visit2', date(2025, 12, 2), [make_db_client('client2'), make_db_client('client1')]),
+        ]
+
+        service.get_route('seller1', '01-12-2025', '07-12-2025')
+
+        mock_directory.get_users.assert_called_once_with(['client1', 'client2'])
+
+    def test_get_route_empty_range(self, service, mock_repository, mock_directory):
+        """Test sin visitas no consulta el directorio"""
+        mock_repository.get_route_for_range.return_value = []
+
+        result = service.get_route('seller1', '01-12-2025', '01-12-2025')
+
+        assert result['visits'] == []
+        mock_directory.get_users.assert_not_called()
+
+    def test_get_route_seller_not_found(self, service, mock_repository, mock_directory):
+        """Test vendedor inexistente"""
+        mock_directory.user_exists.return_value = False
+
+        with pytest.raises(SalesPlanValidationError, match="El vendedor con ID seller1 no existe"):
+            service.get_route('seller1', '01-12-2025', '07-12-2025')
+        mock_repository.get_route_for_range.assert_not_called()
+
+    @pytest.mark.parametrize('date_from, date_to, message', [
+        (None, '07-12-2025', "son obligatorios"),
+        ('01-12-2025', None, "son obligatorios"),
+        ('2025-12-01', '07-12-2025', "es inválido"),
+        ('07-12-2025', '01-12-2025', "menor o igual"),
+        ('01-12-2025', '01-01-2026', "no puede superar 31 días"),
+    ])
+    def test_get_route_invalid_range(self, service, mock_repository, date_from, date_to, message):
+        """Test validaciones del rango de fechas"""
+        with pytest.raises(SalesPlanValidationError, match=message):
+            service.get_route('seller1', date_from, date_to)
+        mock_repository.get_route_for_range.assert_not_called()
+
+    def test_get_route_repository_error(self, service, mock_repository):
+        """Test error del repositorio"""
+        mock_repository.get_route_for_range.side_effect = Exception("DB caída")
+
+        with pytest.raises(SalesPlanBusinessLogicError, match="Error al obtener la ruta del vendedor"):
+            service.get_route('seller1', '01-12-2025', '07-12-2025')
+
+    def test_get_route_version(self, service, mock_repository):
+        """Test la versión de la ruta usa el rango de fechas"""
+        mock_repository.get_visits_version.return_value = (2, 3, None, None)
+
+        assert service.get_route_version('seller1', '01-12-2025', '07-12-2025') == (2, 3, None, None)
+        mock_repository.get_visits_version.assert_called_once_with(
+            seller_id='seller1', date_from=date(2025, 12, 1), date_to=date(2025, 12, 7)
+        )
+
+    def test_get_route_version_invalid_range(self, service, mock_repository):
+        """Test un rango inválido no tiene versión"""
+        assert service.get_route_version('seller1', 'x', '07-12-2025') is None
+        mock_repository.get_visits_version.assert_not_called()
@@ -121,6 +121,35 @@ class TestScheduledVisitService:
                 with pytest.raises(SalesPlanBusinessLogicError):
                     service.create_scheduled_visit(sample_visit_data)
     
+    def test_create_scheduled_visit_reports_first_missing_client(self, service, sample_visit_data):
+        """Test con varios clientes inexistentes se reporta el primero de la lista"""
+        missing = {'a527df89-03f4-4c2c-9d4f-8e6b5c7d3a1b', 'b527df89-03f4-4c2c-9d4f-8e6b5c7d3a1b'}
+        with patch.object(service, '_validate_seller_exists', return_value=True):
+            with patch.object(service, '_validate_client_exists', side_effect=lambda cid: cid not in missing):
+                with pytest.raises(SalesPlanValidationError,
+                                   match="El cliente con ID a527df89-03f4-4c2c-9d4f-8e6b5c7d3a1b no existe"):
+                    service.create_scheduled_visit(sample_visit_data)
+    
+    def test_create_scheduled_visit_seller_error_precedes_date_error(self, service, sample_visit_data):
+        """Test el error de vendedor tiene prioridad sobre el formato de fecha"""
+        sample_visit_data['date'] = '2025-12-01'
+        with patch.object(service, '_validate_seller_exists', return_value=False):
+            with pytest.raises(SalesPlanValidationError, match="El vendedor con ID"):
+                service.create_scheduled_visit(sample_visit_data)
+    
+    def test_create_scheduled_visit_validates_all_ids_once(self, service, sample_visit_data, mock_repository):
+        """Test se valida el vendedor y cada cliente antes de crear la visita"""
+        mock_repository.create.return_value = Mock(spec=ScheduledVisit, id='visit1')
+        with patch.object(service, '_validate_seller_exists', return_value=True) as mock_seller:
+            with patch.object(service, '_validate_client_exists', return_value=True) as mock_client:
+                service.create_scheduled_visit(sample_visit_data)
+                
+                mock_seller.assert_called_once_with('c527df89-03f4-4c2c-9d4f-8e6b5c7d3a1b')
+                assert sorted(c.args[0] for c in mock_client.call_args_list) == [
+                    'a527df89-03f4-4c2c-9d4f-8e6b5c7d3a1b',
+                    'b527df89-03f4-4c2c-9d4f-8e6b5c7d3a1b'
+                ]
+    
     def test_get_scheduled_visits_success(self, service, mock_repository):
         """Test obtener visitas programadas exitosamente"""
         with patch.object(service, '_validate_seller_exists', return_value=True):
@@ -184,7 +213,7 @@ class TestScheduledVisitService:
             with pytest.raises(SalesPlanBusinessLogicError):
                 service.get_scheduled_visits('seller1')
     
-    @patch('requests.get')
+    @patch('app.utils.http_client.HttpClient.get')
     def test_validate_seller_exists_success(self, mock_get, service):
         """Test validar que vendedor existe"""
         mock_response = Mock()
@@ -195,7 +224,7 @@ class TestScheduledVisitService:
         
         assert result is True
     
-    @patch('requests.get')
+    @patch('app.utils.http_client.HttpClient.get')
     def test_validate_seller_exists_not_found(self, mock_get, service):
         """Test validar que vendedor no existe"""
         mock_response = Mock()
@@ -206,7 +235,7 @@ class TestScheduledVisitService:
         
         assert result is False
     
-    @patch('requests.get')
+    @patch('app.utils.http_client.HttpClient.get')
     def test_validate_seller_exists_request_exception(self, mock_get, service):
         """Test validar vendedor con excepción de requests"""
         import requests
@@ -216,7 +245,7 @@ class TestScheduledVisitService:
         
         assert result is False
     
-    @patch('requests.get')
+    @patch('app.utils.http_client.HttpClient.get')
     def test_validate_client_exists_success(self, mock_get, service):
         """Test validar que cliente existe"""
         mock_response = Mock()
@@ -227,7 +256,7 @@ class TestScheduledVisitService:
         
         assert result is True
     
-    @patch('requests.get')
+    @patch('app.utils.http_client.HttpClient.get')
     def test_validate_client_exists_not_found(self, mock_get, service):
         """Test validar que cliente no existe"""
         mock_response = Mock()
@@ -238,7 +267,7 @@ class TestScheduledVisitService:
         
         assert result is False
     
-    @patch('requests.get')
+    @patch('app.utils.http_client.HttpClient.get')
     def test_validate_client_exists_request_exception(self, mock_get, service):
         """Test validar cliente con excepción de requests"""
         import requests
@@ -248,3 +277,15 @@ class TestScheduledVisitService:
         
         assert result is False
 
+    
+    def test_get_scheduled_visits_version(self, service, mock_repository):
+        """Test la versión de las visitas usa la fecha convertida"""
+        mock_repository.get_visits_version.return_value = (1, 2, None, None)
+        
+        assert service.get_scheduled_visits_version('seller1', '05-12-2025') == (1, 2, None, None)
+        mock_repository.get_visits_version.assert_called_once_with(seller_id='seller1', visit_date=date(2025, 12, 5))
+    
+    def test_get_scheduled_visits_version_invalid_date(self, service, mock_repository):
+        """Test con fecha inválida no hay versión"""
+        assert service.get_scheduled_visits_version('seller1', '2025/12/05') is None
+        mock_repository.get_visits_version.assert_not_called()
@@ -102,8 +102,32 @@ class TestScheduledVisitUpdateController:
             assert response['success'] is False
             assert 'find' in response['details'].lower()
     
-    def test_post_file_too_large(self, app):
-        """Test archivo que excede el tamaño máximo"""
+    @patch('app.repositories.scheduled_visit_repository.ScheduledVisitRepository.commit')
+    @patch('app.repositories.scheduled_visit_repository.ScheduledVisitRepository.rollback')
+    @patch('app.repositories.scheduled_visit_repository.ScheduledVisitRepository.update_client_visit')
+    def test_post_file_too_large(self, mock_repository_update, mock_rollback, mock_commit, app):
+        """Test archivo que supera el tamaño máximo durante la subida por partes, sin medirlo antes"""
+        from app.exceptions.custom_exceptions import FileTooLargeError
+        
+        class ForwardOnlyStream:
+            """Stream de solo lectura hacia adelante: falla si alguien lo recorre para medirlo"""
+            def __init__(self, content):
+                self._buffer = BytesIO(content)
+            
+            def read(self, size=-1):
+                return self._buffer.read(size)
+            
+            def seek(self, *args):
+                raise AssertionError("El controlador no debe recorrer el archivo antes de subirlo")
+            
+            tell = seek
+        
+        def upload_aborted(file, filename):
+            # La subida lee por partes y se aborta al pasar el límite (10 MB)
+            while file.stream.read(256 * 1024):
+                pass
+            raise FileTooLargeError("El archivo excede el tamaño máximo permitido de 10 MB")
+        
         # Crear un archivo mock de 11 MB (excede el límite de 10 MB)
         file_content = b'x' * (11 * 1024 * 1024)
         
@@ -114,14 +138,21 @@ class TestScheduledVisitUpdateController:
             },
             content_type='multipart/form-data'
         ):
+            from flask import request
             from app.controllers.scheduled_visit_update_controller import ScheduledVisitUpdateController
+            request.files['file'].stream = ForwardOnlyStream(file_content)
             controller = ScheduledVisitUpdateController()
             
-            response, status = controller.post('seller1', 'visit1', 'client1')
+            with patch.object(controller.cloud_storage_service, 'upload_file', side_effect=upload_aborted):
+                response, status = controller.post('seller1', 'visit1', 'client1')
             
             assert status == 400
             assert response['success'] is False
             assert '10 MB' in response['details']
+            # La actualización sin confirmar se revierte
+            mock_repository_update.assert_called_once()
+            mock_rollback.assert_called_once()
+            mock_commit.assert_not_called()
     
     @patch('app.services.scheduled_visit_update_service.ScheduledVisitUpdateService.update_client_visit')
     def test_post_file_upload_fails(self, mock_update, app):
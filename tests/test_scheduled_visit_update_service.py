@@ -11,7 +11,11 @@ from io import BytesIO
 sys.modules['app.services.cloud_storage_service'] = Mock()
 
 from app.services.scheduled_visit_update_service import ScheduledVisitUpdateService
-from app.exceptions.custom_exceptions import SalesPlanValidationError, SalesPlanBusinessLogicError
+from app.exceptions.custom_exceptions import (
+    SalesPlanValidationError,
+    SalesPlanBusinessLogicError,
+    FileTooLargeError
+)
 
 
 class TestScheduledVisitUpdateService:
@@ -34,20 +38,7 @@ class TestScheduledVisitUpdateService:
     
     def test_update_client_visit_success(self, service, mock_repository):
         """Test actualizar cliente de visita exitosamente"""
-        # Mock de la visita
-        mock_visit = Mock()
-        mock_visit.id = 'visit1'
-        mock_visit.seller_id = 'seller1'
-        
-        # Mock del cliente en la visita
-        mock_client_visit = Mock()
-        mock_client_visit.visit_id = 'visit1'
-        mock_client_visit.client_id = 'client1'
-        mock_client_visit.status = 'SCHEDULED'
-        
-        mock_repository.get_by_id_and_seller.return_value = mock_visit
-        mock_repository.get_client_visit.return_value = mock_client_visit
-        mock_repository.update_client_visit.return_value = True
+        mock_repository.update_client_visit.return_value = {'visit_id': 'visit1', 'client_id': 'client1'}
         
         result = service.update_client_visit(
             seller_id='seller1',
@@ -64,63 +55,107 @@ class TestScheduledVisitUpdateService:
         # Verificar que se llamó a update_client_visit con los datos correctos
         mock_repository.update_client_visit.assert_called_once()
         call_args = mock_repository.update_client_visit.call_args
-        assert call_args[0][0] == 'visit1'
-        assert call_args[0][1] == 'client1'
-        assert call_args[0][2]['status'] == 'COMPLETED'
-        assert call_args[0][2]['find'] == 'Hallazgos importantes'
+        assert call_args[0][0] == 'seller1'
+        assert call_args[0][1] == 'visit1'
+        assert call_args[0][2] == 'client1'
+        assert call_args[0][3]['status'] == 'COMPLETED'
+        assert call_args[0][3]['find'] == 'Hallazgos importantes'
+    
+    def test_update_client_visit_single_statement(self, service, mock_repository):
+        """Test la actualización no consulta antes la visita ni el cliente"""
+        mock_repository.update_client_visit.return_value = {'visit_id': 'visit1', 'client_id': 'client1'}
+        
+        service.update_client_visit(
+            seller_id='seller1',
+            visit_id='visit1',
+            client_id='client1',
+            find='Hallazgos'
+        )
+        
+        mock_repository.get_visit_with_clients.assert_not_called()
+        mock_repository.get_by_id_and_seller.assert_not_called()
     
-    def test_update_client_visit_not_found(self, service, mock_repository):
-        """Test actualizar visita que no existe"""
-        mock_repository.get_by_id_and_seller.return_value = None
+    def test_update_client_visit_not_found(self, service, mock_repository, mock_cloud_storage):
+        """Test sin filas afectadas: visita, vendedor o cliente inexistente"""
+        mock_repository.update_client_visit.return_value = None
         
-        with pytest.raises(SalesPlanValidationError, match="No se encontró la visita"):
+        with pytest.raises(SalesPlanValidationError, match="No se encontró el cliente client1 en la visita visit1"):
             service.update_client_visit(
                 seller_id='seller1',
                 visit_id='visit1',
                 client_id='client1',
                 find='Hallazgos'
             )
+        mock_cloud_storage.delete_image.assert_not_called()
     
-    def test_update_client_not_in_visit(self, service, mock_repository):
-        """Test actualizar cliente que no existe en la visita"""
-        mock_visit = Mock()
-        mock_visit.id = 'visit1'
-        
-        mock_repository.get_by_id_and_seller.return_value = mock_visit
-        mock_repository.get_client_visit.return_value = None
+    def test_update_client_visit_not_found_skips_upload(self, service, mock_repository, mock_cloud_storage):
+        """Test si el UPDATE no afectó ninguna fila no se sube el archivo"""
+        mock_file = Mock()
+        mock_file.filename = 'test.pdf'
+        mock_repository.update_client_visit.return_value = None
         
         with pytest.raises(SalesPlanValidationError, match="No se encontró el cliente"):
             service.update_client_visit(
                 seller_id='seller1',
                 visit_id='visit1',
                 client_id='client1',
-                find='Hallazgos'
+                find='Hallazgos',
+                file=mock_file
             )
+        
+        assert mock_repository.update_client_visit.call_args.kwargs['commit'] is False
+        mock_repository.rollback.assert_called_once()
+        mock_repository.commit.assert_not_called()
+        mock_cloud_storage.upload_file.assert_not_called()
+        mock_cloud_storage.delete_image.assert_not_called()
     
-    def test_update_client_visit_update_failed(self, service, mock_repository):
-        """Test cuando falla la actualización"""
-        mock_visit = Mock()
-        mock_client_visit = Mock()
+    def test_update_client_visit_commit_failure_discards_file(self, service, mock_repository, mock_cloud_storage):
+        """Test si la confirmación falla después de subir, el archivo subido se elimina"""
+        mock_file = Mock()
+        mock_file.filename = 'test.pdf'
+        mock_repository.update_client_visit.return_value = {'visit_id': 'visit1', 'client_id': 'client1'}
+        mock_repository.commit.side_effect = Exception("Conexión perdida")
+        mock_cloud_storage.upload_file.return_value = (True, "Archivo subido", "https://storage/file.pdf")
+        mock_cloud_storage.delete_image.return_value = (True, "Imagen eliminada exitosamente")
         
-        mock_repository.get_by_id_and_seller.return_value = mock_visit
-        mock_repository.get_client_visit.return_value = mock_client_visit
-        mock_repository.update_client_visit.return_value = False
+        with pytest.raises(SalesPlanBusinessLogicError, match="Conexión perdida"):
+            service.update_client_visit(
+                seller_id='seller1',
+                visit_id='visit1',
+                client_id='client1',
+                find='Hallazgos',
+                file=mock_file
+            )
         
-        with pytest.raises(SalesPlanBusinessLogicError, match="No se pudo actualizar"):
+        uploaded_filename = mock_cloud_storage.upload_file.call_args[0][1]
+        mock_cloud_storage.delete_image.assert_called_once_with(uploaded_filename)
+        mock_repository.rollback.assert_called_once()
+    
+    def test_update_client_visit_url_update_failure_discards_file(self, service, mock_repository, mock_cloud_storage):
+        """Test si falla la actualización de la URL después de subir, el archivo no queda huérfano"""
+        mock_file = Mock()
+        mock_file.filename = 'test.pdf'
+        mock_repository.update_client_visit.side_effect = [
+            {'visit_id': 'visit1', 'client_id': 'client1'},
+            Exception("Database error")
+        ]
+        mock_cloud_storage.upload_file.return_value = (True, "Archivo subido", "https://storage/file.pdf")
+        mock_cloud_storage.delete_image.return_value = (False, "La imagen no existe")
+        
+        with pytest.raises(SalesPlanBusinessLogicError, match="Error al actualizar cliente de la visita"):
             service.update_client_visit(
                 seller_id='seller1',
                 visit_id='visit1',
                 client_id='client1',
-                find='Hallazgos'
+                find='Hallazgos',
+                file=mock_file
             )
+        
+        mock_cloud_storage.delete_image.assert_called_once_with(mock_cloud_storage.upload_file.call_args[0][1])
+        mock_repository.commit.assert_not_called()
     
     def test_update_client_visit_repository_error(self, service, mock_repository):
         """Test error del repositorio al actualizar"""
-        mock_visit = Mock()
-        mock_client_visit = Mock()
-        
-        mock_repository.get_by_id_and_seller.return_value = mock_visit
-        mock_repository.get_client_visit.return_value = mock_client_visit
         mock_repository.update_client_visit.side_effect = Exception("Database error")
         
         with pytest.raises(SalesPlanBusinessLogicError, match="Error al actualizar cliente de la visita"):
@@ -140,25 +175,12 @@ class TestScheduledVisitUpdateService:
     
     def test_update_client_visit_with_file_success(self, service, mock_repository, mock_cloud_storage):
         """Test actualizar cliente de visita con archivo exitosamente"""
-        # Mock de la visita
-        mock_visit = Mock()
-        mock_visit.id = 'visit1'
-        mock_visit.seller_id = 'seller1'
-        
-        # Mock del cliente en la visita
-        mock_client_visit = Mock()
-        mock_client_visit.visit_id = 'visit1'
-        mock_client_visit.client_id = 'client1'
-        mock_client_visit.status = 'SCHEDULED'
-        
         # Mock del archivo
         mock_file = Mock()
         mock_file.filename = 'test.pdf'
         mock_file.seek = Mock()
         
-        mock_repository.get_by_id_and_seller.return_value = mock_visit
-        mock_repository.get_client_visit.return_value = mock_client_visit
-        mock_repository.update_client_visit.return_value = True
+        mock_repository.update_client_visit.return_value = {'visit_id': 'visit1', 'client_id': 'client1'}
         mock_cloud_storage.upload_file.return_value = (True, "Archivo subido", "https://storage.googleapis.com/bucket/file.pdf")
         
         result = service.update_client_visit(
@@ -178,6 +200,7 @@ class TestScheduledVisitUpdateService:
         assert result['filename'].startswith('test-')
         assert result['filename'].endswith('.pdf')
         assert result['filename_url'] == "https://storage.googleapis.com/bucket/file.pdf"
+        mock_cloud_storage.delete_image.assert_not_called()
         
         # Verificar que se llamó a upload_file con el nombre correcto
         mock_cloud_storage.upload_file.assert_called_once()
@@ -187,24 +210,22 @@ class TestScheduledVisitUpdateService:
         assert uploaded_filename.startswith('test-')
         assert uploaded_filename.endswith('.pdf')
         assert len(uploaded_filename.split('-')[1].split('.')[0]) == 32  # UUID completo de 32 caracteres hexadecimales
+        
+        # Primero el UPDATE sin confirmar con el nombre ya generado; tras subir, la URL y el commit
+        first_update, url_update = mock_repository.update_client_visit.call_args_list
+        assert first_update[0][3]['filename'] == uploaded_filename
+        assert first_update.kwargs['commit'] is False
+        assert url_update[0][3] == {'filename_url': "https://storage.googleapis.com/bucket/file.pdf"}
+        mock_repository.commit.assert_called_once()
+        mock_repository.rollback.assert_not_called()
     
     def test_update_client_visit_file_upload_fails(self, service, mock_repository, mock_cloud_storage):
         """Test cuando falla la subida del archivo"""
-        # Mock de la visita
-        mock_visit = Mock()
-        mock_visit.id = 'visit1'
-        
-        # Mock del cliente en la visita
-        mock_client_visit = Mock()
-        mock_client_visit.visit_id = 'visit1'
-        mock_client_visit.client_id = 'client1'
-        
         # Mock del archivo
         mock_file = Mock()
         mock_file.filename = 'test.pdf'
         
-        mock_repository.get_by_id_and_seller.return_value = mock_visit
-        mock_repository.get_client_visit.return_value = mock_client_visit
+        mock_repository.update_client_visit.return_value = {'visit_id': 'visit1', 'client_id': 'client1'}
         mock_cloud_storage.upload_file.return_value = (False, "Error al subir archivo", None)
         
         with pytest.raises(SalesPlanBusinessLogicError, match="Error al subir archivo"):
@@ -215,4 +236,30 @@ class TestScheduledVisitUpdateService:
                 find='Hallazgos',
                 file=mock_file
             )
-
+        # La actualización sin confirmar se revierte
+        mock_repository.update_client_visit.assert_called_once()
+        mock_repository.rollback.assert_called_once()
+        mock_repository.commit.assert_not_called()
+        mock_cloud_storage.delete_image.assert_not_called()
+    
+    def test_update_client_visit_file_too_large(self, service, mock_repository, mock_cloud_storage):
+        """Test un archivo que supera el tamaño máximo no se reporta como error interno"""
+        mock_file = Mock()
+        mock_file.filename = 'grande.pdf'
+        
+        mock_cloud_storage.upload_file.side_effect = FileTooLargeError(
+            "El archivo excede el tamaño máximo permitido de 10 MB"
+        )
+        
+        mock_repository.update_client_visit.return_value = {'visit_id': 'visit1', 'client_id': 'client1'}
+        
+        with pytest.raises(FileTooLargeError, match="10 MB"):
+            service.update_client_visit(
+                seller_id='seller1',
+                visit_id='visit1',
+                client_id='client1',
+                find='Hallazgos',
+                file=mock_file
+            )
+        mock_repository.rollback.assert_called_once()
+        mock_repository.commit.assert_not_called()
@@ -0,0 +1,104 @@
+"""
+Tests para la serialización JSON de las respuestas
+"""
+import json
+import pytest
+from datetime import date, datetime
+from decimal import Decimal
+from flask import Flask
+from app.models.sales_plan import SalesPlan
+from app.models.scheduled_visit import ScheduledVisit, ScheduledVisitClient
+from app.utils import serialization
+from app.utils.serialization import get_encoder, make_json_representation
+
+CLIENT_ID = 'a527df89-03f4-4c2c-9d4f-8e6b5c7d3a1b'
+SELLER_ID = 'b527df89-03f4-4c2c-9d4f-8e6b5c7d3a1b'
+
+
+def make_plan(plan_id):
+    """Plan de ventas de muestra"""
+    return SalesPlan(
+        id=plan_id,
+        name=f'Plan {plan_id}',
+        start_date=datetime(2025, 1, 1),
+        end_date=datetime(2025, 3, 31, 23, 59, 59),
+        client_id=CLIENT_ID,
+        seller_id=SELLER_ID,
+        target_revenue=150000.505,
+        objectives='Aumentar ventas',
+        created_at=datetime(2025, 1, 1, 10, 0, 0, 123456),
+        updated_at=datetime(2025, 1, 2, 10, 0, 0)
+    )
+
+
+class TestEncoders:
+    """Tests para los codificadores"""
+
+    @pytest.mark.parametrize('name', sorted(serialization.ENCODERS))
+    def test_model_json_matches_to_dict(self, name):
+        """Test serializar el modelo directamente produce lo mismo que to_dict"""
+        encoder = get_encoder(name)
+        plan = make_plan(1)
+        visit = ScheduledVisit(
+            seller_id=SELLER_ID, date=date(2025, 12, 1), clients=[ScheduledVisitClient(CLIENT_ID)],
+            id='v1', created_at=datetime(2025, 1, 1), updated_at=datetime(2025, 1, 1)
+        )
+
+        assert json.loads(encoder(plan)) == plan.to_dict()
+        assert json.loads(encoder({'data': visit})) == {'data': visit.to_dict()}
+
+    @pytest.mark.parametrize('name', sorted(serialization.ENCODERS))
+    def test_native_types(self, name):
+        """Test fechas, Decimal y texto no ASCII"""
+        encoder = get_encoder(name)
+
+        data = json.loads(encoder({'d': date(2025, 1, 2), 'n': Decimal('1.5'), 's': 'Ñandú'}))
+
+        assert data == {'d': '2025-01-02', 'n': 1.5, 's': 'Ñandú'}
+
+    def test_unknown_type_raises(self):
+        """Test un tipo desconocido falla explícitamente"""
+        with pytest.raises(TypeError):
+            get_encoder('json')({'x': object()})
+
+    def test_get_encoder_fallback(self):
+        """Test un codificador desconocido usa la librería estándar"""
+        assert get_encoder('desconocido') is serialization._dumps_json
+        assert get_encoder('auto') is get_encoder(None)
+
+    def test_representation(self):
+        """Test la representación de flask_restful arma la respuesta JSON"""
+        app = Flask(__name__)
+        output_json = make_json_representation(get_encoder('json'))
+
+        with app.test_request_context():
+            response = output_json({'ok': True}, 201, {'X-Test': '1'})
+
+        assert response.status_code == 201
+        assert response.mimetype == 'application/json'
+        assert response.headers['X-Test'] == '1'
+        assert json.loads(response.get_data()) == {'ok': True}
+
+
+class TestPageSerialization:
+    """Página de 100 planes: camino anterior (to_dict + json.dumps) frente al camino rápido"""
+
+    def test_page_of_100_plans(self):
+        """Test el camino rápido produce el mismo JSON que el anterior"""
+        plans = [make_plan(i) for i in range(100)]
+
+        items = []
+        for plan in plans:
+            item = plan.to_dict()
+            item['client_name'] = 'Cliente'
+            items.append(item)
+        baseline = json.dumps({'success': True, 'data': {'items': items}})
+
+        items = []
+        for plan in plans:
+            item = plan.__json__()
+            item['client_name'] = 'Cliente'
+            items.append(item)
+        fast = get_encoder('auto')({'success': True, 'data': {'items': items}})
+
+        assert json.loads(fast) == json.loads(baseline)
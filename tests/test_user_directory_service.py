@@ -0,0 +1,237 @@
+"""
+Tests para el servicio UserDirectoryService
+"""
+import pytest
+from unittest.mock import Mock, patch
+from app.config.settings import Config
+from app.services.user_directory_service import UserDirectoryService
+from app.exceptions.custom_exceptions import UserDirectoryUnavailableError
+
+
+class TestUserDirectoryService:
+    """Tests para UserDirectoryService"""
+
+    @pytest.fixture
+    def service(self):
+        """Servicio con la consulta masiva habilitada"""
+        config = Config()
+        config.AUTH_BULK_LOOKUP_ENABLED = True
+        return UserDirectoryService(config)
+
+    def _response(self, status_code, payload=None):
+        response = Mock()
+        response.status_code = status_code
+        response.json.return_value = payload or {}
+        return response
+
+    def test_get_users_empty(self, service):
+        """Test sin IDs no se consulta el servicio"""
+        with patch('app.utils.http_client.HttpClient.post') as mock_post, patch('app.utils.http_client.HttpClient.get') as mock_get:
+            assert service.get_users([None, '']) == {}
+            mock_post.assert_not_called()
+            mock_get.assert_not_called()
+
+    @patch('app.utils.http_client.HttpClient.post')
+    def test_get_users_bulk_success(self, mock_post, service):
+        """Test resolución en una sola ronda usando el endpoint masivo"""
+        mock_post.return_value = self._response(200, {
+            'data': {'users': [{'id': 'u1', 'name': 'Uno'}, {'id': 'u2', 'name': 'Dos'}]}
+        })
+
+        result = service.get_users(['u1', 'u2', 'u1', 'u3'])
+
+        mock_post.assert_called_once()
+        assert mock_post.call_args.kwargs['json'] == {'ids': ['u1', 'u2', 'u3']}
+        assert result == {'u1': {'id': 'u1', 'name': 'Uno'}, 'u2': {'id': 'u2', 'name': 'Dos'}, 'u3': None}
+
+    @patch('app.utils.http_client.HttpClient.get')
+    @patch('app.utils.http_client.HttpClient.post')
+    def test_get_users_bulk_unsupported_falls_back(self, mock_post, mock_get, service):
+        """Test respaldo concurrente cuando el endpoint masivo no existe"""
+        mock_post.return_value = self._response(404)
+        mock_get.return_value = self._response(200, {'data': {'name': 'Usuario'}})
+
+        result = service.get_users(['u1', 'u2'])
+
+        assert result == {'u1': {'name': 'Usuario'}, 'u2': {'name': 'Usuario'}}
+        assert mock_get.call_count == 2
+
+        # El endpoint masivo no se vuelve a intentar
+        service.get_users(['u3', 'u4'])
+        mock_post.assert_called_once()
+
+    @patch('app.utils.http_client.HttpClient.get')
+    @patch('app.utils.http_client.HttpClient.post')
+    def test_get_users_bulk_error_falls_back(self, mock_post, mock_get, service):
+        """Test respaldo ante error transitorio sin deshabilitar el endpoint masivo"""
+        import requests
+        mock_post.side_effect = requests.exceptions.RequestException()
+        mock_get.return_value = self._response(404)
+
+        result = service.get_users(['u1'])
+
+        assert result == {'u1': None}
+        service.get_users(['u2'])
+        assert mock_post.call_count == 2
+
+    @patch('app.utils.http_client.HttpClient.get')
+    @patch('app.utils.http_client.HttpClient.post')
+    def test_get_users_bulk_disabled(self, mock_post, mock_get):
+        """Test con endpoint masivo deshabilitado por configuración"""
+        config = Config()
+        config.AUTH_BULK_LOOKUP_ENABLED = False
+        service = UserDirectoryService(config)
+        mock_get.return_value = self._response(200, {'name': 'Plano'})
+
+        result = service.get_users(['u1'])
+
+        mock_post.assert_not_called()
+        assert result == {'u1': {'name': 'Plano'}}
+
+    @patch('app.utils.http_client.HttpClient.get')
+    def test_get_user_request_exception(self, mock_get, service):
+        """Test excepción de requests devuelve None"""
+        import requests
+        mock_get.side_effect = requests.exceptions.RequestException()
+
+        assert service.get_user('u1') is None
+
+    @patch('app.utils.http_client.HttpClient.get')
+    def test_get_user_is_cached(self, mock_get, service):
+        """Test la segunda consulta del mismo usuario se sirve desde la caché"""
+        mock_get.return_value = self._response(200, {'data': {'name': 'Usuario'}})
+
+        assert service.get_user('u1') == {'name': 'Usuario'}
+        assert service.get_user('u1') == {'name': 'Usuario'}
+
+        mock_get.assert_called_once()
+        assert service.cache.stats()['hits'] == 1
+
+    @patch('app.utils.http_client.HttpClient.get')
+    def test_cache_is_shared_between_instances(self, mock_get):
+        """Test la caché es compartida por todas las instancias del proceso"""
+        mock_get.return_value = self._response(200, {'data': {'name': 'Usuario'}})
+
+        UserDirectoryService().get_user('u1')
+        UserDirectoryService().get_user('u1')
+
+        mock_get.assert_called_once()
+
+    @patch('app.utils.http_client.HttpClient.get')
+    def test_not_found_is_negatively_cached(self, mock_get, service):
+        """Test un 404 se guarda en caché como usuario inexistente"""
+        mock_get.return_value = self._response(404)
+
+        assert service.user_exists('u1') is False
+        assert service.user_exists('u1') is False
+
+        mock_get.assert_called_once()
+
+    @patch('app.utils.http_client.HttpClient.get')
+    def test_transient_errors_are_not_cached(self, mock_get, service):
+        """Test errores del servicio (5xx o de red) no se guardan en caché"""
+        mock_get.return_value = self._response(503)
+
+        assert service.user_exists('u1') is False
+        mock_get.return_value = self._response(200, {'data': {'name': 'Usuario'}})
+        assert service.user_exists('u1') is True
+
+        assert mock_get.call_count == 2
+
+    @patch('app.utils.http_client.HttpClient.get')
+    @patch('app.utils.http_client.HttpClient.post')
+    def test_lookup_users_separates_unverified(self, mock_post, mock_get, service):
+        """Test lookup_users distingue un usuario inexistente (404) de uno no verificado (5xx o red)"""
+        mock_post.return_value = self._response(503)
+        responses = {
+            'u1': self._response(200, {'data': {'name': 'Uno'}}),
+            'u2': self._response(404),
+            'u3': self._response(503),
+        }
+        mock_get.side_effect = lambda url: responses[url.rsplit('/', 1)[-1]]
+
+        users, unresolved = service.lookup_users(['u1', 'u2', 'u3'])
+
+        assert users == {'u1': {'name': 'Uno'}, 'u2': None}
+        assert unresolved == {'u3'}
+        assert service.get_users(['u3']) == {'u3': None}
+
+    @patch('app.utils.http_client.HttpClient.post')
+    def test_get_users_only_fetches_cache_misses(self, mock_post, service):
+        """Test la consulta masiva solo incluye los IDs que no están en caché"""
+        service.cache.set('u1', {'id': 'u1', 'name': 'Uno'})
+        mock_post.return_value = self._response(200, {'data': {'users': [{'id': 'u2', 'name': 'Dos'}]}})
+
+        result = service.get_users(['u1', 'u2'])
+
+        assert mock_post.call_args.kwargs['json'] == {'ids': ['u2']}
+        assert result['u1']['name'] == 'Uno'
+        assert result['u2']['name'] == 'Dos'
+
+    @patch('app.utils.http_client.HttpClient.get')
+    def test_get_users_counts_each_lookup_once(self, mock_get):
+        """Test cada ID se cuenta una sola vez en la caché: 3 fallos en frío y 3 aciertos después"""
+        mock_get.return_value = self._response(200, {'data': {'name': 'Usuario'}})
+        service = UserDirectoryService(Config())
+
+        service.get_users(['a', 'b', 'c'])
+        stats = service.cache.stats()
+        assert (stats['hits'], stats['misses']) == (0, 3)
+
+        service.get_users(['a', 'b', 'c'])
+        stats = service.cache.stats()
+        assert (stats['hits'], stats['misses']) == (3, 3)
+        assert stats['hit_ratio'] == 0.5
+        assert mock_get.call_count == 3
+
+    @patch('app.utils.http_client.HttpClient.get')
+    def test_find_client_ids_by_name_is_cached(self, mock_get, service):
+        """Test búsquedas repetidas por nombre se sirven desde la caché"""
+        mock_get.return_value = self._response(200, {'data': {'users': [{'id': 'c1'}, {'id': 'c2'}]}})
+
+        assert service.find_client_ids_by_name('Ana Pérez') == ['c1', 'c2']
+        assert service.find_client_ids_by_name('  ana   PÉREZ ') == ['c1', 'c2']
+
+        mock_get.assert_called_once()
+        assert mock_get.call_args.kwargs['params'] == {'name': 'Ana Pérez', 'role': 'Cliente'}
+
+    @patch('app.utils.http_client.HttpClient.get')
+    def test_find_client_ids_by_name_caches_empty_result(self, mock_get, service):
+        """Test una búsqueda sin coincidencias también se guarda en caché"""
+        mock_get.return_value = self._response(200, {'data': {'users': []}})
+
+        assert service.find_client_ids_by_name('Nadie') == []
+        assert service.find_client_ids_by_name('Nadie') == []
+
+        mock_get.assert_called_once()
+
+    @patch('app.utils.http_client.HttpClient.get')
+    def test_find_client_ids_by_name_errors_not_cached(self, mock_get, service):
+        """Test errores del servicio se reportan como falla y no se guardan en caché"""
+        mock_get.return_value = self._response(503)
+        with pytest.raises(UserDirectoryUnavailableError):
+            service.find_client_ids_by_name('Ana')
+
+        mock_get.return_value = self._response(200, {'data': {'users': [{'id': 'c1'}]}})
+        assert service.find_client_ids_by_name('Ana') == ['c1']
+
+        assert mock_get.call_count == 2
+
+    @patch('app.utils.http_client.HttpClient.get')
+    @patch('app.utils.http_client.HttpClient.post')
+    def test_bulk_lookup_disabled_by_default(self, mock_post, mock_get):
+        """Test por defecto no se llama al endpoint masivo, que el servicio de autenticación puede no exponer"""
+        mock_get.return_value = self._response(200, {'data': {'name': 'Usuario'}})
+
+        result = UserDirectoryService(Config()).get_users(['u1', 'u2'])
+
+        assert result == {'u1': {'name': 'Usuario'}, 'u2': {'name': 'Usuario'}}
+        mock_post.assert_not_called()
+
+    @patch('app.utils.http_client.HttpClient.get')
+    def test_find_client_ids_by_name_request_error(self, mock_get, service):
+        """Test un error de red tampoco se confunde con una búsqueda sin coincidencias"""
+        mock_get.side_effect = Exception("timeout")
+
+        with pytest.raises(UserDirectoryUnavailableError):
+            service.find_client_ids_by_name('Ana')
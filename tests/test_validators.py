@@ -0,0 +1,61 @@
+"""
+Tests para las validaciones de formato compartidas
+"""
+import pytest
+from app.utils.validators import is_uuid, is_valid_name, validate_uuid
+
+VALID_UUID = 'a527df89-03f4-4c2c-9d4f-8e6b5c7d3a1b'
+
+
+class TestIsUuid:
+    """Tests para is_uuid"""
+
+    @pytest.mark.parametrize('value', [VALID_UUID, VALID_UUID.upper()])
+    def test_valid(self, value):
+        """Test UUID válidos en minúsculas y mayúsculas"""
+        assert is_uuid(value) is True
+
+    @pytest.mark.parametrize('value', [
+        '',
+        'invalid-uuid',
+        VALID_UUID + '\n',
+        VALID_UUID[:-1] + 'g',
+        VALID_UUID.replace('-', ''),
+        '{' + VALID_UUID[1:-1] + '}',
+        None,
+        12345,
+    ])
+    def test_invalid(self, value):
+        """Test valores que no son UUID en formato texto"""
+        assert is_uuid(value) is False
+
+
+class TestIsValidName:
+    """Tests para is_valid_name"""
+
+    def test_valid(self):
+        """Test nombres con tildes, eñes, números, espacios y guiones"""
+        assert is_valid_name('Plan Año 2025 - Región Andina')
+
+    @pytest.mark.parametrize('value', ['', 'Plan@2025', 'Plan_Q1', 'Plan/Q1'])
+    def test_invalid(self, value):
+        """Test nombres con caracteres no permitidos"""
+        assert not is_valid_name(value)
+
+
+class TestValidateUuid:
+    """Tests para validate_uuid"""
+
+    def test_valid(self):
+        """Test un UUID válido no lanza error"""
+        validate_uuid(VALID_UUID, 'client_id', "El ID del cliente es obligatorio")
+
+    def test_required(self):
+        """Test un valor vacío usa el mensaje de obligatorio"""
+        with pytest.raises(ValueError, match="El ID del cliente es obligatorio"):
+            validate_uuid('', 'client_id', "El ID del cliente es obligatorio")
+
+    def test_invalid_format(self):
+        """Test un formato inválido indica el campo"""
+        with pytest.raises(ValueError, match="El seller_id debe ser un UUID válido"):
+            validate_uuid('invalid-uuid', 'seller_id', "El ID del vendedor es obligatorio")